@@ -1,25 +1,85 @@
 import os
 import json
+import asyncio
+import shutil
 import aiohttp
 import discord
 from discord.ext import commands
 from datetime import datetime
 import logging
 
-from services.claude_runner import run_meeting2deck
-from services.drive_uploader import upload_pptx_to_drive
+from services import result_cache, telemetry
+from services.claude_runner import stream_meeting2deck, new_job_id, get_job_dir, kill_orphaned_cli, STAGES
+from services.drive_uploader import upload_pptx_to_drive_async
+from services.job_queue import JobScheduler, QueueFullError
+from services.job_store import JobStore
+from services.pipeline import CHECKPOINT_FILE, load_checkpoint
+from services.render_pool import RenderPool
+from services.webhook_queue import WebhookQueue
 
 logger = logging.getLogger(__name__)
 
-OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
 MAKECOM_WEBHOOK_URL = os.getenv("MAKECOM_WEBHOOK_URL", "")
 EMAIL_RECIPIENT = os.getenv("EMAIL_RECIPIENT", "")
 ALLOWED_CHANNEL_ID = int(os.getenv("DISCORD_CHANNEL_ID", "0"))
+MAX_WORKERS = int(os.getenv("MEETING2DECK_WORKERS", "2"))
+MAX_PENDING_JOBS = int(os.getenv("MEETING2DECK_MAX_PENDING", "20"))
+MAX_JOBS_PER_USER = int(os.getenv("MEETING2DECK_MAX_PER_USER", "3"))
+WEBHOOK_POOL_SIZE = 10  # 웹훅 세션의 동시 연결 상한
+# 재시작 복구 횟수 상한 — 작업 자체가 봇을 죽이는 경우 무한 재시작 방지
+MAX_RECOVERIES = 2
 
 
 class Meeting2DeckBot(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.scheduler = JobScheduler(
+            workers=MAX_WORKERS,
+            max_pending=MAX_PENDING_JOBS,
+            max_per_owner=MAX_JOBS_PER_USER,
+        )
+        self.render_pool = RenderPool()  # Claude CLI가 소켓으로 PPTX 렌더링 요청
+        self.http = None  # 웹훅용 공유 aiohttp 세션 (연결·DNS·TLS 재사용)
+        self.webhooks = None
+        self.metrics_server = None
+        self.store = JobStore()  # 재시작 후 복구용 작업 기록
+        self._recovery = None
+        self._flights = {}  # PDF 내용 해시 → 처리 중인 작업 ID
+        self._followers = {}  # 작업 ID → 같은 PDF로 합류한 [(message, job_id)]
+
+    async def cog_load(self):
+        self.render_pool.start()
+        await self.render_pool.serve()
+        self.scheduler.start()
+        self._recovery = asyncio.create_task(self._recover_jobs())
+        self.http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=WEBHOOK_POOL_SIZE, ttl_dns_cache=300),
+        )
+        if MAKECOM_WEBHOOK_URL:
+            self.webhooks = WebhookQueue(MAKECOM_WEBHOOK_URL, self.http)
+            self.webhooks.start()
+            telemetry.gauge("webhook_pending", lambda: self.webhooks.pending, "재시도 대기 중인 웹훅 수")
+        telemetry.gauge("queue_depth", lambda: self.scheduler.pending, "대기열에서 기다리는 작업 수")
+        telemetry.gauge("jobs_in_flight", lambda: self.scheduler.in_flight, "실행 중인 작업 수")
+        try:
+            self.metrics_server = await telemetry.serve()
+        except OSError as e:
+            logger.warning(f"메트릭 엔드포인트를 열 수 없음: {e}")
+            self.metrics_server = None
+
+    async def cog_unload(self):
+        if self.metrics_server:
+            self.metrics_server.close()
+        if self._recovery:
+            self._recovery.cancel()
+        # 실행 중인 작업은 running 상태로 남아 다음 실행에서 이어서 처리된다
+        await self.scheduler.stop()
+        await self.render_pool.stop()
+        if self.webhooks:
+            await self.webhooks.stop()  # 보내지 못한 웹훅은 디스크에 남아 다음 실행에서 재전송
+        if self.http:
+            await self.http.close()
+        self.store.close()
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -34,36 +94,246 @@ class Meeting2DeckBot(commands.Cog):
             return
 
         attachment = pdf_attachments[0]
-        await message.reply(f"PDF 수신 완료: `{attachment.filename}`\nMeeting2Deck 처리를 시작합니다...")
+        job_id = new_job_id()
+        owner = (message.channel.id, message.author.id)
+
+        # 같은 PDF가 이미 처리 중인지 알려면 내용 해시가 필요하므로 대기열에 넣기 전에 받는다.
+        # 받기 전에 대기열 한도부터 확인해 몰려드는 업로드가 다운로드·디스크를 쓰지 않게 한다.
+        # 합류한 요청은 한도에 들어가지 않으므로, 한도가 찼어도 처리 중인 작업이 있으면 받아서 해시를 본다
+        try:
+            self.scheduler.check_capacity(owner)
+            full = None
+        except QueueFullError as e:
+            full = e
+        if full and not self._flights:
+            await message.reply(f"지금은 요청이 많아 처리할 수 없습니다: {full}\n잠시 후 다시 업로드해주세요.")
+            return
+        try:
+            pdf_path, pdf_hash = await self._download(job_id, attachment)
+        except (discord.HTTPException, OSError) as e:
+            shutil.rmtree(get_job_dir(job_id), ignore_errors=True)
+            await message.reply(f"PDF를 받을 수 없습니다: {e}")
+            return
+        if full and pdf_hash not in self._flights:
+            shutil.rmtree(get_job_dir(job_id), ignore_errors=True)
+            await message.reply(f"지금은 요청이 많아 처리할 수 없습니다: {full}\n잠시 후 다시 업로드해주세요.")
+            return
+        self.store.put(
+            job_id, status="queued", pdf_name=attachment.filename, pdf_path=pdf_path, pdf_hash=pdf_hash,
+            guild_id=message.guild.id if message.guild else None, channel_id=message.channel.id,
+            author_id=message.author.id, message_id=message.id,
+        )
 
-        # PDF 다운로드
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_path = os.path.join(OUTPUT_DIR, f"{timestamp}_{attachment.filename}")
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-        await attachment.save(pdf_path)
-        logger.info(f"PDF 저장: {pdf_path}")
+        try:
+            status = await self._enqueue(message, job_id, owner, pdf_path, pdf_hash)
+        except QueueFullError as e:
+            self.store.delete(job_id)
+            shutil.rmtree(get_job_dir(job_id), ignore_errors=True)
+            await message.reply(f"지금은 요청이 많아 처리할 수 없습니다: {e}\n잠시 후 다시 업로드해주세요.")
+            return
+        await message.reply(
+            f"PDF 수신 완료: `{attachment.filename}`\n{status} (작업 ID: `{job_id}`)"
+        )
 
-        # Claude CLI 실행
-        await message.channel.send("Claude Agent가 분석 중입니다... (최대 10분 소요)")
-        result = await run_meeting2deck(pdf_path)
+    @commands.command(name="resume")
+    async def resume(self, ctx: commands.Context, job_id: str):
+        """실패/타임아웃된 작업을 마지막 완료 스테이지 다음부터 이어서 실행한다."""
+        if ALLOWED_CHANNEL_ID and ctx.channel.id != ALLOWED_CHANNEL_ID:
+            return
+        job_id = os.path.basename(job_id)
+        job_dir = get_job_dir(job_id)
+        pdf_path = load_checkpoint(job_dir).get("pdf_path") if os.path.isdir(job_dir) else None
+        if not pdf_path or not os.path.exists(pdf_path):
+            await ctx.reply(f"작업을 찾을 수 없습니다: `{job_id}`")
+            return
+        if job_id in self._followers:
+            await ctx.reply(f"작업 `{job_id}`는 이미 실행 중입니다.")
+            return
 
-        if result.get("status") == "error":
-            await message.reply(f"처리 실패: {result.get('error', 'Unknown error')}")
+        pdf_hash = await asyncio.to_thread(result_cache.file_digest, pdf_path)
+        owner = (ctx.channel.id, ctx.author.id)
+        previous = self.store.get(job_id)
+        self.store.put(
+            job_id, status="queued", error=None, recoveries=0, pdf_path=pdf_path, pdf_hash=pdf_hash,
+            guild_id=ctx.guild.id if ctx.guild else None, channel_id=ctx.channel.id,
+            author_id=ctx.author.id, message_id=ctx.message.id,
+        )
+        try:
+            status = await self._enqueue(ctx.message, job_id, owner, pdf_path, pdf_hash)
+        except QueueFullError as e:
+            if previous:
+                self.store.update(job_id, status=previous["status"], error=previous["error"])
+            await ctx.reply(f"지금은 요청이 많아 처리할 수 없습니다: {e}")
             return
+        await ctx.reply(f"작업 `{job_id}`를 이어서 실행합니다. {status}")
+
+    async def _download(self, job_id: str, attachment: discord.Attachment):
+        """첨부 PDF를 작업 디렉토리에 저장하고 (경로, SHA-256)을 반환한다."""
+        job_dir = get_job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        pdf_path = os.path.join(job_dir, os.path.basename(attachment.filename))
+        async with telemetry.span("pdf_download", job_id=job_id, bytes=attachment.size):
+            await attachment.save(pdf_path)
+        logger.info(f"[{job_id}] PDF 저장: {pdf_path}")
+        return pdf_path, await asyncio.to_thread(result_cache.file_digest, pdf_path)
+
+    # ── 같은 PDF 동시 요청 합치기 (single-flight) ──
+
+    async def _enqueue(self, message: discord.Message, job_id: str, owner, pdf_path: str, pdf_hash: str) -> str:
+        """같은 내용의 PDF를 처리 중인 작업이 있으면 거기에 합류하고, 없으면 대기열에 넣는다.
+
+        합류한 요청은 워커를 차지하지 않고, 먼저 시작한 작업(leader)이 끝날 때 같은 결과를 받는다.
+        사용자에게 보여줄 상태 문구를 반환한다.
+
+        Raises:
+            QueueFullError: 새 작업을 대기열에 넣을 수 없음
+        """
+        leader = self._flights.get(pdf_hash)
+        if leader:
+            self._followers[leader].append((message, job_id))
+            self.store.merge_artifacts(job_id, {"follows": leader})
+            telemetry.count("jobs_coalesced")
+            logger.info(f"[{job_id}] 같은 PDF를 처리 중인 작업 {leader}에 합류")
+            return f"같은 PDF를 처리 중인 작업 `{leader}`에 합류했습니다. 완료되면 같은 결과를 보내드립니다."
+
+        # submit이 양보하는 동안 들어온 같은 PDF도 이 작업에 합류하도록 먼저 등록
+        self._flights[pdf_hash] = job_id
+        self._followers[job_id] = []
+        try:
+            pos = await self.scheduler.submit(
+                job_id, owner, lambda: self._process_job(message, job_id, pdf_path)
+            )
+        except QueueFullError:
+            for msg, fid in self._land(job_id):
+                # 그 사이 합류한 요청은 자기 작업으로 다시 시도
+                asyncio.create_task(self._retry_follower(msg, fid))
+            raise
+        if pos <= 1 and self.scheduler.in_flight < self.scheduler.workers:
+            return "곧 처리를 시작합니다..."
+        return f"대기열 {pos}번째입니다. 차례가 되면 처리를 시작합니다."
+
+    def _land(self, job_id: str) -> list:
+        """job_id가 이끄는 single-flight를 닫고 합류한 (message, job_id) 목록을 반환한다."""
+        for pdf_hash, leader in list(self._flights.items()):
+            if leader == job_id:
+                del self._flights[pdf_hash]
+        return self._followers.pop(job_id, [])
+
+    async def _retry_follower(self, message: discord.Message, job_id: str):
+        job = self.store.get(job_id)
+        self.store.merge_artifacts(job_id, {"follows": None})  # 이제 자기 작업으로 실행 (다시 합류하면 새로 기록)
+        try:
+            status = await self._enqueue(message, job_id, (message.channel.id, job["author_id"]),
+                                         job["pdf_path"], job["pdf_hash"])
+        except QueueFullError as e:
+            self.store.update(job_id, status="failed", error=str(e))
+            shutil.rmtree(get_job_dir(job_id), ignore_errors=True)
+            await message.reply(f"지금은 요청이 많아 처리할 수 없습니다: {e}\n잠시 후 다시 업로드해주세요.")
+            return
+        await message.reply(f"작업 `{job_id}`: {status}")
+
+    async def _finish(self, message: discord.Message, job_id: str, content: str, status: str, error: str = None):
+        """최종 결과를 답장하고 작업 기록을 갱신한다. 합류한 요청에도 같은 결과를 보낸다."""
+        followers = self._land(job_id)
+        try:
+            async with telemetry.span("discord_reply", job_id=job_id):
+                await message.reply(content)
+            self.store.update(job_id, status=status, error=error)
+        finally:
+            # leader 답장이 실패해도 합류한 요청은 결과를 받는다
+            await self._answer_followers(
+                followers, f"같은 PDF를 먼저 처리한 작업 `{job_id}`의 결과입니다.\n{content}", status, error)
+
+    async def _answer_followers(self, followers: list, content: str, status: str, error: str = None):
+        """_land로 꺼낸 합류 요청에 답장하고 작업 기록을 leader와 같은 상태로 갱신한다."""
+        for msg, fid in followers:
+            try:
+                await msg.reply(content)
+            except discord.HTTPException as e:
+                logger.warning(f"[{fid}] 합류 요청 결과 전송 실패: {e}")
+            self.store.update(fid, status=status, error=error)
+            # 결과는 leader 작업 디렉토리에 있으므로 새 업로드가 받아 둔 PDF 사본은 지운다.
+            # !resume·재시작 복구로 합류한 작업은 체크포인트와 스테이지 산출물이 있으므로 남긴다
+            fdir = get_job_dir(fid)
+            if not os.path.exists(os.path.join(fdir, CHECKPOINT_FILE)):
+                shutil.rmtree(fdir, ignore_errors=True)
+
+    async def _process_job(self, message: discord.Message, job_id: str, pdf_path: str):
+        """대기열 워커에서 실행되는 작업 1건의 전체 처리.
+
+        같은 job_id의 작업 디렉토리에 체크포인트가 있으면 완료된 스테이지는 건너뛴다.
+        """
+        self.store.update(job_id, status="running")
+        sp = telemetry.span("job", job_id=job_id)
+        try:
+            async with sp:
+                sp.status = await self._run_job(message, job_id, pdf_path)
+        except Exception as e:
+            # 취소(봇 종료)는 running으로 남겨 재시작 시 복구한다 (합류한 요청도 queued로 남는다)
+            error = f"{type(e).__name__}: {e}"
+            self.store.update(job_id, status="failed", error=error)
+            await self._answer_followers(
+                self._land(job_id), f"같은 PDF를 처리하던 작업 `{job_id}`이 실패했습니다: {error}", "failed", error)
+            raise
+        finally:
+            telemetry.count("jobs", status=sp.status)
+
+    async def _run_job(self, message: discord.Message, job_id: str, pdf_path: str) -> str:
+        """_process_job 본체. 작업 결과 상태("ok" 또는 "error")를 반환한다."""
+        job_dir = get_job_dir(job_id)
+        # 재시작 전 실행에서 이미 전달한 결과 (Drive 링크, 이메일 발송 여부) — 중복 전달 방지
+        delivered = (self.store.get(job_id) or {}).get("artifacts", {})
+
+        # Claude CLI 실행 (단계별 진행 상황을 한 메시지에 갱신)
+        progress = await message.channel.send("Claude Agent가 분석 중입니다... (최대 10분 소요)")
+        self.store.update(job_id, progress_message_id=progress.id)
+        result = {"status": "error", "error": "Claude CLI 결과 없음"}
+        async with telemetry.span("claude_pipeline", job_id=job_id) as sp:
+            async for event in stream_meeting2deck(pdf_path, job_id=job_id):
+                if event["type"] == "stage":
+                    self.store.update(job_id, stage=f"STEP {event['step']} {event['name']}")
+                    await self._edit_progress(progress, event)
+                elif event["type"] == "result":
+                    result = event["result"]
+            if result.get("status") == "error":
+                sp.status = "error"
+
+        if result.get("status") == "error":
+            reply = f"처리 실패: {result.get('error', 'Unknown error')}"
+            if result.get("resume_from"):
+                reply += f"\n`!resume {job_id}` 로 실패한 단계부터 다시 실행할 수 있습니다."
+            await self._finish(message, job_id, reply, "failed", result.get("error"))
+            return "error"
+        self.store.merge_artifacts(job_id, result)
+        if delivered.get("slides_url"):
+            result.setdefault("slides_url", delivered["slides_url"])
 
         # 결과 메시지 구성
-        response_parts = ["**Meeting2Deck 처리 완료**\n"]
+        response_parts = [f"**Meeting2Deck 처리 완료** (작업 ID: `{job_id}`)\n"]
+        if result.get("cached"):
+            response_parts.append("동일한 PDF의 이전 분석 결과를 재사용했습니다.")
 
-        # PPTX → Google Drive 업로드
-        slides_url = result.get("slides_url")
-        pptx_path = os.path.join(OUTPUT_DIR, "slides.pptx")
-        if not slides_url and os.path.exists(pptx_path):
-            await message.channel.send("PPTX를 Google Drive에 업로드 중...")
-            upload_result = upload_pptx_to_drive(pptx_path, title=f"Meeting2Deck {datetime.now().strftime('%Y-%m-%d')}")
-            if upload_result.get("slides_url"):
-                slides_url = upload_result["slides_url"]
-                result["slides_url"] = slides_url
+        # 결과 전달 병렬 실행: (Drive 업로드 → 이메일 웹훅) ‖ 노션 요약 첨부
+        # 이메일 본문에 슬라이드 링크가 들어가므로 웹훅만 업로드 뒤에 이어 붙인다
+        async def slides_then_email():
+            await self._ensure_slides_url(message, result, job_dir, job_id)
+            if result.get("slides_url"):
+                self.store.merge_artifacts(job_id, {"slides_url": result["slides_url"]})
+            if delivered.get("email_delivery") in ("sent", "queued"):
+                return delivered["email_delivery"]
+            async with telemetry.span("email_webhook", job_id=job_id) as sp:
+                delivery = await self._send_email_webhook(result)
+                sp.status = {"sent": "ok", "queued": "retry"}.get(delivery, "error")
+            self.store.merge_artifacts(job_id, {"email_delivery": delivery})
+            return delivery
 
+        async def notion():
+            async with telemetry.span("notion_post", job_id=job_id):
+                await self._post_notion_summary(message, result, job_dir)
+
+        email_delivery, _ = await asyncio.gather(slides_then_email(), notion())
+
+        slides_url = result.get("slides_url")
         if slides_url:
             response_parts.append(f"Google Slides: {slides_url}")
         else:
@@ -75,35 +345,155 @@ class Meeting2DeckBot(commands.Cog):
         else:
             response_parts.append("Notion: MD 파일로 저장됨 (MCP 연동 실패)")
 
-        # Make.com 웹훅 호출 (이메일 발송)
-        email_sent = await self._send_email_webhook(result)
-        if email_sent:
+        if email_delivery == "sent":
             response_parts.append(f"이메일: {EMAIL_RECIPIENT}에게 발송 완료")
+        elif email_delivery == "queued":
+            response_parts.append(f"이메일: 웹훅 응답 지연 — {EMAIL_RECIPIENT}에게 자동 재발송 예정")
         else:
             response_parts.append("이메일: 초안 파일로 저장됨 (웹훅 호출 실패)")
 
         if result.get("errors"):
             response_parts.append(f"\n경고: {', '.join(result['errors'])}")
+        if result.get("resume_from"):
+            response_parts.append(f"`!resume {job_id}` 로 `{result['resume_from']}` 단계부터 이어서 실행할 수 있습니다.")
+
+        await self._finish(message, job_id, "\n".join(response_parts), "completed")
+        return "ok"
+
+    # ── 재시작 복구 ──
+
+    async def _recover_jobs(self):
+        """이전 봇 프로세스에서 끝나지 않은 작업을 대기열에 다시 넣는다.
+
+        완료된 스테이지는 pipeline.json 체크포인트로 건너뛰므로 이미 비용을 들인 CLI 실행은
+        다시 하지 않는다. 이전 프로세스가 남긴 CLI는 출력을 다시 받을 수 없으므로 종료하고
+        해당 스테이지부터 새로 실행한다.
+        """
+        jobs = self.store.unfinished()
+        if jobs:
+            logger.info(f"재시작 전 미완료 작업 {len(jobs)}건 복구")
+        for job in jobs:
+            try:
+                await self._recover_job(job)
+            except Exception:
+                logger.exception(f"[{job['job_id']}] 작업 복구 실패")
+                self.store.update(job["job_id"], status="failed", error="재시작 후 복구 실패")
+
+    async def _recover_job(self, job: dict):
+        job_id = job["job_id"]
+        kill_orphaned_cli(job_id)
+        message = await self._fetch_message(job["channel_id"], job["message_id"])
+        if message is None:
+            self.store.update(job_id, status="failed", error="원본 메시지를 찾을 수 없음")
+            return
+        if job["progress_message_id"]:
+            try:
+                await message.channel.get_partial_message(job["progress_message_id"]).edit(
+                    content="봇 재시작으로 중단됨 — 이어서 처리합니다.")
+            except discord.HTTPException:
+                pass
+
+        if job["recoveries"] >= MAX_RECOVERIES:
+            self.store.update(job_id, status="failed", error="재시작 복구 한도 초과")
+            await message.reply(f"작업 `{job_id}`가 재시작 후에도 완료되지 않아 중단했습니다. "
+                                f"`!resume {job_id}` 로 다시 실행할 수 있습니다.")
+            return
+
+        # 받아 둔 PDF가 없으면 원본 메시지의 첨부를 다시 받는다
+        pdf_path, pdf_hash = job["pdf_path"], job["pdf_hash"]
+        if not (pdf_path and pdf_hash and os.path.exists(pdf_path)):
+            attachment = next((a for a in message.attachments if a.filename == job["pdf_name"]), None)
+            if attachment is None:
+                self.store.update(job_id, status="failed", error="PDF 첨부를 찾을 수 없음")
+                return
+            pdf_path, pdf_hash = await self._download(job_id, attachment)
+            self.store.update(job_id, pdf_path=pdf_path, pdf_hash=pdf_hash)
+
+        owner = (message.channel.id, job["author_id"])
+        try:
+            # 같은 PDF로 합류했던 요청은 먼저 복구된 leader에 다시 합류한다
+            status = await self._enqueue(message, job_id, owner, pdf_path, pdf_hash)
+        except QueueFullError as e:
+            self.store.update(job_id, status="failed", error=str(e))
+            await message.reply(f"작업 `{job_id}`를 재시작 후 다시 대기열에 넣지 못했습니다: {e}\n"
+                                f"`!resume {job_id}` 로 다시 실행할 수 있습니다.")
+            return
+        self.store.update(job_id, status="queued", recoveries=job["recoveries"] + 1)
+        await message.reply(f"봇이 재시작되어 작업 `{job_id}`를 이어서 처리합니다. "
+                            f"완료된 단계는 건너뜁니다. {status}")
+
+    async def _fetch_message(self, channel_id: int, message_id: int):
+        try:
+            channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+            return await channel.fetch_message(message_id)
+        except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
+            logger.warning(f"메시지를 가져올 수 없음 ({channel_id}/{message_id}): {e}")
+            return None
+
+    async def _ensure_slides_url(self, message: discord.Message, result: dict, job_dir: str, job_id: str):
+        """slides_url이 없으면 PPTX를 Google Drive에 업로드해 result에 채운다."""
+        pptx_path = result.get("slides_pptx_path", os.path.join(job_dir, "slides.pptx"))
+        if result.get("slides_url") or not os.path.exists(pptx_path):
+            return
+        status = await message.channel.send("PPTX를 Google Drive에 업로드 중...")
+        last_pct = 0
+
+        async def on_progress(fraction):
+            nonlocal last_pct
+            pct = int(fraction * 100)
+            if pct - last_pct < 10 and pct < 100:  # 10% 단위로만 메시지 갱신
+                return
+            last_pct = pct
+            try:
+                await status.edit(content=f"PPTX를 Google Drive에 업로드 중... {pct}%")
+            except discord.HTTPException as e:
+                logger.warning(f"[{job_id}] 업로드 진행 메시지 갱신 실패: {e}")
 
-        await message.reply("\n".join(response_parts))
+        upload_result = await upload_pptx_to_drive_async(
+            pptx_path,
+            title=f"Meeting2Deck {datetime.now().strftime('%Y-%m-%d')}",
+            job_id=job_id,
+            on_progress=on_progress,
+        )
+        if upload_result.get("slides_url"):
+            result["slides_url"] = upload_result["slides_url"]
 
-        # 노션 요약을 디스코드에도 첨부
-        notion_md_path = result.get("notion_md_path", os.path.join(OUTPUT_DIR, "notion_summary.md"))
+    async def _post_notion_summary(self, message: discord.Message, result: dict, job_dir: str):
+        """노션 요약을 디스코드에도 첨부."""
+        notion_md_path = result.get("notion_md_path", os.path.join(job_dir, "notion_summary.md"))
         if os.path.exists(notion_md_path):
             await message.channel.send(
                 "**노션 요약:**",
                 file=discord.File(notion_md_path, filename="meeting_summary.md"),
             )
 
-    async def _send_email_webhook(self, result: dict) -> bool:
-        if not MAKECOM_WEBHOOK_URL:
+    async def _edit_progress(self, progress: discord.Message, event: dict):
+        """진행 메시지에 STEP별 상태(완료/진행 중/대기)를 표시한다."""
+        lines = ["Claude Agent가 분석 중입니다..."]
+        for n, name in STAGES.items():
+            mark = "✅" if n in event["done"] else ("⏳" if n in event["active"] else "▫️")
+            lines.append(f"{mark} STEP {n}. {name}")
+        lines.append(f"경과: {int(event['elapsed'])}초")
+        try:
+            await progress.edit(content="\n".join(lines))
+        except discord.HTTPException as e:
+            logger.warning(f"진행 메시지 갱신 실패: {e}")
+
+    async def _send_email_webhook(self, result: dict):
+        """Make.com 웹훅으로 이메일 발송 요청.
+
+        Returns:
+            "sent" / "queued" (대기열에서 재시도) / "dead" (재시도 불가) / None (보내지 않음)
+        """
+        if not self.webhooks:
             logger.warning("MAKECOM_WEBHOOK_URL이 설정되지 않음")
-            return False
+            return None
 
-        email_draft_path = result.get("email_draft_path", os.path.join(OUTPUT_DIR, "email_draft.md"))
+        job_id = result.get("job_id", "")
+        email_draft_path = result.get("email_draft_path", os.path.join(result.get("job_dir", ""), "email_draft.md"))
         if not os.path.exists(email_draft_path):
-            logger.warning("email_draft.md 파일이 없음")
-            return False
+            logger.warning(f"[{job_id}] email_draft.md 파일이 없음")
+            return None
 
         with open(email_draft_path, "r", encoding="utf-8") as f:
             email_content = f.read()
@@ -119,20 +509,14 @@ class Meeting2DeckBot(commands.Cog):
             "body": body,
             "slides_url": result.get("slides_url", ""),
             "notion_url": result.get("notion_url", ""),
+            "job_id": job_id,
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(MAKECOM_WEBHOOK_URL, json=payload) as resp:
-                    if resp.status == 200:
-                        logger.info("Make.com 웹훅 호출 성공")
-                        return True
-                    else:
-                        logger.error(f"Make.com 웹훅 실패: {resp.status}")
-                        return False
-        except Exception as e:
-            logger.error(f"Make.com 웹훅 에러: {e}")
-            return False
+            return await self.webhooks.deliver(payload, job_id)
+        except OSError as e:
+            logger.error(f"[{job_id}] 웹훅 대기열 기록 실패: {e}")
+            return None
 
 
 async def setup(bot):
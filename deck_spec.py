@@ -0,0 +1,195 @@
+"""Meeting2Deck 덱 JSON 스펙 스키마 및 검증.
+
+output/slides.json (CLAUDE.md STEP 5) 과 Slides MCP build_deck_from_json 이
+공유하는 형식이다. DeckBuilder.from_spec 과 MCP 서버가 같은 검증을 사용한다.
+
+    {
+      "deck_title": "", "deck_subtitle": "", "date": "", "org": "",
+      "slides": [
+        {"type": "title", "title": "", "subtitle": "", "description": ""},
+        {"type": "bullet", "title": "", "bullets": [], "section": "", "description": ""},
+        {"type": "cards", "title": "", "cards": [{"icon": "", "title": "", "body": ""}]},
+        {"type": "two_column", "title": "", "left_bullets": [], "right_bullets": [],
+         "left_title": "", "right_title": ""},
+        {"type": "table", "title": "", "headers": [], "rows": [[]]},
+        {"type": "diagram", "title": "", "diagram_spec": {"nodes": [], "edges": [], "layout_hint": ""}},
+        {"type": "closing", "message": "", "submessage": ""}
+      ]
+    }
+"""
+
+import hashlib
+import json
+
+SLIDE_TYPES = ["title", "bullet", "cards", "two_column", "table", "diagram", "closing"]
+
+# 하단 푸터(페이지 번호)가 붙는 타입 — 앞쪽에 이런 슬라이드가 늘거나 줄면 페이지 번호가 바뀐다
+FOOTER_TYPES = {"bullet", "cards", "two_column", "table", "diagram"}
+
+_STR = {"type": "string"}
+_STR_LIST = {"type": "array", "items": {"type": "string"}}
+_CARD = {"type": "object", "properties": {"icon": _STR, "title": _STR, "body": _STR}}
+# 노드는 문자열 또는 {"name", "desc", "icon"} 객체
+_NODE = {"type": ["string", "object"], "properties": {"name": _STR, "desc": _STR, "icon": _STR}}
+# 간선은 "A->B: 라벨", ["A", "B", "라벨"] 또는 {"from", "to", "label"}
+_EDGE = {
+    "type": ["string", "array", "object"],
+    "items": {"type": "string"},
+    "properties": {"from": _STR, "to": _STR, "source": _STR, "target": _STR, "label": _STR},
+}
+
+DECK_SPEC_SCHEMA = {
+    "type": "object",
+    "required": ["slides"],
+    "properties": {
+        "deck_title": _STR,
+        "deck_subtitle": _STR,
+        "tone": _STR,
+        "date": _STR,
+        "org": _STR,
+        "slides": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "slide_number": {"type": "integer"},
+                    "type": {"type": "string", "enum": SLIDE_TYPES + ["two-column"],
+                             "description": "Slide type (default: bullet)"},
+                    "title": _STR,
+                    "subtitle": _STR,
+                    "section": _STR,
+                    "description": _STR,
+                    "bullets": _STR_LIST,
+                    "cards": {"type": "array", "items": _CARD},
+                    "left_title": _STR,
+                    "right_title": _STR,
+                    "left_bullets": _STR_LIST,
+                    "right_bullets": _STR_LIST,
+                    "headers": dict(_STR_LIST, minItems=1),
+                    "rows": {"type": "array", "items": {"type": "array"}},
+                    "diagram_spec": {
+                        "type": "object",
+                        "properties": {
+                            "nodes": {"type": "array", "items": _NODE},
+                            "edges": {"type": "array", "items": _EDGE},
+                            "layout_hint": _STR,
+                        },
+                    },
+                    "message": _STR,
+                    "submessage": _STR,
+                },
+            },
+        },
+    },
+}
+
+# 타입별 필수 필드 (자료형은 DECK_SPEC_SCHEMA가 검사)
+_REQUIRED = {
+    "bullet": ["bullets"],
+    "cards": ["cards"],
+    "two_column": ["left_bullets", "right_bullets"],
+    "table": ["headers", "rows"],
+    "diagram": ["diagram_spec"],
+}
+
+_TYPE_NAMES = {"string": "문자열", "integer": "정수", "number": "숫자", "boolean": "불리언",
+               "array": "배열", "object": "객체"}
+
+
+class DeckSpecError(ValueError):
+    """덱 스펙이 스키마에 맞지 않을 때 발생. errors에 전체 오류 목록."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+    def __reduce__(self):  # 렌더 워커 프로세스에서 돌려받을 때 errors 목록 유지
+        return (type(self), (self.errors,))
+
+
+def normalize_type(t):
+    return (t or "bullet").replace("-", "_")
+
+
+def _is_type(value, name):
+    if name == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, {"string": str, "boolean": bool, "array": list, "object": dict}[name])
+
+
+def _check(value, schema, where, errors):
+    """DECK_SPEC_SCHEMA에서 쓰는 만큼의 JSON Schema (type/enum/required/properties/items/minItems) 검사."""
+    types = schema.get("type")
+    if types:
+        types = [types] if isinstance(types, str) else types
+        if not any(_is_type(value, t) for t in types):
+            expected = " 또는 ".join(_TYPE_NAMES[t] for t in types)
+            errors.append(f"{where or '스펙'}: {expected} 타입이어야 합니다")
+            return
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{where}: 알 수 없는 값 '{value}'")
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{where}.{key}: 필수 항목입니다" if where else f"{key}: 필수 항목입니다")
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                _check(value[key], sub, f"{where}.{key}" if where else key, errors)
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{where}: 항목이 {schema['minItems']}개 이상 필요합니다")
+        if "items" in schema:
+            for i, item in enumerate(value):
+                _check(item, schema["items"], f"{where}[{i}]", errors)
+
+
+def validate_spec(spec):
+    """스펙을 DECK_SPEC_SCHEMA와 타입별 필수 필드로 검증하고 오류 메시지 목록을 반환한다 (없으면 빈 리스트)."""
+    if not isinstance(spec, dict):
+        return ["스펙은 JSON 객체여야 합니다"]
+    errors = []
+    _check(spec, DECK_SPEC_SCHEMA, "", errors)
+    slides = spec.get("slides")
+    for i, sl in enumerate(slides if isinstance(slides, list) else []):
+        if not isinstance(sl, dict):
+            continue
+        t = normalize_type(sl.get("type"))
+        for key in _REQUIRED.get(t, []):
+            if key not in sl:
+                errors.append(f"slides[{i}].{key}: 필수 항목입니다 ({t} 슬라이드)")
+    return errors
+
+
+def check_spec(spec):
+    """검증 실패 시 DeckSpecError를 발생시킨다."""
+    errors = validate_spec(spec)
+    if errors:
+        raise DeckSpecError(errors)
+
+
+def slide_hashes(spec, counts=None):
+    """슬라이드별 렌더링 입력의 SHA-256 목록.
+
+    슬라이드 내용에 덱 제목/부제/날짜/조직(표지·푸터), 슬라이드 번호, 시작 페이지 번호를
+    더해 해시하므로 해시가 같으면 같은 슬라이드가 그려진다.
+    counts: 스펙 슬라이드별 PPTX 슬라이드 수 (넘침 분할, DeckBuilder.page_count). 기본 1장씩
+    """
+    deck = [spec.get(k, "") for k in ("deck_title", "deck_subtitle", "date", "org")]
+    hashes = []
+    page = 0
+    for i, sl in enumerate(spec.get("slides", [])):
+        t = normalize_type(sl.get("type"))
+        key = {"slide": sl, "type": t, "num": sl.get("slide_number", i + 1), "page": page, "deck": deck}
+        if t in FOOTER_TYPES:
+            page += counts[i] if counts else 1
+        raw = json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        hashes.append(hashlib.sha256(raw).hexdigest())
+    return hashes
+
+
+def changed_slides(prev_spec, spec, prev_counts=None, counts=None):
+    """spec에서 prev_spec과 다르게 그려질 슬라이드의 인덱스 목록 (뒤에 추가된 슬라이드 포함)."""
+    old, new = slide_hashes(prev_spec, prev_counts), slide_hashes(spec, counts)
+    return [i for i, h in enumerate(new) if i >= len(old) or old[i] != h]
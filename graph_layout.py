@@ -0,0 +1,270 @@
+"""다이어그램 노드 계층 배치 (Sugiyama 방식).
+
+diagram_spec의 nodes/edges/layout_hint를 받아 노드를 계층(layer)과 계층 안 순서(slot)로
+격자에 배치한다. DeckBuilder.add_diagram_slide와 Slides MCP 서버가 같은 배치를 쓴다.
+
+1. 순환 제거 — DFS 역방향 간선을 뒤집는다
+2. 계층 배정 — 최장 경로 (위상 정렬 순서)
+3. 두 계층 이상 건너는 간선에 더미 노드 삽입
+4. 교차 최소화 — 무게중심(barycenter) 위/아래 반복 정렬, 교차 수는 Fenwick 트리로 O(E log V)
+5. 좌표 — 계층마다 노드를 가운데 정렬한 격자 칸
+
+전체 O(반복 × (V + E) log V)라 노드 50개 이상도 수 ms 안에 끝난다.
+
+    edges 형식: "A->B", "A → B", ["A", "B"], {"from": "A", "to": "B", "label": "SIP"}
+    layout_hint: "top-down"/"vertical"/"TB"/"세로" 등이면 위→아래, 그 외 왼쪽→오른쪽
+"""
+
+import re
+
+SWEEPS = 8  # 교차 최소화 위/아래 정렬 반복 횟수
+
+_EDGE_SPLIT = re.compile(r"\s*(?:->|→|=>|—>|-->)\s*")
+_TB_HINTS = ("top", "down", "vertical", "tb", "세로", "위", "아래", "계층")
+
+
+class DiagramLayout:
+    """배치 결과.
+
+    nodes: [{"name", "desc", "icon"}, ...]
+    edges: [(출발 인덱스, 도착 인덱스, 라벨), ...] (원래 방향)
+    rank/slot: 노드별 계층 번호와 계층 안 격자 위치 (가운데 정렬이라 0.5 단위일 수 있음)
+    n_layers: 계층 수, width: 가장 넓은 계층의 노드 수
+    direction: "LR" (계층이 왼쪽→오른쪽) 또는 "TB" (위→아래)
+    """
+
+    def __init__(self, nodes, edges, rank, slot, n_layers, width, direction, crossings):
+        self.nodes = nodes
+        self.edges = edges
+        self.rank = rank
+        self.slot = slot
+        self.n_layers = n_layers
+        self.width = width
+        self.direction = direction
+        self.crossings = crossings
+
+    def place(self, x, y, w, h, max_w=1371600, max_h=1143000):
+        """(x, y, w, h) 영역 격자에 노드 상자를 놓는다 (EMU).
+
+        Returns:
+            ([(노드별 왼쪽, 위)], 상자 폭, 상자 높이). 계층 사이에는 연결선 자리를 남긴다.
+        """
+        lr = self.direction == "LR"
+        n_cols, n_rows = (self.n_layers, self.width) if lr else (self.width, self.n_layers)
+        col_p = w / max(n_cols, 1)
+        row_p = h / max(n_rows, 1)
+        if lr:
+            bw, bh = min(int(col_p * 0.65), max_w), min(int(row_p * 0.85), max_h)
+        else:
+            bw, bh = min(int(col_p * 0.85), max_w), min(int(row_p * 0.6), max_h)
+        pos = []
+        for i in range(len(self.nodes)):
+            col, row = (self.rank[i], self.slot[i]) if lr else (self.slot[i], self.rank[i])
+            pos.append((int(x + (col + 0.5) * col_p - bw / 2), int(y + (row + 0.5) * row_p - bh / 2)))
+        return pos, bw, bh
+
+    def sites(self, u, v):
+        """간선 u→v의 (출발, 도착) 연결점 번호: 0 위, 1 왼쪽, 2 아래, 3 오른쪽.
+
+        계층 방향으로 나가고 들어오며, 순환 때문에 뒤로 가는 간선은 반대쪽을 쓴다.
+        """
+        fwd, back = ((3, 1), (1, 3)) if self.direction == "LR" else ((2, 0), (0, 2))
+        return fwd if self.rank[u] < self.rank[v] else back
+
+
+def parse_nodes(nodes):
+    """문자열 또는 dict 노드를 {"name", ...} dict로 통일."""
+    return [dict(n) if isinstance(n, dict) else {"name": str(n)} for n in nodes]
+
+
+def _edge_ends(e):
+    if isinstance(e, dict):
+        return e.get("from", e.get("source")), e.get("to", e.get("target")), e.get("label", "")
+    if isinstance(e, (list, tuple)) and len(e) >= 2:
+        return e[0], e[1], e[2] if len(e) > 2 else ""
+    if isinstance(e, str):
+        label = ""
+        if ":" in e:  # "A->B: 라벨"
+            e, label = e.split(":", 1)
+        parts = _EDGE_SPLIT.split(e.strip())
+        if len(parts) == 2:
+            return parts[0], parts[1], label.strip()
+    return None, None, ""
+
+
+def parse_edges(edges, nodes):
+    """간선을 (u, v, label) 인덱스 튜플로 변환. 모르는 이름은 노드로 추가한다 (nodes 변경)."""
+    index = {n.get("name", ""): i for i, n in enumerate(nodes)}
+    out, seen = [], set()
+    for e in edges:
+        a, b, label = _edge_ends(e)
+        if a is None or b is None:
+            continue
+        ends = []
+        for name in (str(a).strip(), str(b).strip()):
+            if name not in index:
+                index[name] = len(nodes)
+                nodes.append({"name": name})
+            ends.append(index[name])
+        u, v = ends
+        if u == v or (u, v) in seen:
+            continue
+        seen.add((u, v))
+        out.append((u, v, label))
+    return out
+
+
+def direction_of(layout_hint):
+    hint = (layout_hint or "").lower()
+    return "TB" if any(h in hint for h in _TB_HINTS) else "LR"
+
+
+def _break_cycles(n, succ):
+    """DFS로 역방향 간선을 찾아 뒤집은 인접 리스트 (DAG)를 반환."""
+    state = [0] * n  # 0: 미방문, 1: 스택, 2: 완료
+    dag = [[] for _ in range(n)]
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            u, it = stack[-1]
+            v = next(it, None)
+            if v is None:
+                state[u] = 2
+                stack.pop()
+            elif state[v] == 1:
+                dag[v].append(u)  # 역방향 간선 → 뒤집기
+            else:
+                dag[u].append(v)
+                if state[v] == 0:
+                    state[v] = 1
+                    stack.append((v, iter(succ[v])))
+    return dag
+
+
+def _assign_ranks(n, dag):
+    """최장 경로 계층 배정 (Kahn 위상 정렬)."""
+    indeg = [0] * n
+    for u in range(n):
+        for v in dag[u]:
+            indeg[v] += 1
+    rank = [0] * n
+    queue = [u for u in range(n) if indeg[u] == 0]
+    for u in queue:  # 순회 중 append → BFS
+        for v in dag[u]:
+            rank[v] = max(rank[v], rank[u] + 1)
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+    return rank
+
+
+def _count_crossings(upper_pos, lower_pos, pairs):
+    """두 인접 계층 사이 간선 교차 수 (Fenwick 트리 역순쌍 계산)."""
+    if len(pairs) < 2:
+        return 0
+    ordered = sorted((upper_pos[u], lower_pos[v]) for u, v in pairs)
+    size = max(p for _, p in ordered) + 1
+    tree = [0] * (size + 1)
+    crossings = 0
+    for seen, (_, p) in enumerate(ordered):
+        # 지금까지 본 간선 중 아래쪽 위치가 p보다 큰 것의 수
+        i, le = p + 1, 0
+        while i > 0:
+            le += tree[i]
+            i -= i & -i
+        crossings += seen - le
+        i = p + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def _total_crossings(layers, between):
+    total = 0
+    for r in range(len(layers) - 1):
+        up = {u: i for i, u in enumerate(layers[r])}
+        lo = {v: i for i, v in enumerate(layers[r + 1])}
+        total += _count_crossings(up, lo, between[r])
+    return total
+
+
+def _sweep(layers, fixed_r, free_r, neighbors):
+    """free_r 계층을 fixed_r 계층 이웃 위치의 무게중심 순으로 정렬."""
+    pos = {u: i for i, u in enumerate(layers[fixed_r])}
+    keyed = []
+    for i, v in enumerate(layers[free_r]):
+        ns = [pos[u] for u in neighbors[v] if u in pos]
+        keyed.append((sum(ns) / len(ns) if ns else i, i, v))
+    keyed.sort()
+    layers[free_r] = [v for _, _, v in keyed]
+
+
+def layered_layout(nodes, edges=(), layout_hint=""):
+    """nodes/edges를 계층 배치한 DiagramLayout을 반환."""
+    nodes = parse_nodes(nodes)
+    parsed = parse_edges(edges, nodes)
+    n = len(nodes)
+
+    succ = [[] for _ in range(n)]
+    for u, v, _ in parsed:
+        succ[u].append(v)
+    dag = _break_cycles(n, succ)
+    rank = _assign_ranks(n, dag)
+    n_layers = max(rank, default=-1) + 1
+
+    # 긴 간선을 더미 노드 체인으로 나눠 인접 계층 간선만 남긴다
+    layer_of = list(rank)
+    up_nb = {u: [] for u in range(n)}
+    down_nb = {u: [] for u in range(n)}
+    between = [[] for _ in range(max(n_layers - 1, 0))]
+    next_id = n
+    for u in range(n):
+        for v in dag[u]:
+            prev = u
+            for r in range(rank[u] + 1, rank[v]):
+                d = next_id
+                next_id += 1
+                layer_of.append(r)
+                up_nb[d], down_nb[d] = [], []
+                down_nb[prev].append(d)
+                up_nb[d].append(prev)
+                between[r - 1].append((prev, d))
+                prev = d
+            down_nb[prev].append(v)
+            up_nb[v].append(prev)
+            between[rank[v] - 1].append((prev, v))
+
+    layers = [[] for _ in range(n_layers)]
+    for u, r in enumerate(layer_of):  # 초기 순서: 입력 순서 (더미는 뒤)
+        layers[r].append(u)
+
+    best = [list(l) for l in layers]
+    best_c = _total_crossings(layers, between)
+    for it in range(SWEEPS):
+        if best_c == 0:
+            break
+        if it % 2 == 0:
+            for r in range(1, n_layers):
+                _sweep(layers, r - 1, r, up_nb)
+        else:
+            for r in range(n_layers - 2, -1, -1):
+                _sweep(layers, r + 1, r, down_nb)
+        c = _total_crossings(layers, between)
+        if c < best_c:
+            best, best_c = [list(l) for l in layers], c
+
+    # 좌표: 더미를 빼고 계층마다 가운데 정렬
+    real = [[u for u in layer if u < n] for layer in best]
+    width = max((len(l) for l in real), default=0)
+    slot = [0.0] * n
+    for layer in real:
+        offset = (width - len(layer)) / 2
+        for i, u in enumerate(layer):
+            slot[u] = offset + i
+
+    return DiagramLayout(nodes, parsed, rank, slot, n_layers, width,
+                         direction_of(layout_hint), best_c)
@@ -20,4 +20,6 @@ async def on_ready():
     logging.info("meeting2deck_bot cog 로드 완료")
 
 
-bot.run(os.getenv("DISCORD_TOKEN"))
+# 렌더 워커(spawn)가 이 모듈을 다시 import해도 봇이 또 뜨지 않도록
+if __name__ == "__main__":
+    bot.run(os.getenv("DISCORD_TOKEN"))
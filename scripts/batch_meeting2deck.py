@@ -0,0 +1,221 @@
+"""회의 PDF 일괄 처리 (주간 녹화 백필 등).
+
+디렉토리/글롭으로 지정한 PDF들을 run_meeting2deck으로 병렬 처리한다.
+PDF마다 작업 디렉토리(output/jobs/<job_id>/)가 따로 생기고, 진행 상황은 manifest에
+기록되어 중단 후 같은 명령을 다시 실행하면 완료된 PDF는 건너뛰고 실패/중단된 PDF는
+같은 job_id로 마지막 완료 스테이지 다음부터 이어서 실행한다.
+
+실행:
+    python scripts/batch_meeting2deck.py meetings/2026-W08/
+    python scripts/batch_meeting2deck.py "meetings/**/*.pdf" --concurrency 4
+    python scripts/batch_meeting2deck.py meetings/ --manifest output/backfill_w08.json --skip-failed
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import socket
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.claude_runner import OUTPUT_DIR, new_job_id, run_meeting2deck
+from services.job_queue import JobScheduler
+from services.render_pool import RENDER_SOCKET, RenderPool
+
+logger = logging.getLogger("batch")
+
+DEFAULT_MANIFEST = os.path.join(OUTPUT_DIR, "batch_manifest.json")
+DEFAULT_CONCURRENCY = int(os.getenv("MEETING2DECK_WORKERS", "2"))
+
+
+def find_pdfs(patterns: list) -> list:
+    """디렉토리(하위 포함) 또는 글롭 패턴에서 PDF 절대 경로 목록 (정렬, 중복 제거)."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*.pdf")
+        for path in glob.glob(pattern, recursive=True):
+            if path.lower().endswith(".pdf") and os.path.isfile(path):
+                found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def load_manifest(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"items": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    """manifest를 원자적으로 기록한다 (쓰는 도중 중단돼도 이전 상태 유지)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _signature(pdf_path: str) -> list:
+    st = os.stat(pdf_path)
+    return [st.st_size, int(st.st_mtime)]
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def build_report(items: list, skipped: int, wall: float) -> dict:
+    """이번 실행에서 처리한 항목의 처리량/지연 통계."""
+    latencies = [it["elapsed"] for it in items if it.get("elapsed") is not None]
+    completed = [it for it in items if it["status"] == "completed"]
+    return {
+        "processed": len(items),
+        "completed": len(completed),
+        "failed": len(items) - len(completed),
+        "skipped": skipped,
+        "cached": sum(1 for it in completed if it.get("cached")),
+        "wall_s": round(wall, 1),
+        "pdfs_per_hour": round(len(completed) / wall * 3600, 1) if wall > 0 else 0.0,
+        "latency_p50_s": round(_percentile(latencies, 0.5), 1),
+        "latency_p95_s": round(_percentile(latencies, 0.95), 1),
+        "latency_max_s": round(max(latencies, default=0.0), 1),
+    }
+
+
+def _render_server_running(socket_path: str = RENDER_SOCKET) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+async def run_batch(pdfs: list, manifest_path: str = DEFAULT_MANIFEST,
+                    concurrency: int = DEFAULT_CONCURRENCY, retry_failed: bool = True,
+                    use_cache: bool = True) -> dict:
+    """PDF 목록을 병렬 처리하고 이번 실행의 리포트를 반환한다.
+
+    manifest의 항목은 PDF 절대 경로로 식별하며, 파일 크기/수정 시각이 바뀌면 새 항목으로 본다.
+    """
+    manifest = load_manifest(manifest_path)
+    items = manifest["items"]
+
+    todo, skipped = [], 0
+    for pdf in pdfs:
+        item = items.get(pdf)
+        if item and item.get("signature") != _signature(pdf):
+            item = None  # 같은 경로에 다른 파일 — 처음부터
+        if item and (item["status"] == "completed" or (item["status"] == "failed" and not retry_failed)):
+            skipped += 1
+            continue
+        if not item:
+            item = items[pdf] = {"signature": _signature(pdf), "job_id": new_job_id()}
+        item["status"] = "pending"
+        todo.append((pdf, item))
+    save_manifest(manifest_path, manifest)
+    logger.info(f"대상 {len(pdfs)}건: 실행 {len(todo)}, 건너뜀 {skipped} (manifest {manifest_path})")
+
+    # 봇이 렌더 서버를 띄워 두었으면 그대로 쓰고, 없으면 이 프로세스에서 띄운다
+    render_pool = None
+    if todo and not _render_server_running():
+        render_pool = RenderPool()
+        render_pool.start()
+        await render_pool.serve()
+
+    scheduler = JobScheduler(workers=concurrency, max_pending=len(todo) + 1,
+                             max_per_owner=len(todo) + 1)
+    loop = asyncio.get_running_loop()
+    finished = []
+    start = time.monotonic()
+
+    async def _process(pdf, item, done):
+        t0 = time.monotonic()
+        item.update(status="running", started_at=time.time())
+        save_manifest(manifest_path, manifest)
+        try:
+            result = await run_meeting2deck(pdf, job_id=item["job_id"], use_cache=use_cache)
+        except Exception as e:
+            logger.exception(f"[{item['job_id']}] 처리 중 예외: {pdf}")
+            result = {"status": "error", "error": str(e)}
+        finally:
+            item["elapsed"] = round(time.monotonic() - t0, 1)
+        ok = result.get("status") == "completed"
+        item.update(
+            status="completed" if ok else "failed",
+            job_dir=result.get("job_dir"),
+            cached=bool(result.get("cached")),
+            error=None if ok else result.get("error") or "; ".join(result.get("errors", [])),
+            resume_from=result.get("resume_from"),
+        )
+        save_manifest(manifest_path, manifest)
+        finished.append(item)
+        mark = "완료" if ok else f"실패: {item['error']}"
+        logger.info(f"[{len(finished)}/{len(todo)}] {os.path.basename(pdf)} {mark} ({item['elapsed']}s)")
+        done.set_result(None)
+
+    scheduler.start()
+    try:
+        waits = []
+        for pdf, item in todo:
+            done = loop.create_future()
+            waits.append(done)
+            await scheduler.submit(item["job_id"], "batch",
+                                   lambda pdf=pdf, item=item, done=done: _process(pdf, item, done))
+        await asyncio.gather(*waits)
+    finally:
+        # 중단(Ctrl+C) 시 실행 중인 CLI도 함께 정리. running 항목은 다음 실행에서 이어감
+        await scheduler.stop()
+        if render_pool:
+            await render_pool.stop()
+        save_manifest(manifest_path, manifest)
+
+    report = build_report(finished, skipped, time.monotonic() - start)
+    manifest["last_report"] = report
+    save_manifest(manifest_path, manifest)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="PDF 디렉토리 또는 글롭 패턴")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"동시 처리 PDF 수 (기본 {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="진행 상황 manifest 경로")
+    parser.add_argument("--skip-failed", action="store_true", help="이전에 실패한 PDF는 다시 시도하지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="결과 캐시를 쓰지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    pdfs = find_pdfs(args.paths)
+    if not pdfs:
+        print("PDF 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+    try:
+        report = asyncio.run(run_batch(pdfs, args.manifest, args.concurrency,
+                                       retry_failed=not args.skip_failed, use_cache=not args.no_cache))
+    except KeyboardInterrupt:
+        print(f"\n중단됨 — 같은 명령으로 다시 실행하면 이어서 처리합니다 ({args.manifest})")
+        sys.exit(130)
+
+    print(f"\n완료 {report['completed']} / 실패 {report['failed']} / 건너뜀 {report['skipped']}"
+          f" (캐시 재사용 {report['cached']})")
+    print(f"총 {report['wall_s']}s, 처리량 {report['pdfs_per_hour']} PDF/시간, "
+          f"지연 p50 {report['latency_p50_s']}s · p95 {report['latency_p95_s']}s · 최대 {report['latency_max_s']}s")
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""DeckBuilder 슬라이드 렌더링 시간 측정 (공통 요소 템플릿 복제 전/후 비교).
+실행: python scripts/bench_deck_render.py [슬라이드 수] [반복 횟수]"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx.oxml.ns import qn
+
+from slide_template import DeckBuilder
+
+
+def build_deck(n_slides, fast):
+    DeckBuilder.FAST_CHROME = fast
+    deck = DeckBuilder("벤치마크 덱", date="2026.02.24", org="Meeting2Deck")
+    deck.add_title_slide(subtitle="렌더링 성능 측정", description="합성 데이터")
+    for i in range(n_slides):
+        num = f"{i % 10:02d}"
+        kind = i % 5
+        if kind == 0:
+            deck.add_content_slide(num, "Summary", f"요약 {i}", [f"불릿 {j}" for j in range(5)])
+        elif kind == 1:
+            deck.add_cards_slide(num, "Background", f"카드 {i}", [
+                {"icon": str(j + 1), "title": f"카드 {j}", "body": "설명 문구"} for j in range(3)
+            ])
+        elif kind == 2:
+            deck.add_two_column_slide(num, "Compare", f"비교 {i}", ["A1", "A2"], ["B1", "B2"],
+                                      left_title="현재", right_title="목표")
+        elif kind == 3:
+            deck.add_table_slide(num, "Action Items", f"액션 {i}", ["#", "담당", "내용"],
+                                 [[str(r), "TBD", "작업"] for r in range(5)])
+        else:
+            deck.add_diagram_slide(num, "Architecture", f"구성도 {i}", [
+                {"name": "PBX", "desc": "교환기"}, {"name": "IVR", "desc": "자동 응답"},
+                {"name": "CTI", "desc": "연동"},
+            ])
+    deck.add_closing_slide(submessage="감사합니다")
+    return deck
+
+
+def slide_texts(fast):
+    """제어 문자가 든 제목/섹션을 첫 슬라이드(직접 생성)와 이후 슬라이드(템플릿 복제)로 그려 a:t 텍스트를 모은다."""
+    DeckBuilder.FAST_CHROME = fast
+    deck = DeckBuilder("제어\x0b문자", date="2026.02.24", org="Meeting2Deck")
+    for i, title in enumerate(["a", "b\x0bc", "d\x07e"]):
+        deck.add_content_slide(f"{i:02d}", "Sec\x01tion", title, ["x"])
+    return [[t.text for t in slide._element.iter(qn('a:t'))] for slide in deck.prs.slides]
+
+
+def check_ctrl_chars():
+    """복제 경로가 제어 문자를 객체 모델 경로와 똑같이 이스케이프하는지 확인."""
+    fast, slow = slide_texts(True), slide_texts(False)
+    if fast != slow:
+        sys.exit(f"제어 문자 이스케이프 불일치:\n  복제: {fast}\n  직접: {slow}")
+
+
+def measure(n_slides, repeat, fast):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        build_deck(n_slides, fast)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    check_ctrl_chars()
+    build_deck(5, True)  # import/초기화 워밍업
+
+    before = measure(n_slides, repeat, fast=False)
+    after = measure(n_slides, repeat, fast=True)
+    per_before = before / n_slides * 1000
+    per_after = after / n_slides * 1000
+
+    print(f"슬라이드 {n_slides}장, 최선 {repeat}회")
+    print(f"  객체 모델 생성  : {before:.3f}s  ({per_before:.2f} ms/slide)")
+    print(f"  템플릿 복제     : {after:.3f}s  ({per_after:.2f} ms/slide)")
+    print(f"  개선            : {per_before / per_after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""DeckBuilder 렌더링 처리량/메모리 벤치마크 스위트.
+
+합성 덱 스펙(슬라이드 10~500장, 최대 수천 셀 표, 다이어그램 노드 수 변화)을
+DeckBuilder.from_spec으로 렌더링하고 시나리오별 slides/sec, 표 cells/sec, 최대 RSS,
+출력 파일 크기를 측정한다. 각 시나리오는 별도 프로세스에서 실행해 RSS가 서로 섞이지 않는다.
+
+실행:
+    python scripts/bench_suite.py                  # 측정 + 기준값과 비교 (회귀 시 exit 1)
+    python scripts/bench_suite.py --update-baseline  # 기준값 갱신
+    python scripts/bench_suite.py --only table_5000
+"""
+
+import argparse
+import json
+import os
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+BASELINE_PATH = os.path.join(PROJECT_DIR, "scripts", "bench_baseline.json")
+
+# 기준 대비 허용 오차 (속도는 기기 편차가 커서 넉넉하게)
+SPEED_TOLERANCE = 0.25
+SIZE_TOLERANCE = 0.10
+RSS_TOLERANCE = 0.20
+
+
+# ── 합성 덱 스펙 ──
+
+def _bullet_slide(i, n_bullets=5):
+    return {"type": "bullet", "title": f"핵심 논의 {i}",
+            "bullets": [f"논의 항목 {i}-{j}: 콜센터 상담 흐름 개선 방안 검토" for j in range(n_bullets)]}
+
+
+def _table_slide(i, rows, cols):
+    return {"type": "table", "title": f"액션 아이템 {i}",
+            "headers": [f"열 {c}" for c in range(cols)],
+            "rows": [[f"R{r}C{c}" for c in range(cols)] for r in range(rows)]}
+
+
+def _action_items(n_rows):
+    """긴 회의의 액션 아이템 표 (한글 문장 셀)."""
+    return [{"type": "table", "title": "액션 아이템",
+             "headers": ["#", "담당", "내용", "기한", "상태"],
+             "rows": [[str(r + 1), f"담당자 {r % 7}", f"상담 흐름 개선 과제 {r}: IVR 시나리오 정비 및 CTI 연동 검토",
+                       "2026.03.31", "진행 중" if r % 3 else "미착수"] for r in range(n_rows)]}]
+
+
+def _diagram_slide(i, n_nodes):
+    return {"type": "diagram", "title": f"구성도 {i}",
+            "diagram_spec": {"nodes": [{"name": f"N{k}", "desc": f"컴포넌트 {k}"} for k in range(n_nodes)]}}
+
+
+def _mixed(n):
+    slides = []
+    for i in range(n):
+        kind = i % 5
+        if kind == 0:
+            slides.append(_bullet_slide(i))
+        elif kind == 1:
+            slides.append({"type": "cards", "title": f"배경 {i}", "cards": [
+                {"icon": str(k + 1), "title": f"과제 {k}", "body": "설명 문구"} for k in range(3)]})
+        elif kind == 2:
+            slides.append({"type": "two_column", "title": f"현황 비교 {i}",
+                           "left_title": "현재", "left_bullets": ["A1", "A2", "A3"],
+                           "right_title": "목표", "right_bullets": ["B1", "B2", "B3"]})
+        elif kind == 3:
+            slides.append(_table_slide(i, 6, 5))
+        else:
+            slides.append(_diagram_slide(i, 4))
+    return slides
+
+
+SCENARIOS = {
+    "bullets_10": lambda: [_bullet_slide(i) for i in range(10)],
+    "bullets_100": lambda: [_bullet_slide(i) for i in range(100)],
+    "bullets_500": lambda: [_bullet_slide(i) for i in range(500)],
+    "bullets_long_50": lambda: [_bullet_slide(i, n_bullets=30) for i in range(50)],
+    "mixed_100": lambda: _mixed(100),
+    "mixed_500": lambda: _mixed(500),
+    "table_100": lambda: [_table_slide(i, 19, 5) for i in range(10)],
+    "table_1000": lambda: [_table_slide(0, 199, 5)],
+    "table_5000": lambda: [_table_slide(0, 999, 5)],
+    "action_items_500": lambda: _action_items(500),
+    "diagram_4": lambda: [_diagram_slide(i, 4) for i in range(20)],
+    "diagram_12": lambda: [_diagram_slide(i, 12) for i in range(20)],
+}
+
+
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(name):
+    """현재 프로세스에서 시나리오 1개를 측정한다."""
+    tmp = tempfile.mkdtemp(prefix="m2d_bench_")
+    try:
+        if name == "generate_slides":
+            # generate_slides.py는 import 시점에 자기 위치 기준 output/에 저장하므로 복사본을 실행
+            script = os.path.join(tmp, "generate_slides.py")
+            shutil.copyfile(os.path.join(PROJECT_DIR, "generate_slides.py"), script)
+            t0 = time.perf_counter()
+            ns = runpy.run_path(script)
+            elapsed = time.perf_counter() - t0
+            out = os.path.join(tmp, "output", "slides.pptx")
+            n_slides = len(ns["prs"].slides)
+            render_s, save_s = elapsed, 0.0
+        else:
+            from slide_template import DeckBuilder
+
+            slides = SCENARIOS[name]()
+            spec = {"deck_title": "벤치마크 덱", "date": "2026.02.24", "org": "Meeting2Deck", "slides": slides}
+            t0 = time.perf_counter()
+            deck = DeckBuilder.from_spec(spec)
+            t1 = time.perf_counter()
+            out = os.path.join(tmp, "slides.pptx")
+            deck.save(out)
+            t2 = time.perf_counter()
+            n_slides = len(deck.prs.slides)  # 넘침 분할로 스펙보다 많이 그려진 슬라이드 포함
+            render_s, save_s = t1 - t0, t2 - t1
+            cells = sum(len(sl["headers"]) * (len(sl["rows"]) + 1) for sl in slides if sl["type"] == "table")
+
+        result = {
+            "slides": n_slides,
+            "render_s": round(render_s, 4),
+            "save_s": round(save_s, 4),
+            "slides_per_sec": round(n_slides / (render_s + save_s), 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "file_kb": round(os.path.getsize(out) / 1024, 1),
+        }
+        if name != "generate_slides" and cells:
+            result["cells_per_sec"] = round(cells / (render_s + save_s))
+        return result
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _run_isolated(name):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--scenario", name],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline):
+    """기준값 대비 회귀 목록을 반환한다."""
+    problems = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b:
+            continue
+        if r["slides_per_sec"] < b["slides_per_sec"] * (1 - SPEED_TOLERANCE):
+            problems.append(f"{name}: slides/sec {r['slides_per_sec']} < 기준 {b['slides_per_sec']}")
+        if "cells_per_sec" in b and r.get("cells_per_sec", 0) < b["cells_per_sec"] * (1 - SPEED_TOLERANCE):
+            problems.append(f"{name}: cells/sec {r.get('cells_per_sec')} < 기준 {b['cells_per_sec']}")
+        if r["file_kb"] > b["file_kb"] * (1 + SIZE_TOLERANCE):
+            problems.append(f"{name}: 파일 크기 {r['file_kb']}KB > 기준 {b['file_kb']}KB")
+        if r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + RSS_TOLERANCE):
+            problems.append(f"{name}: 최대 RSS {r['peak_rss_mb']}MB > 기준 {b['peak_rss_mb']}MB")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)  # 자식 프로세스용
+    parser.add_argument("--only", nargs="*", help="실행할 시나리오 이름")
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario)))
+        return
+
+    names = args.only or list(SCENARIOS) + ["generate_slides"]
+    results = {}
+    print(f"{'scenario':<18}{'slides':>7}{'slides/s':>10}{'cells/s':>9}{'render':>9}{'save':>8}{'RSS MB':>8}{'KB':>9}")
+    for name in names:
+        r = _run_isolated(name)
+        results[name] = r
+        print(f"{name:<18}{r['slides']:>7}{r['slides_per_sec']:>10}{r.get('cells_per_sec', '-'):>9}{r['render_s']:>9.3f}"
+              f"{r['save_s']:>8.3f}{r['peak_rss_mb']:>8}{r['file_kb']:>9}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n기준값 저장: {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("\n기준값 파일 없음 — --update-baseline으로 생성하세요.")
+        return
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        problems = compare(results, json.load(f))
+    if problems:
+        print("\n회귀 감지:")
+        for p in problems:
+            print(f"  - {p}")
+        sys.exit(1)
+    print("\n기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,212 @@
 import asyncio
 import json
 import os
+import re
+import signal
+import time
+import uuid
 import logging
+from datetime import datetime
+
+from services import pdf_preprocess, result_cache, telemetry
+from services.pipeline import (
+    PIPELINE, STAGE_RESULT_FILE, get_stage, ready_stages, load_checkpoint,
+    save_checkpoint, is_stage_done, missing_outputs, mark_stage_done,
+)
 
 logger = logging.getLogger(__name__)
 
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_DIR = os.path.join(PROJECT_DIR, "output")
+JOBS_DIR = os.path.join(OUTPUT_DIR, "jobs")
+
+# 프롬프트 형식이 바뀌면 올려서 이전 캐시 결과를 무효화한다
+PROMPT_VERSION = "6"
+
+# 스테이지 실패/타임아웃 시 같은 스테이지 재시도 횟수
+STAGE_RETRIES = int(os.getenv("MEETING2DECK_STAGE_RETRIES", "1"))
+# 한 단계에서 CLI 출력이 이 시간 이상 없으면 멈춘 것으로 보고 조기 종료
+STAGE_IDLE_TIMEOUT = int(os.getenv("MEETING2DECK_STAGE_IDLE_TIMEOUT", "240"))
+
+# CLAUDE.md 7단계 워크플로우
+STAGES = {
+    1: "입력 해석",
+    2: "회의 구조 재구성",
+    3: "다이어그램 전문화",
+    4: "슬라이드 구성 설계",
+    5: "Google Slides 구조 출력",
+    6: "노션 요약 생성",
+    7: "이메일 메시지 생성",
+}
+STAGE_MARKER = re.compile(r"\[STEP\s*(\d)\]")
+
+# 실행 중인 CLI 프로세스 그룹 ID 기록 (작업 디렉토리 내) — 봇이 비정상 종료된 뒤 고아 CLI 정리용
+PID_DIR = "pids"
+
+# result 키 → 작업 디렉토리 내 출력 파일명
+OUTPUT_FILES = [
+    ("slides_json_path", "slides.json"),
+    ("slides_pptx_path", "slides.pptx"),
+    ("notion_md_path", "notion_summary.md"),
+    ("email_draft_path", "email_draft.md"),
+]
+
+
+def new_job_id() -> str:
+    """작업 ID 생성 (타임스탬프 + 랜덤 접미사, 동시 작업 간 충돌 방지)."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def get_job_dir(job_id: str) -> str:
+    """작업 ID에 해당하는 전용 출력 디렉토리 경로."""
+    return os.path.join(JOBS_DIR, job_id)
+
+
+def _collect_outputs(job_dir: str, result: dict, report_missing: bool = False) -> dict:
+    """작업 디렉토리에 존재하는 출력 파일 경로를 result에 채운다 (기존 값 우선)."""
+    for key, filename in OUTPUT_FILES:
+        fpath = os.path.join(job_dir, filename)
+        if os.path.exists(fpath):
+            result.setdefault(key, fpath)
+        elif report_missing:
+            result.setdefault("errors", []).append(f"{filename} not generated")
+    return result
+
+
+async def _store_if_completed(cache_key: str, result: dict) -> dict:
+    if cache_key and result.get("status") == "completed" and not result.get("errors"):
+        try:
+            await asyncio.to_thread(result_cache.store, cache_key, result)
+        except OSError as e:
+            logger.warning(f"[{result.get('job_id')}] 캐시 저장 실패: {e}")
+    return result
 
 
-async def run_meeting2deck(pdf_path: str) -> dict:
+async def run_meeting2deck(pdf_path: str, job_id: str = None, use_cache: bool = True) -> dict:
     """Claude CLI를 호출하여 Meeting2Deck 워크플로우를 실행한다.
 
+    진행 상황이 필요 없을 때 쓰는 stream_meeting2deck의 단순 래퍼.
+
     Args:
         pdf_path: 분석할 PDF 파일 경로
+        job_id: 작업 ID. 출력 파일은 output/jobs/<job_id>/ 에 저장된다.
+            생략 시 새로 발급한다. 이전에 실패한 작업 ID를 넘기면
+            마지막 완료 스테이지 다음부터 이어서 실행한다.
+        use_cache: 같은 PDF(+프롬프트/템플릿 버전)의 이전 결과가 캐시에 있으면
+            Claude CLI 실행 없이 그 결과를 재사용한다.
 
     Returns:
-        result.json 내용을 dict로 반환. 실패 시 error 키 포함.
+        result.json 내용을 dict로 반환 (job_id, job_dir 포함). 실패 시 error 키 포함.
     """
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    result = None
+    async for event in stream_meeting2deck(pdf_path, job_id=job_id, use_cache=use_cache):
+        if event["type"] == "result":
+            result = event["result"]
+    return result
 
-    # 기존 output 파일 정리
-    for f in ["slides.pptx", "notion_summary.md", "email_draft.md", "result.json"]:
-        fpath = os.path.join(OUTPUT_DIR, f)
-        if os.path.exists(fpath):
-            os.remove(fpath)
 
-    prompt = f"""다음 PDF 파일을 분석하여 Meeting2Deck 워크플로우를 실행하세요.
+def _parse_stream_line(line: bytes):
+    """stream-json 한 줄에서 (단계 번호 목록, result 이벤트)를 추출한다."""
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return [], None
+    steps = []
+    if event.get("type") == "assistant":
+        for block in event.get("message", {}).get("content", []):
+            if block.get("type") == "text":
+                steps.extend(int(m) for m in STAGE_MARKER.findall(block.get("text", "")))
+    return steps, event if event.get("type") == "result" else None
+
+
+def _source_text(pdf_path: str, inputs: dict = None) -> str:
+    """스테이지 프롬프트의 입력 설명: 전처리 결과가 있으면 PDF 대신 텍스트/이미지 경로."""
+    if not inputs:
+        return f"PDF 파일 경로: {pdf_path}"
+    lines = [
+        f"PDF 원본({inputs['pages']}쪽) 대신 페이지별로 전처리된 입력을 읽으세요.",
+        f"- 전사문 텍스트: {os.path.relpath(inputs['transcript'], PROJECT_DIR)} (`## p.N`이 쪽 번호)",
+    ]
+    if inputs["images"]:
+        lines.append("- 손그림/다이어그램/스캔 페이지 이미지 (텍스트 레이어가 없거나 부족한 쪽):")
+        lines.extend(f"  - p.{n}: {os.path.relpath(path, PROJECT_DIR)}" for n, path in inputs["images"])
+    return "\n".join(lines)
+
+
+def _stage_prompt(stage: dict, pdf_path: str, job_dir: str, inputs: dict = None) -> str:
+    rel_dir = os.path.relpath(job_dir, PROJECT_DIR)
+    result_file = STAGE_RESULT_FILE.format(name=stage["name"])
+    return f"""Meeting2Deck 워크플로우의 '{stage["name"]}' 스테이지를 실행하세요.
+
+{stage["prompt"].format(source=_source_text(pdf_path, inputs), job_dir=rel_dir)}
+
+각 STEP을 시작할 때 진행 표시로 `[STEP n]` (n은 단계 번호) 한 줄을 먼저 출력하세요.
+CLAUDE.md의 output/ 경로 대신 모든 파일을 {rel_dir}/ 디렉토리에 저장하세요.
+이 스테이지에서 얻은 URL(slides_url, notion_url 등)과 에러 목록(errors)이 있으면
+{rel_dir}/{result_file}에 JSON으로 기록하세요. 이 스테이지 범위 밖의 STEP은 수행하지 마세요."""
+
+
+def _record_pid(job_id: str, pid: int):
+    pid_dir = os.path.join(get_job_dir(job_id), PID_DIR)
+    try:
+        os.makedirs(pid_dir, exist_ok=True)
+        path = os.path.join(pid_dir, str(pid))
+        open(path, "w").close()
+        return path
+    except OSError:
+        return None
+
 
-PDF 파일 경로: {pdf_path}
+def kill_orphaned_cli(job_id: str) -> int:
+    """이전 봇 프로세스가 남긴 이 작업의 Claude CLI 프로세스 그룹을 종료하고 종료한 수를 반환한다.
+
+    CLI는 별도 세션(start_new_session)으로 실행되므로 봇이 죽어도 계속 돌며 같은 작업
+    디렉토리에 쓴다. 이어서 실행하기 전에 정리해 두 실행이 산출물을 덮어쓰지 않게 한다.
+    """
+    pid_dir = os.path.join(get_job_dir(job_id), PID_DIR)
+    if not os.path.isdir(pid_dir):
+        return 0
+    killed = 0
+    for name in os.listdir(pid_dir):
+        if name.isdigit():
+            pid = int(name)
+            try:
+                # PID 재사용 방지: 가능하면 실제로 claude 프로세스인지 확인
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    is_cli = b"claude" in f.read()
+            except FileNotFoundError:
+                is_cli = not os.path.isdir("/proc")
+            except OSError:
+                is_cli = False
+            if is_cli:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                    killed += 1
+                    logger.warning(f"[{job_id}] 이전 실행의 Claude CLI 종료 (pgid {pid})")
+                except (ProcessLookupError, PermissionError):
+                    pass
+        os.remove(os.path.join(pid_dir, name))
+    return killed
 
-CLAUDE.md에 정의된 7단계 워크플로우를 순서대로 수행하세요.
-모든 출력 파일은 output/ 디렉토리에 저장하세요.
-마지막에 반드시 output/result.json을 작성하세요."""
 
+async def _run_cli(job_id: str, prompt: str, attachments: list, timeout: int):
+    """Claude CLI 1회 실행. 단계 마커마다 {"type": "step"}을, 끝나면 {"type": "exit"}를 내보낸다."""
     cmd = [
         "claude",
         "--print",
         "--dangerously-skip-permissions",
+        "--output-format", "stream-json",
+        "--verbose",
         "-p", prompt,
-        pdf_path,
+        *attachments,
     ]
 
-    logger.info(f"Claude CLI 실행: {' '.join(cmd[:4])}...")
+    logger.info(f"[{job_id}] Claude CLI 실행: {' '.join(cmd[:4])}...")
 
     # CLAUDECODE 환경변수 제거 (중첩 세션 감지 우회)
     env = os.environ.copy()
     env.pop("CLAUDECODE", None)
+    env[telemetry.JOB_ID_ENV] = job_id  # MCP 서버 span을 이 작업의 trace.jsonl에 남기도록
 
     process = await asyncio.create_subprocess_exec(
         *cmd,
@@ -54,51 +214,246 @@ CLAUDE.md에 정의된 7단계 워크플로우를 순서대로 수행하세요.
         stderr=asyncio.subprocess.PIPE,
         cwd=PROJECT_DIR,
         env=env,
+        limit=16 * 1024 * 1024,  # stream-json 한 줄에 도구 결과 전체가 실릴 수 있음
+        start_new_session=True,  # 종료 시 MCP 서버 등 자식 프로세스까지 함께 정리
     )
+    pid_file = _record_pid(job_id, process.pid)
+    # stderr는 별도로 비워 파이프가 가득 차 CLI가 멈추지 않게 한다
+    stderr_task = asyncio.create_task(process.stderr.read())
 
+    start = time.monotonic()
+    final_event = None
+    timeout_msg = None
     try:
-        stdout, stderr = await asyncio.wait_for(
-            process.communicate(),
-            timeout=600,  # 10분 타임아웃
-        )
-    except asyncio.TimeoutError:
-        logger.error("Claude CLI 타임아웃 (10분 초과)")
-        process.kill()
+        while True:
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                timeout_msg = f"타임아웃 ({timeout}초 초과)"
+                break
+            try:
+                line = await asyncio.wait_for(
+                    process.stdout.readline(), timeout=min(remaining, STAGE_IDLE_TIMEOUT)
+                )
+            except asyncio.TimeoutError:
+                if time.monotonic() - start >= timeout:
+                    timeout_msg = f"타임아웃 ({timeout}초 초과)"
+                else:
+                    timeout_msg = f"응답 없음 ({STAGE_IDLE_TIMEOUT}초), 조기 종료"
+                break
+            if not line:
+                break
+
+            steps, result_event = _parse_stream_line(line)
+            if result_event:
+                final_event = result_event
+            for n in steps:
+                yield {"type": "step", "step": n}
+    finally:
+        if process.returncode is None and not process.stdout.at_eof():
+            # 타임아웃 또는 소비자 측 취소 — 프로세스 그룹째 종료해 고아 프로세스를 남기지 않는다
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
         await process.wait()
-        # 타임아웃이어도 이미 생성된 파일이 있으면 부분 결과 반환
-        result = {"status": "partial", "errors": ["Claude CLI 타임아웃 (10분 초과)"]}
-        for key, filename in [
-            ("slides_pptx_path", "slides.pptx"),
-            ("notion_md_path", "notion_summary.md"),
-            ("email_draft_path", "email_draft.md"),
-        ]:
-            fpath = os.path.join(OUTPUT_DIR, filename)
-            if os.path.exists(fpath):
-                result[key] = fpath
-        return result
-
-    if process.returncode != 0:
-        error_msg = stderr.decode("utf-8", errors="replace")
-        logger.error(f"Claude CLI 실패: {error_msg}")
-        return {"status": "error", "error": error_msg}
-
-    # result.json 읽기
-    result_path = os.path.join(OUTPUT_DIR, "result.json")
-    if os.path.exists(result_path):
-        with open(result_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    # result.json이 없으면 출력 파일 존재 여부로 결과 구성
-    result = {"status": "completed", "errors": []}
-    for key, filename in [
-        ("slides_pptx_path", "slides.pptx"),
-        ("notion_md_path", "notion_summary.md"),
-        ("email_draft_path", "email_draft.md"),
-    ]:
-        fpath = os.path.join(OUTPUT_DIR, filename)
-        if os.path.exists(fpath):
-            result[key] = fpath
-        else:
-            result["errors"].append(f"{filename} not generated")
+        stderr = await stderr_task
+        if pid_file:
+            try:
+                os.remove(pid_file)
+            except OSError:
+                pass
+
+    if timeout_msg:
+        yield {"type": "exit", "ok": False, "error": timeout_msg}
+    elif process.returncode != 0 or (final_event and final_event.get("is_error")):
+        error_msg = stderr.decode("utf-8", errors="replace").strip()
+        if not error_msg and final_event:
+            error_msg = str(final_event.get("result", ""))
+        yield {"type": "exit", "ok": False, "error": error_msg or f"exit code {process.returncode}"}
+    else:
+        yield {"type": "exit", "ok": True}
+
+
+async def _run_stage(job_id: str, job_dir: str, stage: dict, pdf_path: str, inputs: dict = None):
+    """스테이지 1개를 (재시도 포함) 실행한다. step 이벤트와 마지막 {"type": "stage_exit"}를 내보낸다.
+
+    inputs: pdf_preprocess 결과. 있으면 PDF 원본을 첨부하지 않는다.
+    """
+    prompt = _stage_prompt(stage, pdf_path, job_dir, inputs)
+    attachments = [pdf_path] if stage["needs_pdf"] and not inputs else []
+    error = None
+    for attempt in range(1 + STAGE_RETRIES):
+        if attempt:
+            logger.warning(f"[{job_id}] 스테이지 {stage['name']} 재시도 ({attempt}/{STAGE_RETRIES}): {error}")
+        with telemetry.span(f"cli.{stage['name']}", job_id=job_id, attempt=attempt) as sp:
+            async for event in _run_cli(job_id, prompt, attachments, stage["timeout"]):
+                if event["type"] == "step":
+                    yield event
+                elif event["ok"]:
+                    missing = missing_outputs(job_dir, stage)
+                    error = f"{', '.join(missing)} not generated" if missing else None
+                else:
+                    error = event["error"]
+            if error:
+                sp.status = "error"
+        if error is None:
+            yield {"type": "stage_exit", "ok": True}
+            return
+    yield {"type": "stage_exit", "ok": False, "error": f"스테이지 {stage['name']} 실패: {error}"}
+
 
+def _assemble_result(job_id: str, job_dir: str, state: dict, status: str, errors: list) -> dict:
+    """스테이지 결과를 합쳐 result.json을 작성하고 dict로 반환한다."""
+    result = {"status": status}
+    for stage_result in state["stage_results"].values():
+        for key, value in stage_result.items():
+            if key == "errors":
+                errors.extend(value)
+            elif key.endswith("_url") and value:
+                result[key] = value
+    result["errors"] = errors
+    result["completed_stages"] = list(state["completed"])
+    _collect_outputs(job_dir, result)
+
+    with open(os.path.join(job_dir, "result.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    result.update(job_id=job_id, job_dir=job_dir)
     return result
+
+
+async def _preprocess(job_id: str, pdf_path: str, job_dir: str):
+    """PDF 페이지 전처리. 실패하거나 PyMuPDF가 없으면 None (PDF 원본을 넘긴다)."""
+    try:
+        with telemetry.span("pdf_preprocess", job_id=job_id):
+            return await asyncio.to_thread(pdf_preprocess.preprocess_pdf, pdf_path, job_dir)
+    except Exception as e:
+        logger.warning(f"[{job_id}] PDF 전처리 실패, 원본 PDF 사용: {e}")
+        return None
+
+
+async def stream_meeting2deck(pdf_path: str, job_id: str = None, use_cache: bool = True):
+    """Meeting2Deck 파이프라인을 스테이지별로 실행하며 진행 이벤트를 순서대로 내보낸다.
+
+    각 스테이지는 별도의 Claude CLI 실행이며 산출물을 작업 디렉토리에 남긴다.
+    선행 스테이지가 끝난 스테이지끼리는 동시에 실행된다. 같은 job_id로 다시
+    호출하면 pipeline.json 체크포인트를 읽어 완료된 스테이지는 건너뛴다.
+
+    Yields:
+        {"type": "stage", "step": n, "name": "...", "elapsed": 초,
+         "active": [실행 중 STEP], "done": [완료 STEP]}
+            스테이지가 새 STEP에 진입하거나 끝날 때마다
+        {"type": "result", "result": {...}}
+            마지막 이벤트. run_meeting2deck 반환값과 같은 형식.
+    """
+    job_id = job_id or new_job_id()
+    job_dir = get_job_dir(job_id)
+    os.makedirs(job_dir, exist_ok=True)
+
+    state = load_checkpoint(job_dir)
+    state.setdefault("pdf_path", pdf_path)
+    save_checkpoint(job_dir, state)
+
+    cache_key = None
+    if use_cache:
+        cache_key = await asyncio.to_thread(result_cache.compute_cache_key, pdf_path, PROMPT_VERSION)
+    if cache_key and not state["completed"]:
+        cached = await asyncio.to_thread(result_cache.lookup, cache_key, job_dir)
+        telemetry.count("cache_lookups", cache="result", result="hit" if cached else "miss")
+        if cached:
+            logger.info(f"[{job_id}] 캐시 결과 재사용 ({cache_key[:12]})")
+            cached.update(job_id=job_id, job_dir=job_dir)
+            yield {"type": "result", "result": cached}
+            return
+
+    start = time.monotonic()
+    done = set()
+    for stage in PIPELINE:
+        if is_stage_done(job_dir, state, stage):
+            logger.info(f"[{job_id}] 스테이지 {stage['name']} 완료됨 — 건너뜀")
+            done.add(stage["name"])
+
+    inputs = None
+    if any(stage["needs_pdf"] and stage["name"] not in done for stage in PIPELINE):
+        inputs = await _preprocess(job_id, pdf_path, job_dir)
+
+    # 선행 스테이지가 끝난 스테이지는 동시에 실행하고, 이벤트는 하나의 큐로 모은다
+    events = asyncio.Queue()
+    running = {}  # 스테이지 이름 → (stage, Task)
+    active = {}  # 스테이지 이름 → 현재 STEP 번호
+    failures = []
+
+    async def _pump(stage):
+        try:
+            async for event in _run_stage(job_id, job_dir, stage, pdf_path, inputs):
+                await events.put((stage, event))
+        except Exception as e:
+            logger.exception(f"[{job_id}] 스테이지 {stage['name']} 실행 중 예외")
+            await events.put((stage, {"type": "stage_exit", "ok": False, "error": f"스테이지 {stage['name']} 실패: {e}"}))
+
+    def _progress(n):
+        done_steps = sorted(n for name in done for n in get_stage(name)["steps"])
+        return {
+            "type": "stage", "step": n, "name": STAGES.get(n, ""),
+            "elapsed": time.monotonic() - start,
+            "active": sorted(active.values()), "done": done_steps,
+        }
+
+    try:
+        while True:
+            if not failures:
+                for stage in ready_stages(done, set(running)):
+                    # 재실행 시 불완전한 이전 산출물 제거
+                    for f in stage["outputs"]:
+                        fpath = os.path.join(job_dir, f)
+                        if os.path.exists(fpath):
+                            os.remove(fpath)
+                    running[stage["name"]] = (stage, asyncio.create_task(_pump(stage)))
+            if not running:
+                break
+
+            stage, event = await events.get()
+            name = stage["name"]
+            if event["type"] == "step":
+                n = event["step"]
+                if n > active.get(name, 0):
+                    active[name] = n
+                    logger.info(f"[{job_id}] STEP {n} 시작 ({time.monotonic() - start:.0f}s)")
+                    yield _progress(n)
+                continue
+
+            running.pop(name)
+            active.pop(name, None)
+            if event["ok"]:
+                done.add(name)
+                mark_stage_done(job_dir, state, stage)
+                logger.info(f"[{job_id}] 스테이지 {name} 완료 ({time.monotonic() - start:.0f}s)")
+                yield _progress(max(stage["steps"]))
+            else:
+                # 실패 후에는 새 스테이지를 시작하지 않고, 실행 중인 스테이지만 마저 끝낸다
+                logger.error(f"[{job_id}] {event['error']}")
+                failures.append((stage, event["error"]))
+    finally:
+        # 소비자 측 취소 시 실행 중인 CLI를 모두 정리
+        tasks = [task for _, task in running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if failures:
+        errors = [error for _, error in failures]
+        resume_from = next(s["name"] for s in PIPELINE if s["name"] not in done)
+        if not state["completed"]:
+            yield {"type": "result", "result": {
+                "status": "error", "error": errors[0], "job_id": job_id, "job_dir": job_dir,
+                "resume_from": resume_from,
+            }}
+            return
+        # 이미 완료된 스테이지의 산출물로 부분 결과 반환 (같은 job_id로 재개 가능)
+        result = _assemble_result(job_id, job_dir, state, "partial", errors)
+        result["resume_from"] = resume_from
+        yield {"type": "result", "result": result}
+        return
+
+    result = _assemble_result(job_id, job_dir, state, "completed", [])
+    result = await _store_if_completed(cache_key, result)
+    yield {"type": "result", "result": result}
@@ -1,49 +1,55 @@
+import asyncio
+import functools
 import json
 import os
+import time
 import logging
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from concurrent.futures import ThreadPoolExecutor
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
-logger = logging.getLogger(__name__)
+from services import telemetry
+from services.google_clients import (
+    get_drive_service, execute, acquire, is_retryable, note_retry, MAX_RETRIES,
+)
 
-PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-TOKEN_PATH = os.path.join(PROJECT_DIR, "token.json")
-SCOPES = ["https://www.googleapis.com/auth/presentations", "https://www.googleapis.com/auth/drive"]
+logger = logging.getLogger(__name__)
 
+# 동시 업로드 수 상한 — 업로드는 전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않는다
+UPLOAD_CONCURRENCY = int(os.getenv("DRIVE_UPLOAD_CONCURRENCY", "2"))
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # resumable 업로드 청크 (256KB 배수)
 
-def _get_credentials():
-    if not os.path.exists(TOKEN_PATH):
-        logger.error(f"token.json not found: {TOKEN_PATH}")
-        return None
-    creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
-    if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        with open(TOKEN_PATH, "w") as f:
-            f.write(creds.to_json())
-    return creds
+_executor = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="drive-upload")
 
 
-def upload_pptx_to_drive(pptx_path: str, title: str = "Meeting2Deck") -> dict:
+def upload_pptx_to_drive(pptx_path: str, title: str = "Meeting2Deck", job_id: str = "",
+                         progress_callback=None) -> dict:
     """PPTX 파일을 Google Drive에 업로드하고 Google Slides로 변환한다.
 
     Args:
         pptx_path: 업로드할 .pptx 파일 경로
         title: Google Slides 제목
+        job_id: (선택) 로그 구분용 작업 ID
+        progress_callback: (선택) 청크 업로드마다 진행률(0.0~1.0)을 받는 함수
 
     Returns:
         {"slides_url": "https://...", "file_id": "..."} 또는 {"error": "..."}
     """
-    creds = _get_credentials()
-    if not creds:
-        return {"error": "Google OAuth2 인증 없음. scripts/auth_setup.py를 먼저 실행하세요."}
-
     if not os.path.exists(pptx_path):
         return {"error": f"PPTX 파일 없음: {pptx_path}"}
 
+    with telemetry.span("drive_upload", job_id=job_id or None, bytes=os.path.getsize(pptx_path)) as sp:
+        result = _upload(pptx_path, title, job_id, progress_callback)
+        if "error" in result:
+            sp.status = "error"
+    return result
+
+
+def _upload(pptx_path: str, title: str, job_id: str, progress_callback) -> dict:
     try:
-        drive = build("drive", "v3", credentials=creds)
+        drive = get_drive_service()
+        if drive is None:
+            return {"error": "Google OAuth2 인증 없음. scripts/auth_setup.py를 먼저 실행하세요."}
 
         file_metadata = {
             "name": title,
@@ -52,27 +58,68 @@ def upload_pptx_to_drive(pptx_path: str, title: str = "Meeting2Deck") -> dict:
         media = MediaFileUpload(
             pptx_path,
             mimetype="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            chunksize=UPLOAD_CHUNK_SIZE,
             resumable=True,
         )
 
-        file = drive.files().create(
+        request = drive.files().create(
             body=file_metadata,
             media_body=media,
             fields="id,webViewLink",
-        ).execute()
+        )
+        # resumable 업로드는 실패한 청크부터 이어서 보낼 수 있으므로 429/5xx 시 청크 단위 재시도
+        file = None
+        attempt = 0
+        while file is None:
+            acquire("drive")
+            try:
+                status, file = request.next_chunk(num_retries=0)
+            except HttpError as e:
+                if not is_retryable(e) or attempt >= MAX_RETRIES:
+                    raise
+                time.sleep(note_retry("drive", e, attempt))
+                attempt += 1
+                continue
+            attempt = 0
+            if status and progress_callback:
+                progress_callback(status.progress())
+        if progress_callback:
+            progress_callback(1.0)
 
         file_id = file.get("id")
         web_link = file.get("webViewLink", f"https://docs.google.com/presentation/d/{file_id}/edit")
 
         # 링크 공유 설정 (링크가 있는 사람은 누구나 볼 수 있음)
-        drive.permissions().create(
+        execute(drive.permissions().create(
             fileId=file_id,
             body={"type": "anyone", "role": "reader"},
-        ).execute()
+        ), "drive")
 
-        logger.info(f"Drive 업로드 성공: {web_link}")
+        logger.info(f"[{job_id}] Drive 업로드 성공: {web_link}")
         return {"slides_url": web_link, "file_id": file_id}
 
     except Exception as e:
-        logger.error(f"Drive 업로드 실패: {e}")
+        logger.error(f"[{job_id}] Drive 업로드 실패: {e}")
         return {"error": str(e)}
+
+
+async def upload_pptx_to_drive_async(pptx_path: str, title: str = "Meeting2Deck", job_id: str = "",
+                                     on_progress=None) -> dict:
+    """upload_pptx_to_drive의 비동기 버전.
+
+    업로드 스레드 풀(최대 DRIVE_UPLOAD_CONCURRENCY개)에서 실행하므로 Discord
+    이벤트 루프를 막지 않는다. 풀이 가득 차면 앞선 업로드가 끝날 때까지 대기한다.
+
+    Args:
+        on_progress: (선택) 진행률(0.0~1.0)을 받는 코루틴 함수. 이벤트 루프에서 실행된다.
+    """
+    loop = asyncio.get_running_loop()
+
+    def report(fraction):
+        if on_progress:
+            asyncio.run_coroutine_threadsafe(on_progress(fraction), loop)
+
+    return await loop.run_in_executor(
+        _executor,
+        functools.partial(upload_pptx_to_drive, pptx_path, title=title, job_id=job_id, progress_callback=report),
+    )
@@ -0,0 +1,268 @@
+"""Google API 인증/클라이언트 공용 관리자.
+
+- 자격 증명은 프로세스당 1개를 메모리에 두고, 만료 전에 백그라운드 스레드가 갱신
+- token.json 쓰기는 파일 잠금으로 직렬화 (Bot 프로세스와 Slides MCP 서버 프로세스 간 경쟁 방지)
+- discovery 문서는 한 번만 읽어 두고, 서비스 객체는 스레드별로 캐시
+  (httplib2 기반 서비스 객체는 스레드 간 공유가 안전하지 않음)
+- API 호출은 execute()를 거쳐 API별 토큰 버킷으로 속도를 제한하고,
+  429/5xx는 지터를 섞은 지수 백오프로 재시도한다
+"""
+
+import fcntl
+import json
+import os
+import random
+import threading
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+
+from services import telemetry
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_PATH = os.path.join(PROJECT_DIR, "token.json")
+TOKEN_LOCK_PATH = TOKEN_PATH + ".lock"
+SCOPES = ["https://www.googleapis.com/auth/presentations", "https://www.googleapis.com/auth/drive"]
+
+# 만료 이 시간 전에 미리 갱신한다
+REFRESH_MARGIN = timedelta(minutes=5)
+
+_lock = threading.RLock()
+_creds = None
+_refresher = None
+_discovery_docs = {}
+_local = threading.local()
+
+# API별 초당 요청 수 / 버스트 (프로세스 단위, 사용자 쿼터보다 약간 낮게)
+RATE_LIMITS = {
+    "slides": (float(os.getenv("GOOGLE_SLIDES_RPS", "1.0")), 10),
+    "drive": (float(os.getenv("GOOGLE_DRIVE_RPS", "10.0")), 20),
+}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.getenv("GOOGLE_API_MAX_RETRIES", "5"))
+BACKOFF_BASE = 1.0   # 초
+BACKOFF_MAX = 32.0   # 초
+
+
+class _TokenFileLock:
+    """token.json 읽기/쓰기를 프로세스 간 직렬화하는 파일 잠금."""
+
+    def __enter__(self):
+        self._f = open(TOKEN_LOCK_PATH, "a")
+        fcntl.flock(self._f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._f, fcntl.LOCK_UN)
+        self._f.close()
+
+
+def _write_token(creds) -> None:
+    tmp = f"{TOKEN_PATH}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(creds.to_json())
+    os.replace(tmp, TOKEN_PATH)
+
+
+def _expires_in(creds) -> timedelta:
+    # google-auth는 expiry를 naive UTC로 다루므로 UTC를 붙여 aware 시각끼리 비교한다
+    return creds.expiry.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+
+
+def _needs_refresh(creds) -> bool:
+    if not creds.expiry:
+        return False
+    return _expires_in(creds) <= REFRESH_MARGIN
+
+
+def _refresh(creds) -> None:
+    """자격 증명을 갱신한다. 다른 프로세스가 이미 갱신한 토큰이 있으면 그것을 채택한다."""
+    with _TokenFileLock():
+        if os.path.exists(TOKEN_PATH):
+            on_disk = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+            if on_disk.expiry and (not creds.expiry or on_disk.expiry > creds.expiry) \
+                    and not _needs_refresh(on_disk):
+                creds.token = on_disk.token
+                creds.expiry = on_disk.expiry
+                logger.info("다른 프로세스가 갱신한 Google 토큰을 사용")
+                return
+        creds.refresh(Request())
+        _write_token(creds)
+        logger.info(f"Google 토큰 갱신 (만료: {creds.expiry})")
+
+
+def _refresh_loop() -> None:
+    while True:
+        with _lock:
+            creds = _creds
+        if creds is None or not creds.refresh_token:
+            return
+        wait = 60.0
+        if creds.expiry:
+            wait = max(10.0, (_expires_in(creds) - REFRESH_MARGIN).total_seconds())
+        time.sleep(wait)
+        with _lock:
+            try:
+                if _needs_refresh(_creds):
+                    _refresh(_creds)
+            except Exception as e:
+                logger.error(f"Google 토큰 백그라운드 갱신 실패: {e}")
+
+
+def get_credentials():
+    """캐시된 자격 증명을 반환한다. token.json이 없으면 None."""
+    global _creds, _refresher
+    with _lock:
+        if _creds is None:
+            if not os.path.exists(TOKEN_PATH):
+                logger.error(f"token.json not found: {TOKEN_PATH}")
+                return None
+            with _TokenFileLock():
+                _creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        if (_creds.expired or _needs_refresh(_creds)) and _creds.refresh_token:
+            _refresh(_creds)
+        if _refresher is None and _creds.refresh_token:
+            _refresher = threading.Thread(target=_refresh_loop, name="google-token-refresh", daemon=True)
+            _refresher.start()
+        return _creds
+
+
+def _discovery_doc(name: str, version: str) -> dict:
+    key = (name, version)
+    doc = _discovery_docs.get(key)
+    if doc is None:
+        doc = json.loads(get_static_doc(name, version))
+        _discovery_docs[key] = doc
+    return doc
+
+
+def get_service(name: str, version: str):
+    """현재 스레드용으로 캐시된 Google API 서비스 객체. 인증이 없으면 None."""
+    creds = get_credentials()
+    if creds is None:
+        return None
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = {}
+    key = (name, version)
+    if key not in services:
+        services[key] = build_from_document(_discovery_doc(name, version), credentials=creds)
+    return services[key]
+
+
+def get_slides_service():
+    return get_service("slides", "v1")
+
+
+def get_drive_service():
+    return get_service("drive", "v3")
+
+
+# ── 속도 제한 / 재시도 ──
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷. acquire()는 토큰이 생길 때까지 블록한다."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개를 소비하고, 기다린 시간(초)을 반환한다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_buckets = {api: TokenBucket(rate, burst) for api, (rate, burst) in RATE_LIMITS.items()}
+
+
+def _count(api: str, key: str) -> None:
+    """API별 카운터 (meeting2deck_google_<key>_total{api=...}).
+
+    calls / rate_limited: 로컬 토큰 버킷에서 대기한 호출 / throttled: 서버가 429로 거절한 응답 /
+    retries / failures
+    """
+    telemetry.count(f"google_{key}", api=api)
+
+
+def acquire(api: str) -> None:
+    """API 호출 전 속도 제한 토큰을 얻는다."""
+    _count(api, "calls")
+    bucket = _buckets.get(api)
+    if bucket and bucket.acquire() > 0:
+        _count(api, "rate_limited")
+
+
+def backoff_delay(attempt: int) -> float:
+    """지터를 섞은 지수 백오프 (full jitter)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def is_retryable(error: HttpError) -> bool:
+    return error.resp.status in RETRYABLE_STATUS
+
+
+def note_retry(api: str, error: HttpError, attempt: int) -> float:
+    """재시도 카운터를 올리고 대기할 시간을 반환한다."""
+    if error.resp.status == 429:
+        _count(api, "throttled")
+    _count(api, "retries")
+    delay = backoff_delay(attempt)
+    logger.warning(f"{api} API {error.resp.status} — {delay:.1f}초 후 재시도 ({attempt + 1}/{MAX_RETRIES})")
+    return delay
+
+
+def execute(request, api: str, idempotent: bool = True, applied=None):
+    """속도 제한과 재시도를 적용해 googleapiclient 요청을 실행한다.
+
+    Args:
+        request: service.xxx().yyy(...)가 반환한 HttpRequest
+        api: "slides" / "drive" (속도 제한 버킷 이름)
+        idempotent: False면 서버가 처리했을 수도 있는 5xx는 재시도하지 않고
+            요청이 처리되지 않았음이 확실한 429만 재시도한다
+        applied: (선택) HttpError를 받아, 앞선 시도가 이미 반영된 것으로 볼지
+            판단하는 함수 (예: 결정적 객체 ID의 '이미 존재' 오류). True면 {} 반환
+    """
+    attempt = 0
+    retried = False
+    while True:
+        acquire(api)
+        try:
+            return request.execute(num_retries=0)
+        except HttpError as e:
+            if retried and applied and applied(e):
+                logger.info(f"{api} API: 이전 시도가 이미 반영됨 ({e.resp.status})")
+                return {}
+            retryable = is_retryable(e) and (idempotent or e.resp.status == 429)
+            if not retryable or attempt >= MAX_RETRIES:
+                _count(api, "failures")
+                raise
+            time.sleep(note_retry(api, e, attempt))
+            attempt += 1
+            retried = True
+
+
+def object_exists_error(error: HttpError) -> bool:
+    """결정적 객체 ID로 만든 요청의 재시도가 '이미 존재'로 거절됐는지."""
+    return error.resp.status == 400 and b"already exists" in (error.content or b"")
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import logging
+from collections import OrderedDict, deque
+
+from services import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생."""
+
+
+class Job:
+    """대기열에 올라간 작업 1건.
+
+    owner는 공정성 단위 (예: (channel_id, user_id)), run은 인자 없는 코루틴 함수.
+    """
+
+    def __init__(self, job_id, owner, run):
+        self.job_id = job_id
+        self.owner = owner
+        self.run = run
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+
+
+class JobScheduler:
+    """제한된 워커 수로 작업을 처리하는 비동기 스케줄러.
+
+    - 워커 수만큼만 동시에 실행 (Claude CLI 프로세스 수 상한)
+    - owner별 라운드로빈으로 꺼내 한 사용자가 대기열을 독점하지 못하게 함
+    - 전체/owner별 대기 한도를 넘으면 QueueFullError로 거절 (backpressure)
+    """
+
+    def __init__(self, workers=2, max_pending=20, max_per_owner=3):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.max_per_owner = max_per_owner
+        self._queues = OrderedDict()  # owner → deque[Job], 순서 = 라운드로빈 순서
+        self._running = {}  # job_id → Job
+        self._cond = asyncio.Condition()
+        self._tasks = []
+
+    # ── 상태 조회 ──
+
+    @property
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    def _dispatch_order(self):
+        """현재 대기 작업을 실제로 꺼내질 순서대로 나열한다."""
+        queues = [list(q) for q in self._queues.values()]
+        order = []
+        depth = 0
+        while True:
+            row = [q[depth] for q in queues if depth < len(q)]
+            if not row:
+                return order
+            order.extend(row)
+            depth += 1
+
+    def position(self, job_id) -> int:
+        """대기 순번 (1부터). 실행 중이면 0, 없으면 -1."""
+        if job_id in self._running:
+            return 0
+        for i, job in enumerate(self._dispatch_order()):
+            if job.job_id == job_id:
+                return i + 1
+        return -1
+
+    # ── 제출 ──
+
+    def check_capacity(self, owner) -> None:
+        """지금 owner의 작업을 받을 수 있는지 확인한다 (입력 다운로드 등 준비 전에 미리 거절).
+
+        Raises:
+            QueueFullError: 전체 또는 owner별 대기 한도 초과
+        """
+        if self.pending >= self.max_pending:
+            raise QueueFullError(f"대기열이 가득 찼습니다 ({self.max_pending}건)")
+        owned = len(self._queues.get(owner, ()))
+        owned += sum(1 for j in self._running.values() if j.owner == owner)
+        if owned >= self.max_per_owner:
+            raise QueueFullError(f"사용자당 동시 작업 한도 초과 ({self.max_per_owner}건)")
+
+    async def submit(self, job_id, owner, run) -> int:
+        """작업을 대기열에 넣고 대기 순번을 반환한다.
+
+        Raises:
+            QueueFullError: 전체 또는 owner별 대기 한도 초과
+        """
+        async with self._cond:
+            self.check_capacity(owner)
+            self._queues.setdefault(owner, deque()).append(Job(job_id, owner, run))
+            self._cond.notify()
+            pos = self.position(job_id)
+        logger.info(f"[{job_id}] 대기열 등록 (순번 {pos}, 대기 {self.pending}, 실행 {self.in_flight})")
+        return pos
+
+    def _pop_next(self):
+        owner, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        del self._queues[owner]
+        if queue:
+            self._queues[owner] = queue  # 맨 뒤로 보내 다음 owner에게 차례 양보
+        return job
+
+    # ── 워커 ──
+
+    async def _worker(self, n):
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: bool(self._queues))
+                job = self._pop_next()
+                job.started_at = time.monotonic()
+                self._running[job.job_id] = job
+            wait = job.started_at - job.enqueued_at
+            telemetry.observe("queue_wait", wait)
+            logger.info(f"[{job.job_id}] 워커 {n} 실행 시작 (대기 {wait:.1f}s)")
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"[{job.job_id}] 작업 처리 중 예외")
+            finally:
+                self._running.pop(job.job_id, None)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"JobScheduler 시작: 워커 {self.workers}개, 대기 한도 {self.max_pending}")
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,143 @@
+"""작업 기록 저장소 (SQLite, WAL).
+
+봇 프로세스가 재시작돼도 진행 중이던 작업을 찾아 이어서 실행할 수 있도록
+작업 1건마다 상태·PDF 해시·진행 단계·산출물·Discord 메시지 참조를 한 행으로 남긴다.
+
+상태 흐름:
+    queued → running → completed | failed
+    (봇 종료/크래시 시 queued·running으로 남은 행이 재시작 후 복구 대상)
+
+파이프라인 단계별 산출물 자체는 작업 디렉토리의 pipeline.json 체크포인트가 관리하고,
+이 저장소는 "어떤 작업이 누구의 어느 메시지에서 시작됐고 어디까지 왔는지"만 기록한다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(PROJECT_DIR, os.getenv("MEETING2DECK_JOB_DB", "output/jobs.db"))  # 상대 경로는 프로젝트 기준
+
+UNFINISHED = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    pdf_name TEXT,
+    pdf_path TEXT,
+    pdf_hash TEXT,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    author_id INTEGER,
+    message_id INTEGER,
+    progress_message_id INTEGER,
+    artifacts TEXT,
+    error TEXT,
+    recoveries INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_pdf_hash ON jobs (pdf_hash);
+"""
+
+_COLUMNS = {
+    "status", "stage", "pdf_name", "pdf_path", "pdf_hash", "guild_id", "channel_id", "author_id",
+    "message_id", "progress_message_id", "artifacts", "error", "recoveries",
+}
+
+
+class JobStore:
+    """jobs 테이블 접근. 한 연결을 공유하며 쓰기는 락으로 직렬화한다 (행 단위 짧은 쓰기만 한다)."""
+
+    def __init__(self, path: str = DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # 크래시에는 안전, 전원 장애 시 마지막 커밋만 유실 가능
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _encode(fields: dict) -> dict:
+        unknown = set(fields) - _COLUMNS
+        if unknown:
+            raise ValueError(f"알 수 없는 작업 필드: {', '.join(sorted(unknown))}")
+        if isinstance(fields.get("artifacts"), dict):
+            fields["artifacts"] = json.dumps(fields["artifacts"], ensure_ascii=False, default=str)
+        return fields
+
+    @staticmethod
+    def _decode(row) -> dict:
+        job = dict(row)
+        job["artifacts"] = json.loads(job["artifacts"]) if job["artifacts"] else {}
+        return job
+
+    def put(self, job_id: str, **fields) -> None:
+        """작업 행을 만들거나 (이미 있으면) 주어진 필드만 갱신한다."""
+        fields = self._encode(fields)
+        fields.setdefault("status", "queued")
+        now = time.time()
+        names = list(fields)
+        updates = ", ".join(f"{n}=excluded.{n}" for n in names)
+        with self._lock:
+            self._db.execute(
+                f"INSERT INTO jobs (job_id, {', '.join(names)}, created_at, updated_at) "
+                f"VALUES (?, {', '.join('?' * len(names))}, ?, ?) "
+                f"ON CONFLICT(job_id) DO UPDATE SET {updates}, updated_at=excluded.updated_at",
+                [job_id, *fields.values(), now, now],
+            )
+
+    def update(self, job_id: str, **fields) -> None:
+        fields = self._encode(fields)
+        if not fields:
+            return
+        assignments = ", ".join(f"{n}=?" for n in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {assignments}, updated_at=? WHERE job_id=?",
+                [*fields.values(), time.time(), job_id],
+            )
+
+    def merge_artifacts(self, job_id: str, artifacts: dict) -> None:
+        """산출물(JSON)에 키를 덧붙인다 (slides_url, email_delivery 등)."""
+        with self._lock:
+            row = self._db.execute("SELECT artifacts FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+            current = json.loads(row["artifacts"]) if row and row["artifacts"] else {}
+            current.update(artifacts)
+            self._db.execute(
+                "UPDATE jobs SET artifacts=?, updated_at=? WHERE job_id=?",
+                (json.dumps(current, ensure_ascii=False, default=str), time.time(), job_id),
+            )
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+        return self._decode(row) if row else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE job_id=?", (job_id,))
+
+    def unfinished(self) -> list:
+        """재시작 시 복구할 작업 (생성 순)."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM jobs WHERE status IN ({', '.join('?' * len(UNFINISHED))}) ORDER BY created_at",
+                UNFINISHED,
+            ).fetchall()
+        return [self._decode(row) for row in rows]
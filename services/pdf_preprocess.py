@@ -0,0 +1,228 @@
+"""PDF 페이지 단위 전처리 + 페이지 캐시.
+
+PDF 전체를 Claude CLI에 넘기면 실행할 때마다 모든 페이지의 전사문 텍스트와 이미지를
+다시 추출·전송한다. 분석 스테이지 앞에서 PDF를 한 페이지씩 읽어
+
+- 텍스트 레이어 → 공백을 정리한 compact 텍스트 (input/transcript.md)
+- 손그림/스캔/다이어그램 페이지 → 긴 변 PAGE_MAX_PX 이하로 축소한 JPEG (input/page_NNNN.jpg)
+
+만 넘기고, 페이지별 결과는 페이지 내용 해시로 캐시해 같은 페이지는 다시 처리하지 않는다.
+한 번에 한 페이지만 메모리에 올리므로 100쪽 이상 전사문도 메모리가 일정하다.
+
+PyMuPDF가 없으면 None을 반환하고 호출 측은 PDF 원본을 그대로 넘긴다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import logging
+
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+from services import result_cache, telemetry
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_CACHE_DIR = os.path.join(PROJECT_DIR, "output", "page_cache")
+PAGE_CACHE_MAX_BYTES = int(os.getenv("MEETING2DECK_PAGE_CACHE_MAX_MB", "1000")) * 1024 * 1024
+
+ENABLED = os.getenv("MEETING2DECK_PREPROCESS", "1") != "0"
+# 이미지 페이지 해상도 상한: DPI와 긴 변 픽셀 중 작은 쪽
+PAGE_DPI = int(os.getenv("MEETING2DECK_PAGE_DPI", "150"))
+PAGE_MAX_PX = int(os.getenv("MEETING2DECK_PAGE_MAX_PX", "1568"))
+JPEG_QUALITY = 80
+# 텍스트 레이어가 이보다 짧으면 스캔/손글씨 페이지로 보고 이미지로 넘긴다
+TEXT_MIN_CHARS = 40
+# 이미지가 페이지 면적의 이 비율 이상이거나 벡터 획이 이만큼 많으면 다이어그램 페이지
+IMAGE_AREA_RATIO = 0.2
+DRAWING_MIN_PATHS = 30
+
+# 추출 방식이 바뀌면 올려서 이전 페이지 캐시를 무효화한다
+PREPROCESS_VERSION = "1"
+
+INPUT_DIR = "input"
+TRANSCRIPT_FILE = "transcript.md"
+MANIFEST_FILE = "manifest.json"
+
+_PAGE_NUMBER = re.compile(r"^[-–\s]*\d+\s*(?:/\s*\d+)?[-–\s]*$")  # "3", "- 3 -", "3 / 120"
+_SPACES = re.compile(r"[ \t 　]+")
+
+
+def available() -> bool:
+    return ENABLED and pymupdf is not None
+
+
+def compact_text(text: str) -> str:
+    """줄 앞뒤/연속 공백과 빈 줄, 쪽 번호만 있는 줄을 없앤다."""
+    lines = []
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", line).strip()
+        if line and not _PAGE_NUMBER.match(line):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _stream_digest(doc, xref: int, memo: dict) -> bytes:
+    # 같은 이미지/폰트/XObject가 여러 페이지에 쓰이므로 문서 안에서 한 번만 해시
+    digest = memo.get(xref)
+    if digest is None:
+        try:
+            data = doc.xref_stream_raw(xref) or b""
+        except RuntimeError:
+            data = b""
+        digest = memo[xref] = hashlib.sha256(data).digest()
+    return digest
+
+
+def page_hash(doc, page, memo: dict) -> str:
+    """페이지 내용 해시: 콘텐츠 스트림 + 참조 이미지/XObject 바이트 + 폰트 이름 + 크기/회전 + 설정."""
+    h = hashlib.sha256(f"{PREPROCESS_VERSION}:{PAGE_DPI}:{PAGE_MAX_PX}:{JPEG_QUALITY}".encode())
+    h.update(f"{tuple(page.rect)}:{page.rotation}".encode())
+    h.update(page.read_contents())
+    for img in page.get_images(full=True):
+        h.update(_stream_digest(doc, img[0], memo))
+    for xo in page.get_xobjects():
+        h.update(_stream_digest(doc, xo[0], memo))
+    for font in page.get_fonts():
+        h.update(repr(font[3:5]).encode())  # (basefont, name)
+    return h.hexdigest()
+
+
+def _is_visual(page, text: str) -> bool:
+    """텍스트만으로는 부족한 페이지인지 (스캔·손글씨·다이어그램)."""
+    if len(text) < TEXT_MIN_CHARS:
+        return True
+    area = abs(page.rect)
+    if area:
+        covered = sum(abs(pymupdf.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+        if covered / area >= IMAGE_AREA_RATIO:
+            return True
+    return len(page.get_cdrawings()) >= DRAWING_MIN_PATHS
+
+
+def _render(page) -> bytes:
+    """긴 변이 PAGE_MAX_PX, 해상도가 PAGE_DPI를 넘지 않게 JPEG로 래스터화."""
+    longest = max(page.rect.width, page.rect.height) or 1
+    zoom = min(PAGE_DPI / 72, PAGE_MAX_PX / longest)
+    pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+    return pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+
+
+def _process_page(doc, page, key: str) -> dict:
+    """페이지 1장을 처리해 캐시 항목을 만들고 page.json 내용을 반환한다."""
+    text = compact_text(page.get_text("text"))
+    visual = _is_visual(page, text)
+    entry = os.path.join(PAGE_CACHE_DIR, key)
+    tmp = f"{entry}.tmp{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    meta = {"text": text, "image": None}
+    if visual:
+        with open(os.path.join(tmp, "page.jpg"), "wb") as f:
+            f.write(_render(page))
+        meta["image"] = "page.jpg"
+    with open(os.path.join(tmp, "page.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    # 완성된 뒤 교체 (동시에 같은 페이지를 처리한 다른 작업과 겹쳐도 온전한 항목만 남는다)
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+    return meta
+
+
+def _cached_page(key: str):
+    entry = os.path.join(PAGE_CACHE_DIR, key)
+    try:
+        with open(os.path.join(entry, "page.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("image") and not os.path.exists(os.path.join(entry, meta["image"])):
+        return None
+    os.utime(entry)  # LRU 갱신
+    return meta
+
+
+def _link(src: str, dst: str) -> None:
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def load_manifest(job_dir: str):
+    path = os.path.join(job_dir, INPUT_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def preprocess_pdf(pdf_path: str, job_dir: str):
+    """PDF를 페이지 단위로 전처리해 job_dir/input/에 넣고 manifest dict를 반환.
+
+    이미 같은 PDF의 manifest가 있으면 (재개) 그대로 반환한다.
+    PyMuPDF가 없거나 비활성이면 None.
+
+    Returns:
+        {"pages": 쪽수, "transcript": 텍스트 경로, "images": [(쪽 번호, 이미지 경로), ...],
+         "cached_pages": 캐시 적중 수, "text_chars": 글자 수, "elapsed": 초}
+    """
+    if not available():
+        return None
+    manifest = load_manifest(job_dir)
+    if manifest and manifest.get("pdf_path") == pdf_path:
+        return manifest
+
+    start = time.monotonic()
+    in_dir = os.path.join(job_dir, INPUT_DIR)
+    os.makedirs(in_dir, exist_ok=True)
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    transcript = os.path.join(in_dir, TRANSCRIPT_FILE)
+    images, hits, chars, memo = [], 0, 0, {}
+
+    with pymupdf.open(pdf_path) as doc, open(transcript, "w", encoding="utf-8") as out:
+        n_pages = doc.page_count
+        for i in range(n_pages):
+            page = doc.load_page(i)
+            key = page_hash(doc, page, memo)
+            meta = _cached_page(key)
+            if meta:
+                hits += 1
+            else:
+                meta = _process_page(doc, page, key)
+            del page
+
+            if meta["text"]:
+                out.write(f"## p.{i + 1}\n{meta['text']}\n\n")
+                chars += len(meta["text"])
+            if meta["image"]:
+                dst = os.path.join(in_dir, f"page_{i + 1:04d}.jpg")
+                _link(os.path.join(PAGE_CACHE_DIR, key, meta["image"]), dst)
+                images.append((i + 1, dst))
+
+    manifest = {
+        "pdf_path": pdf_path,
+        "pages": n_pages,
+        "transcript": transcript,
+        "images": images,
+        "cached_pages": hits,
+        "text_chars": chars,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+    with open(os.path.join(in_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    telemetry.count("cache_lookups", hits, cache="page", result="hit")
+    telemetry.count("cache_lookups", n_pages - hits, cache="page", result="miss")
+    logger.info(f"PDF 전처리: {n_pages}쪽 (캐시 {hits}), 텍스트 {chars}자, "
+                f"이미지 {len(images)}장, {manifest['elapsed']}s")
+    result_cache.evict(PAGE_CACHE_MAX_BYTES, cache_dir=PAGE_CACHE_DIR)
+    return manifest
@@ -0,0 +1,148 @@
+"""Meeting2Deck 단계별 파이프라인 정의 및 체크포인트.
+
+7단계 워크플로우를 의존 관계에 따라 5개 스테이지로 나누고, 각 스테이지는
+작업 디렉토리에 중간 산출물을 남긴다. 완료된 스테이지는 pipeline.json에
+기록되어, 실패/타임아웃 후 재실행하면 마지막 완료 스테이지 다음부터 이어간다.
+after가 모두 끝난 스테이지끼리는 동시에 실행된다 (analysis 이후
+diagram/notion/email, diagram 이후 deck).
+"""
+
+import json
+import os
+import time
+
+CHECKPOINT_FILE = "pipeline.json"
+
+# name: 스테이지 이름 / steps: CLAUDE.md STEP 번호 / outputs: 완료 판정 산출물
+# after: 먼저 끝나야 하는 스테이지
+# needs_pdf: PDF 입력이 필요한지 (이후 스테이지는 중간 산출물만 읽는다).
+#   {source}는 전처리된 텍스트/이미지 경로 또는 PDF 원본 경로로 채워진다 (claude_runner)
+# timeout: 스테이지 타임아웃(초)
+PIPELINE = [
+    {
+        "name": "analysis",
+        "steps": [1, 2],
+        "after": [],
+        "outputs": ["meeting_structure.json"],
+        "needs_pdf": True,
+        "timeout": 300,
+        "prompt": """CLAUDE.md의 STEP 1(입력 해석)과 STEP 2(회의 구조 재구성)만 수행하세요.
+{source}
+STEP 2의 결과(회의 목적, 배경, 현재 상태, 논의 흐름, 의사결정, 전략 방향, 리스크,
+미해결 이슈, 액션 아이템, 다음 단계)를 JSON으로 {job_dir}/meeting_structure.json에 저장하세요.""",
+    },
+    {
+        "name": "diagram",
+        "steps": [3],
+        "after": ["analysis"],
+        "outputs": ["diagram_spec.json"],
+        "needs_pdf": True,
+        "timeout": 180,
+        "prompt": """CLAUDE.md의 STEP 3(손그림 다이어그램 전문화)만 수행하세요.
+{source}
+회의 구조는 {job_dir}/meeting_structure.json을 참고하세요.
+다이어그램 스펙(nodes, edges, layout_hint)을 {job_dir}/diagram_spec.json에 저장하세요.""",
+    },
+    {
+        "name": "deck",
+        "steps": [4, 5],
+        "after": ["analysis", "diagram"],
+        "outputs": ["slides.json", "slides.pptx"],
+        "needs_pdf": False,
+        "timeout": 300,
+        "prompt": """CLAUDE.md의 STEP 4(슬라이드 구성 설계)와 STEP 5(Google Slides 구조 출력)만 수행하세요.
+입력: {job_dir}/meeting_structure.json, {job_dir}/diagram_spec.json
+슬라이드 JSON 스펙(deck_spec.py 형식)을 {job_dir}/slides.json에 저장한 뒤,
+별도 Python 스크립트를 작성하지 말고 다음 명령으로 PPTX를 렌더링하세요:
+python -m services.render_pool render {job_dir}/slides.json {job_dir}/slides.pptx""",
+    },
+    {
+        "name": "notion",
+        "steps": [6],
+        "after": ["analysis"],
+        "outputs": ["notion_summary.md"],
+        "needs_pdf": False,
+        "timeout": 180,
+        "prompt": """CLAUDE.md의 STEP 6(노션 공유용 요약 생성)만 수행하세요.
+입력: {job_dir}/meeting_structure.json
+요약을 {job_dir}/notion_summary.md에 저장하세요.""",
+    },
+    {
+        "name": "email",
+        "steps": [7],
+        "after": ["analysis"],
+        "outputs": ["email_draft.md"],
+        "needs_pdf": False,
+        "timeout": 120,
+        "prompt": """CLAUDE.md의 STEP 7(팀 이메일 송부용 메시지 생성)만 수행하세요.
+입력: {job_dir}/meeting_structure.json
+이메일 초안을 {job_dir}/email_draft.md에 저장하세요.""",
+    },
+]
+
+# 스테이지별 부가 결과(URL, 에러)는 CLI가 stage_<name>.json에 기록한다
+STAGE_RESULT_FILE = "stage_{name}.json"
+
+
+def get_stage(name: str) -> dict:
+    for stage in PIPELINE:
+        if stage["name"] == name:
+            return stage
+    raise KeyError(name)
+
+
+def ready_stages(done: set, running: set) -> list:
+    """선행 스테이지가 모두 끝났고 아직 시작하지 않은 스테이지 목록."""
+    return [
+        stage for stage in PIPELINE
+        if stage["name"] not in done and stage["name"] not in running
+        and all(dep in done for dep in stage["after"])
+    ]
+
+
+def load_checkpoint(job_dir: str) -> dict:
+    """pipeline.json을 읽는다. 없으면 빈 상태를 반환."""
+    path = os.path.join(job_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {"completed": [], "stage_results": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(job_dir: str, state: dict) -> None:
+    """pipeline.json을 원자적으로 기록한다 (쓰는 도중 중단돼도 이전 상태 유지)."""
+    path = os.path.join(job_dir, CHECKPOINT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def is_stage_done(job_dir: str, state: dict, stage: dict) -> bool:
+    """체크포인트에 기록되어 있고 산출물이 모두 남아 있으면 완료로 본다."""
+    return stage["name"] in state["completed"] and all(
+        os.path.exists(os.path.join(job_dir, f)) for f in stage["outputs"]
+    )
+
+
+def missing_outputs(job_dir: str, stage: dict) -> list:
+    return [f for f in stage["outputs"] if not os.path.exists(os.path.join(job_dir, f))]
+
+
+def read_stage_result(job_dir: str, stage: dict) -> dict:
+    path = os.path.join(job_dir, STAGE_RESULT_FILE.format(name=stage["name"]))
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def mark_stage_done(job_dir: str, state: dict, stage: dict) -> None:
+    if stage["name"] not in state["completed"]:
+        state["completed"].append(stage["name"])
+    state["stage_results"][stage["name"]] = read_stage_result(job_dir, stage)
+    state["updated_at"] = time.time()
+    save_checkpoint(job_dir, state)
@@ -0,0 +1,250 @@
+"""상주 PPTX 렌더 워커 풀.
+
+덱마다 새 Python 프로세스로 slide_template을 import하면 인터프리터 기동 +
+python-pptx/lxml import 비용을 매번 낸다. 워커 프로세스를 미리 띄워 import와
+공통 요소 XML 템플릿 생성을 한 번만 하고, 덱 스펙 렌더링은 워커에 나눠 맡긴다.
+
+- 봇 프로세스 안에서는 RenderPool.render()를 직접 호출
+- Claude CLI 등 외부 프로세스는 Unix 소켓으로 요청 (JSON 한 줄 요청/응답)
+
+    python -m services.render_pool serve                          # 소켓 서버 단독 실행
+    python -m services.render_pool render slides.json slides.pptx  # 서버에 요청, 없으면 직접 렌더링
+    python -m services.render_pool render slides.json slides.pptx --prev output/jobs/<이전 job_id>
+                                                                   # 이전 덱에서 바뀐 슬라이드만 다시 렌더링
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)  # slide_template/deck_spec는 프로젝트 루트 모듈
+
+logger = logging.getLogger(__name__)
+
+RENDER_WORKERS = int(os.getenv("MEETING2DECK_RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+RENDER_SOCKET = os.path.join(PROJECT_DIR, os.getenv("MEETING2DECK_RENDER_SOCKET", "output/render.sock"))
+CLIENT_TIMEOUT = 120
+
+# 워커 시작 시 한 번 렌더링해 공통 요소 템플릿(head/footer)을 만들어 두는 스펙
+_WARMUP_SPEC = {
+    "deck_title": "warmup",
+    "slides": [
+        {"type": "title", "title": "warmup"},
+        {"type": "bullet", "title": "warmup", "bullets": ["warmup"]},
+        {"type": "closing"},
+    ],
+}
+
+# ── 워커 프로세스 측 ──
+
+_templates = None  # 워커별 공통 요소 템플릿 (덱 사이에 공유)
+
+
+def _init_worker():
+    global _templates
+    from slide_template import DeckBuilder
+
+    _templates = {}
+    DeckBuilder.from_spec(_WARMUP_SPEC, templates=_templates)
+
+
+def _render(spec, out_path, prev_dir=None):
+    """워커에서 실행. 스펙을 렌더링해 저장하고 소요 시간(ms)을 반환.
+
+    prev_dir에 이전 slides.json/slides.pptx가 있으면 바뀐 슬라이드만 다시 그린다.
+    """
+    from slide_template import DeckBuilder
+
+    t0 = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    prev = _load_previous(prev_dir)
+    if prev:
+        deck, _ = DeckBuilder.from_previous(prev[1], prev[0], spec, templates=_templates)
+    else:
+        deck = DeckBuilder.from_spec(spec, templates=_templates)
+    deck.save(out_path)
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def _load_previous(prev_dir):
+    """(이전 스펙, 이전 PPTX 경로). 둘 중 하나라도 없으면 None."""
+    if not prev_dir:
+        return None
+    spec_path = os.path.join(prev_dir, "slides.json")
+    pptx_path = os.path.join(prev_dir, "slides.pptx")
+    if not (os.path.exists(spec_path) and os.path.exists(pptx_path)):
+        return None
+    with open(spec_path, "r", encoding="utf-8") as f:
+        return json.load(f), pptx_path
+
+
+def _ping():
+    return os.getpid()
+
+
+# ── 봇 프로세스 측 ──
+
+class RenderPool:
+    """미리 띄워 둔 워커 프로세스로 덱 스펙을 병렬 렌더링한다."""
+
+    def __init__(self, workers=RENDER_WORKERS, socket_path=RENDER_SOCKET):
+        self.workers = max(1, workers)
+        self.socket_path = socket_path
+        self._executor = None
+        self._server = None
+
+    def start(self):
+        # 봇 프로세스는 스레드(토큰 갱신 등)를 쓰므로 fork 대신 spawn
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # 워커는 필요할 때 생성되므로 워커 수만큼 작업을 던져 미리 띄운다
+        for _ in range(self.workers):
+            self._executor.submit(_ping)
+        logger.info(f"렌더 워커 {self.workers}개 시작")
+
+    async def render(self, spec: dict, out_path: str, prev_dir: str = None) -> float:
+        """덱 스펙을 out_path로 렌더링하고 소요 시간(ms)을 반환.
+
+        prev_dir: 이전 작업 디렉토리 (바뀐 슬라이드만 다시 렌더링)
+
+        Raises:
+            deck_spec.DeckSpecError: 스키마에 맞지 않는 스펙
+        """
+        if self._executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _render, spec, out_path, prev_dir)
+
+    async def render_file(self, spec_path: str, out_path: str = None, prev_dir: str = None) -> str:
+        """JSON 스펙 파일을 렌더링하고 저장 경로를 반환 (slide_template.render_spec과 동일한 규칙)."""
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        out_path = out_path or os.path.join(os.path.dirname(os.path.abspath(spec_path)), "slides.pptx")
+        elapsed = await self.render(spec, out_path, prev_dir)
+        logger.info(f"렌더링 완료 ({elapsed}ms): {out_path}")
+        return out_path
+
+    async def serve(self):
+        """외부 프로세스용 Unix 소켓 서버를 연다."""
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행이 남긴 소켓
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        logger.info(f"렌더 서버 대기: {self.socket_path}")
+
+    async def _handle(self, reader, writer):
+        try:
+            req = json.loads(await reader.readline())
+            path = await self.render_file(req["spec_path"], req.get("out_path"), req.get("prev_dir"))
+            resp = {"ok": True, "path": path}
+        except Exception as e:
+            resp = {"ok": False, "error": str(e)}
+        try:
+            writer.write((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ── 클라이언트 ──
+
+def render_via_server(spec_path: str, out_path: str = None, prev_dir: str = None,
+                      socket_path: str = RENDER_SOCKET) -> str:
+    """렌더 서버에 요청하고 저장 경로를 반환.
+
+    서버가 없으면 (접속 실패) ConnectionRefusedError/FileNotFoundError,
+    접속한 뒤 렌더링 실패·응답 시간 초과·응답 없음이면 RuntimeError
+    (서버가 이미 렌더링 중일 수 있으므로 호출 측이 직접 다시 렌더링하면 안 된다).
+    """
+    req = {"spec_path": os.path.abspath(spec_path)}
+    if out_path:
+        req["out_path"] = os.path.abspath(out_path)
+    if prev_dir:
+        req["prev_dir"] = os.path.abspath(prev_dir)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        sock.connect(socket_path)
+        try:
+            sock.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
+            resp = json.loads(sock.makefile("rb").readline())
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"렌더 서버 응답 없음: {type(e).__name__}: {e}") from e
+    if not resp.get("ok"):
+        raise RuntimeError(resp.get("error", "렌더링 실패"))
+    return resp["path"]
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["serve"]:
+        logging.basicConfig(level=logging.INFO)
+
+        async def run():
+            pool = RenderPool()
+            pool.start()
+            await pool.serve()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await pool.stop()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    prev_dir = None
+    if "--prev" in args[:-1]:
+        i = args.index("--prev")
+        prev_dir = args[i + 1]
+        args = args[:i] + args[i + 2:]
+
+    if args[:1] == ["render"] and len(args) >= 2:
+        out = args[2] if len(args) > 2 else None
+        try:
+            print(render_via_server(args[1], out, prev_dir))
+        except (ConnectionRefusedError, FileNotFoundError):
+            # 서버가 떠 있지 않으면 이 프로세스에서 직접 렌더링
+            try:
+                with open(args[1], "r", encoding="utf-8") as f:
+                    spec = json.load(f)
+                out = out or os.path.join(os.path.dirname(os.path.abspath(args[1])), "slides.pptx")
+                _render(spec, out, prev_dir)
+                print(out)
+            except (OSError, ValueError) as e:  # 스펙 파일 없음/읽기 실패, JSON·스키마 오류
+                print(f"렌더링 실패: {e}", file=sys.stderr)
+                sys.exit(1)
+        except (OSError, RuntimeError) as e:
+            print(f"렌더링 실패: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    print("사용법: python -m services.render_pool serve | render <slides.json> [slides.pptx] [--prev <job_dir>]")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(PROJECT_DIR, "output", "cache")
+CACHE_MAX_BYTES = int(os.getenv("MEETING2DECK_CACHE_MAX_MB", "500")) * 1024 * 1024
+CACHE_MAX_AGE = float(os.getenv("MEETING2DECK_CACHE_MAX_AGE_DAYS", "30")) * 86400
+
+# 결과에 영향을 주는 파일 — 내용이 바뀌면 캐시 키가 달라진다
+VERSION_FILES = ["CLAUDE.md", "slide_template.py", "deck_spec.py", "text_fit.py", "graph_layout.py",
+                 "services/pdf_preprocess.py"]
+
+# 캐시 항목에 보관하는 산출물 (result 키, 파일명)
+CACHED_FILES = [
+    ("slides_pptx_path", "slides.pptx"),
+    ("slides_json_path", "slides.json"),
+    ("notion_md_path", "notion_summary.md"),
+    ("email_draft_path", "email_draft.md"),
+]
+
+_CHUNK = 1024 * 1024
+
+
+def _version_fingerprint(prompt_version: str) -> bytes:
+    h = hashlib.sha256(prompt_version.encode("utf-8"))
+    for name in VERSION_FILES:
+        fpath = os.path.join(PROJECT_DIR, name)
+        if os.path.exists(fpath):
+            with open(fpath, "rb") as f:
+                h.update(f.read())
+    return h.digest()
+
+
+def compute_cache_key(pdf_path: str, prompt_version: str = "") -> str:
+    """PDF 바이트 SHA-256 + 프롬프트/템플릿 버전으로 캐시 키를 만든다."""
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    h.update(_version_fingerprint(prompt_version))
+    return h.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """파일 바이트의 SHA-256 (작업 기록·중복 업로드 판별용, 버전 무관)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _entry_dir(key: str) -> str:
+    return os.path.join(CACHE_DIR, key)
+
+
+def lookup(key: str, job_dir: str):
+    """캐시 적중 시 산출물을 job_dir로 복사하고 result dict를 반환한다. 미스면 None."""
+    entry = _entry_dir(key)
+    meta_path = os.path.join(entry, "result.json")
+    if not os.path.exists(meta_path):
+        return None
+    if time.time() - os.path.getmtime(entry) > CACHE_MAX_AGE:
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+
+    os.makedirs(job_dir, exist_ok=True)
+    for rkey, filename in CACHED_FILES:
+        src = os.path.join(entry, filename)
+        if os.path.exists(src):
+            dst = os.path.join(job_dir, filename)
+            shutil.copyfile(src, dst)
+            result[rkey] = dst
+    shutil.copyfile(meta_path, os.path.join(job_dir, "result.json"))
+
+    os.utime(entry)  # LRU 갱신
+    result["cache_key"] = key
+    result["cached"] = True
+    logger.info(f"캐시 적중: {key[:12]}")
+    return result
+
+
+def store(key: str, result: dict) -> None:
+    """완료된 작업의 산출물을 캐시에 저장한다."""
+    entry = _entry_dir(key)
+    tmp = f"{entry}.tmp{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    meta = {k: v for k, v in result.items()
+            if not k.endswith("_path") and k not in ("job_id", "job_dir", "cached", "cache_key")}
+    for rkey, filename in CACHED_FILES:
+        src = result.get(rkey)
+        if src and os.path.exists(src):
+            shutil.copyfile(src, os.path.join(tmp, filename))
+    with open(os.path.join(tmp, "result.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    # 임시 디렉토리 완성 후 교체 (다른 작업이 읽는 도중 반쯤 쓰인 항목을 보지 않도록)
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+    logger.info(f"캐시 저장: {key[:12]}")
+    evict()
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for name in os.listdir(path):
+        fpath = os.path.join(path, name)
+        if os.path.isfile(fpath):
+            total += os.path.getsize(fpath)
+    return total
+
+
+def evict(max_bytes: int = CACHE_MAX_BYTES, max_age: float = CACHE_MAX_AGE,
+          cache_dir: str = CACHE_DIR) -> int:
+    """오래된 항목과 용량 초과분(LRU 순)을 삭제하고 삭제 건수를 반환한다.
+
+    cache_dir: 항목 디렉토리들이 있는 캐시 (PDF 페이지 캐시도 같은 방식으로 정리)
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    now = time.time()
+    entries = []
+    removed = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if not os.path.isdir(path) or ".tmp" in name:
+            continue
+        mtime = os.path.getmtime(path)
+        if now - mtime > max_age:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        else:
+            entries.append((mtime, _dir_size(path), path))
+
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+
+    if removed:
+        logger.info(f"캐시 정리: {removed}건 삭제")
+    return removed
@@ -1,33 +1,21 @@
+import asyncio
+import hashlib
 import json
 import os
 import sys
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-
-SCOPES = ["https://www.googleapis.com/auth/presentations", "https://www.googleapis.com/auth/drive"]
-
-server = Server("google-slides-mcp")
 
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)  # Claude CLI가 스크립트로 직접 실행하므로 services 패키지 경로 추가
 
-def _get_credentials():
-    token_path = os.path.join(PROJECT_DIR, "token.json")
-    creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        with open(token_path, "w") as f:
-            f.write(creds.to_json())
-    return creds
+from services import telemetry
+from services.google_clients import get_slides_service, get_drive_service, execute, object_exists_error
+from deck_spec import DECK_SPEC_SCHEMA, validate_spec, normalize_type
+from graph_layout import layered_layout
 
-def get_slides_service():
-    return build("slides", "v1", credentials=_get_credentials())
-
-def get_drive_service():
-    return build("drive", "v3", credentials=_get_credentials())
+server = Server("google-slides-mcp")
 
 
 @server.list_tools()
@@ -73,14 +61,22 @@ async def list_tools():
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "deck_json": {
-                        "type": "object",
-                        "description": "The full deck JSON spec with deck_title, deck_subtitle, slides array",
-                    },
+                    "deck_json": dict(
+                        DECK_SPEC_SCHEMA,
+                        description="The full deck JSON spec with deck_title, deck_subtitle, slides array",
+                    ),
                     "share_with_email": {
                         "type": "string",
                         "description": "Optional email to share the presentation with",
                     },
+                    "presentation_id": {
+                        "type": "string",
+                        "description": "Existing presentation built from previous_deck_json; only changed slides are patched",
+                    },
+                    "previous_deck_json": {
+                        "type": "object",
+                        "description": "The deck JSON spec the existing presentation was built from",
+                    },
                 },
                 "required": ["deck_json"],
             },
@@ -99,171 +95,296 @@ async def list_tools():
     ]
 
 
+# batchUpdate 1회당 요청 수/페이로드 상한 (넘으면 슬라이드 단위로 나눠 보냄)
+MAX_BATCH_REQUESTS = 500
+MAX_BATCH_BYTES = 1_000_000
+
+
+def _diagram_text(ds: dict) -> str:
+    nodes = ds.get("nodes", [])
+    edges = ds.get("edges", [])
+    layout = ds.get("layout_hint", "")
+    desc_lines = []
+    if nodes:
+        desc_lines.append("Components: " + ", ".join(str(n) for n in nodes))
+    if edges:
+        desc_lines.append("Connections: " + ", ".join(str(e) for e in edges))
+    if layout:
+        desc_lines.append("Layout: " + layout)
+    return "\n".join(desc_lines) if desc_lines else "[Diagram]"
+
+
+def _slide_content(spec: dict):
+    """슬라이드 1장이 Slides에 그려지는 내용: (레이아웃, 제목, 본문, 다이어그램).
+
+    간선이 있는 다이어그램은 본문 대신 도형/연결선으로 그리므로 diagram_spec을 넘긴다.
+    """
+    s_type = normalize_type(spec.get("type"))
+    if s_type == "title":
+        return "TITLE", spec.get("title", ""), spec.get("subtitle", ""), None
+    if s_type == "diagram":
+        ds = spec.get("diagram_spec") or {}
+        if ds.get("edges") and not spec.get("diagram_description"):
+            return "TITLE_ONLY", spec.get("title", ""), "", ds
+    if s_type == "bullet":
+        body_text = "\n".join(spec.get("bullets", []))
+    elif s_type == "diagram":
+        body_text = spec.get("diagram_description") or _diagram_text(spec.get("diagram_spec", {}))
+    else:
+        body_text = ""
+    return "TITLE_AND_BODY", spec.get("title", ""), body_text, None
+
+
+# 레이아웃 → (제목 placeholder, 본문 placeholder)
+_PLACEHOLDERS = {
+    "TITLE": ("CENTERED_TITLE", "SUBTITLE"),
+    "TITLE_AND_BODY": ("TITLE", "BODY"),
+    "TITLE_ONLY": ("TITLE", None),
+}
+
+# 다이어그램 영역 (EMU, 기본 16:9 페이지 기준 제목 아래 ~ 하단 여백 위)
+DIAGRAM_AREA = (640080, 1417320, 7863840, 3246120)
+
+
+def _emu_box(slide_id: str, x: int, y: int, w: int, h: int) -> dict:
+    return {
+        "pageObjectId": slide_id,
+        "size": {"width": {"magnitude": w, "unit": "EMU"}, "height": {"magnitude": h, "unit": "EMU"}},
+        "transform": {"scaleX": 1, "scaleY": 1, "translateX": x, "translateY": y, "unit": "EMU"},
+    }
+
+
+def _diagram_requests(ds: dict, prefix: str, slide_id: str) -> list:
+    """graph_layout 계층 배치로 노드 도형과 꺾인 연결선을 만드는 요청 목록."""
+    layout = layered_layout(ds.get("nodes", []), ds.get("edges", []), ds.get("layout_hint", ""))
+    pos, bw, bh = layout.place(*DIAGRAM_AREA)
+    requests = []
+    for i, ((x, y), nd) in enumerate(zip(pos, layout.nodes)):
+        oid = f"{prefix}_n{i}"
+        requests.append({"createShape": {
+            "objectId": oid, "shapeType": "ROUND_RECTANGLE",
+            "elementProperties": _emu_box(slide_id, x, y, bw, bh),
+        }})
+        text = "\n".join(filter(None, [nd.get("name", ""), nd.get("desc", "")]))
+        if text:
+            requests.append({"insertText": {"objectId": oid, "text": text}})
+    for k, (u, v, label) in enumerate(layout.edges):
+        oid = f"{prefix}_e{k}"
+        a, b = layout.sites(u, v)
+        (x1, y1), (x2, y2) = pos[u], pos[v]
+        requests.append({"createLine": {
+            "objectId": oid, "lineCategory": "BENT",
+            "elementProperties": _emu_box(slide_id, min(x1, x2), min(y1, y2),
+                                          max(abs(x2 - x1), 1), max(abs(y2 - y1), 1)),
+        }})
+        requests.append({"updateLineProperties": {
+            "objectId": oid,
+            "lineProperties": {
+                "startConnection": {"connectedObjectId": f"{prefix}_n{u}", "connectionSiteIndex": a},
+                "endConnection": {"connectedObjectId": f"{prefix}_n{v}", "connectionSiteIndex": b},
+                "endArrow": "FILL_ARROW",
+            },
+            "fields": "startConnection,endConnection,endArrow",
+        }})
+    return requests
+
+
+def _slide_requests(spec: dict, prefix: str, index: int = None) -> list:
+    """슬라이드 1장의 batchUpdate 요청 목록. 객체 ID는 prefix에서 결정적으로 만든다."""
+    slide_id, title_id, body_id = f"{prefix}_s", f"{prefix}_t", f"{prefix}_b"
+    layout, title_text, body_text, diagram = _slide_content(spec)
+    title_ph, body_ph = _PLACEHOLDERS[layout]
+
+    mappings = [{"layoutPlaceholder": {"type": title_ph}, "objectId": title_id}]
+    if body_ph:
+        mappings.append({"layoutPlaceholder": {"type": body_ph}, "objectId": body_id})
+    create = {
+        "objectId": slide_id,
+        "slideLayoutReference": {"predefinedLayout": layout},
+        "placeholderIdMappings": mappings,
+    }
+    if index is not None:
+        create["insertionIndex"] = index
+    requests = [{"createSlide": create}]
+    # 빈 문자열 insertText는 API 오류이므로 생략
+    if title_text:
+        requests.append({"insertText": {"objectId": title_id, "text": title_text}})
+    if body_text:
+        requests.append({"insertText": {"objectId": body_id, "text": body_text}})
+    if diagram:
+        requests.extend(_diagram_requests(diagram, prefix, slide_id))
+    return requests
+
+
+def _replace_text(object_id: str, old: str, new: str) -> list:
+    # 빈 도형에 deleteText, 빈 문자열 insertText는 API 오류
+    requests = []
+    if old:
+        requests.append({"deleteText": {"objectId": object_id, "textRange": {"type": "ALL"}}})
+    if new:
+        requests.append({"insertText": {"objectId": object_id, "text": new}})
+    return requests
+
+
+def compile_patch_requests(prev_deck: dict, deck: dict, slide_ids: list) -> list:
+    """기존 프레젠테이션(prev_deck으로 생성, 현재 슬라이드 ID slide_ids)을 deck에 맞게
+    고치는 batchUpdate 요청 목록. 바뀐 슬라이드만 다룬다.
+
+    - 레이아웃이 같으면 제목/본문 텍스트만 교체
+    - 레이아웃이나 다이어그램이 바뀌면 슬라이드를 지우고 같은 위치에 새로 생성
+    - 늘어난 슬라이드는 추가, 줄어든 슬라이드는 삭제
+    새로 만드는 슬라이드 ID는 위치와 내용 해시로 정해 재실행해도 같은 요청이 나온다.
+    """
+    old_slides = prev_deck.get("slides", [])
+    new_slides = deck.get("slides", [])
+    requests = []
+    for i, spec in enumerate(new_slides):
+        new = _slide_content(spec)
+        digest = hashlib.sha256(json.dumps(new, ensure_ascii=False).encode("utf-8")).hexdigest()[:8]
+        if i >= len(old_slides):
+            requests.extend(_slide_requests(spec, f"m2d_{i:03d}_{digest}", index=i))
+            continue
+        old = _slide_content(old_slides[i])
+        if old == new:
+            continue
+        prefix = slide_ids[i][:-2]  # "<prefix>_s"
+        if old[0] == new[0] and old[3] == new[3]:
+            if old[1] != new[1]:
+                requests.extend(_replace_text(f"{prefix}_t", old[1], new[1]))
+            if old[2] != new[2]:
+                requests.extend(_replace_text(f"{prefix}_b", old[2], new[2]))
+        else:
+            requests.append({"deleteObject": {"objectId": slide_ids[i]}})
+            requests.extend(_slide_requests(spec, f"m2d_{i:03d}_{digest}", index=i))
+    for oid in slide_ids[len(new_slides):]:
+        requests.append({"deleteObject": {"objectId": oid}})
+    return requests
+
+
+def compile_deck_requests(deck: dict, delete_ids=()) -> list:
+    """덱 스펙 전체를 batchUpdate 요청 묶음 목록으로 컴파일한다.
+
+    보통 묶음 1개(= HTTP 1회)이며, 상한을 넘으면 슬라이드 경계에서 나눈다.
+    객체 ID는 슬라이드 순번 기반(m2d_000_s 등)이라 같은 스펙이면 항상 같은 요청이 나온다.
+    삭제는 맨 끝에 둔다 — 이미 반영된 묶음을 재시도하면 첫 createSlide가
+    '이미 존재'로 거절되어 재시도 성공으로 판별할 수 있다.
+    """
+    groups = [_slide_requests(spec, f"m2d_{i:03d}") for i, spec in enumerate(deck.get("slides", []))]
+    groups.append([{"deleteObject": {"objectId": oid}} for oid in delete_ids])
+
+    batches, current, current_bytes = [], [], 0
+    for group in groups:
+        size = len(json.dumps(group, ensure_ascii=False).encode("utf-8"))
+        if current and (len(current) + len(group) > MAX_BATCH_REQUESTS
+                        or current_bytes + size > MAX_BATCH_BYTES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.extend(group)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _patch_deck(service, pid: str, prev_deck: dict, deck: dict):
+    """기존 프레젠테이션에서 바뀐 슬라이드만 고친다."""
+    presentation = execute(
+        service.presentations().get(presentationId=pid, fields="slides(objectId)"), "slides",
+    )
+    slide_ids = [sl["objectId"] for sl in presentation.get("slides", [])]
+    url = f"https://docs.google.com/presentation/d/{pid}/edit"
+    if len(slide_ids) != len(prev_deck.get("slides", [])) or not all(i.endswith("_s") for i in slide_ids):
+        return [TextContent(type="text", text=json.dumps({
+            "error": "presentation does not match previous_deck_json; build a new deck instead", "url": url,
+        }))]
+
+    requests = compile_patch_requests(prev_deck, deck, slide_ids)
+    if requests:
+        # deleteText/deleteObject는 재실행 시 결과가 달라지므로 429만 재시도
+        execute(
+            service.presentations().batchUpdate(presentationId=pid, body={"requests": requests}),
+            "slides", idempotent=False,
+        )
+    return [TextContent(type="text", text=json.dumps({
+        "presentation_id": pid, "url": url, "slides_count": len(deck.get("slides", [])),
+        "patched_requests": len(requests),
+    }))]
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict):
+    # Claude CLI가 띄운 별도 프로세스 — span은 봇이 합쳐 가도록 external로 기록
+    with telemetry.span(f"mcp.{name}", job_id=os.getenv(telemetry.JOB_ID_ENV), external=True) as sp:
+        # Google API 호출은 속도 제한·재시도 백오프로 블로킹 대기하므로 스레드에서 실행해
+        # stdio 서버의 이벤트 루프(다른 요청·핑 처리)를 막지 않는다
+        contents = await asyncio.to_thread(_call_tool, name, arguments)
+        if contents and '"error"' in contents[0].text:
+            sp.status = "error"
+    return contents
+
+
+def _call_tool(name: str, arguments: dict):
     if name == "create_presentation":
         service = get_slides_service()
         body = {"title": arguments["title"]}
-        presentation = service.presentations().create(body=body).execute()
+        presentation = execute(service.presentations().create(body=body), "slides", idempotent=False)
         pid = presentation.get("presentationId")
         return [TextContent(type="text", text=json.dumps({"presentation_id": pid, "url": f"https://docs.google.com/presentation/d/{pid}/edit"}))]
 
     elif name == "add_slide":
         service = get_slides_service()
         pid = arguments["presentation_id"]
-        slide_type = arguments["slide_type"]
-        title = arguments["title"]
-
-        requests = []
 
+        # 기존 프레젠테이션에 덧붙이므로 객체 ID 충돌을 피하려 랜덤 접두사 사용
         import uuid
-        slide_id = f"slide_{uuid.uuid4().hex[:8]}"
-        title_id = f"title_{uuid.uuid4().hex[:8]}"
-        body_id = f"body_{uuid.uuid4().hex[:8]}"
-
-        if slide_type == "title":
-            requests.append({
-                "createSlide": {
-                    "objectId": slide_id,
-                    "slideLayoutReference": {"predefinedLayout": "TITLE"},
-                    "placeholderIdMappings": [
-                        {"layoutPlaceholder": {"type": "CENTERED_TITLE"}, "objectId": title_id},
-                        {"layoutPlaceholder": {"type": "SUBTITLE"}, "objectId": body_id},
-                    ],
-                }
-            })
-            requests.append({
-                "insertText": {"objectId": title_id, "text": title}
-            })
-            if arguments.get("subtitle"):
-                requests.append({
-                    "insertText": {"objectId": body_id, "text": arguments["subtitle"]}
-                })
-
-        elif slide_type == "bullet":
-            requests.append({
-                "createSlide": {
-                    "objectId": slide_id,
-                    "slideLayoutReference": {"predefinedLayout": "TITLE_AND_BODY"},
-                    "placeholderIdMappings": [
-                        {"layoutPlaceholder": {"type": "TITLE"}, "objectId": title_id},
-                        {"layoutPlaceholder": {"type": "BODY"}, "objectId": body_id},
-                    ],
-                }
-            })
-            requests.append({
-                "insertText": {"objectId": title_id, "text": title}
-            })
-            bullets = arguments.get("bullets", [])
-            if bullets:
-                bullet_text = "\n".join(bullets)
-                requests.append({
-                    "insertText": {"objectId": body_id, "text": bullet_text}
-                })
-
-        elif slide_type == "diagram":
-            requests.append({
-                "createSlide": {
-                    "objectId": slide_id,
-                    "slideLayoutReference": {"predefinedLayout": "TITLE_AND_BODY"},
-                    "placeholderIdMappings": [
-                        {"layoutPlaceholder": {"type": "TITLE"}, "objectId": title_id},
-                        {"layoutPlaceholder": {"type": "BODY"}, "objectId": body_id},
-                    ],
-                }
-            })
-            requests.append({
-                "insertText": {"objectId": title_id, "text": title}
-            })
-            desc = arguments.get("diagram_description", "[Diagram placeholder]")
-            requests.append({
-                "insertText": {"objectId": body_id, "text": desc}
-            })
-
-        service.presentations().batchUpdate(presentationId=pid, body={"requests": requests}).execute()
-        return [TextContent(type="text", text=json.dumps({"slide_id": slide_id, "status": "added"}))]
+        prefix = f"add_{uuid.uuid4().hex[:8]}"
+        spec = {
+            "type": arguments["slide_type"],
+            "title": arguments["title"],
+            "subtitle": arguments.get("subtitle", ""),
+            "bullets": arguments.get("bullets", []),
+            "diagram_description": arguments.get("diagram_description", "[Diagram placeholder]"),
+        }
+        requests = _slide_requests(spec, prefix)
+
+        execute(
+            service.presentations().batchUpdate(presentationId=pid, body={"requests": requests}),
+            "slides", applied=object_exists_error,
+        )
+        return [TextContent(type="text", text=json.dumps({"slide_id": f"{prefix}_s", "status": "added"}))]
 
     elif name == "build_deck_from_json":
         deck = arguments["deck_json"]
+        errors = validate_spec(deck)
+        if errors:
+            return [TextContent(type="text", text=json.dumps({"error": "invalid deck_json", "details": errors}, ensure_ascii=False))]
         service = get_slides_service()
 
+        if arguments.get("presentation_id") and arguments.get("previous_deck_json"):
+            return _patch_deck(service, arguments["presentation_id"], arguments["previous_deck_json"], deck)
+
         # Create presentation
         body = {"title": deck.get("deck_title", "Meeting2Deck")}
-        presentation = service.presentations().create(body=body).execute()
+        presentation = execute(service.presentations().create(body=body), "slides", idempotent=False)
         pid = presentation.get("presentationId")
 
-        # Delete default blank slide
-        default_slides = presentation.get("slides", [])
-        if default_slides:
-            del_requests = [{"deleteObject": {"objectId": default_slides[0]["objectId"]}}]
-            service.presentations().batchUpdate(presentationId=pid, body={"requests": del_requests}).execute()
-
-        # Add each slide
-        for slide_spec in deck.get("slides", []):
-            import uuid
-            slide_id = f"slide_{uuid.uuid4().hex[:8]}"
-            title_id = f"title_{uuid.uuid4().hex[:8]}"
-            body_id = f"body_{uuid.uuid4().hex[:8]}"
-            requests = []
-
-            s_type = slide_spec.get("type", "bullet")
-
-            if s_type == "title":
-                requests.append({
-                    "createSlide": {
-                        "objectId": slide_id,
-                        "slideLayoutReference": {"predefinedLayout": "TITLE"},
-                        "placeholderIdMappings": [
-                            {"layoutPlaceholder": {"type": "CENTERED_TITLE"}, "objectId": title_id},
-                            {"layoutPlaceholder": {"type": "SUBTITLE"}, "objectId": body_id},
-                        ],
-                    }
-                })
-                requests.append({"insertText": {"objectId": title_id, "text": slide_spec.get("title", "")}})
-                if slide_spec.get("subtitle"):
-                    requests.append({"insertText": {"objectId": body_id, "text": slide_spec["subtitle"]}})
-            else:
-                requests.append({
-                    "createSlide": {
-                        "objectId": slide_id,
-                        "slideLayoutReference": {"predefinedLayout": "TITLE_AND_BODY"},
-                        "placeholderIdMappings": [
-                            {"layoutPlaceholder": {"type": "TITLE"}, "objectId": title_id},
-                            {"layoutPlaceholder": {"type": "BODY"}, "objectId": body_id},
-                        ],
-                    }
-                })
-                requests.append({"insertText": {"objectId": title_id, "text": slide_spec.get("title", "")}})
-
-                if s_type == "bullet":
-                    bullets = slide_spec.get("bullets", [])
-                    if bullets:
-                        requests.append({"insertText": {"objectId": body_id, "text": "\n".join(bullets)}})
-                elif s_type == "diagram":
-                    ds = slide_spec.get("diagram_spec", {})
-                    nodes = ds.get("nodes", [])
-                    edges = ds.get("edges", [])
-                    layout = ds.get("layout_hint", "")
-                    desc_lines = []
-                    if nodes:
-                        desc_lines.append("Components: " + ", ".join(str(n) for n in nodes))
-                    if edges:
-                        desc_lines.append("Connections: " + ", ".join(str(e) for e in edges))
-                    if layout:
-                        desc_lines.append("Layout: " + layout)
-                    requests.append({"insertText": {"objectId": body_id, "text": "\n".join(desc_lines) if desc_lines else "[Diagram]"}})
-
-            service.presentations().batchUpdate(presentationId=pid, body={"requests": requests}).execute()
+        # 기본 빈 슬라이드 삭제 + 전체 슬라이드 생성을 한 번의 batchUpdate로
+        default_ids = [sl["objectId"] for sl in presentation.get("slides", [])[:1]]
+        for requests in compile_deck_requests(deck, delete_ids=default_ids):
+            execute(
+                service.presentations().batchUpdate(presentationId=pid, body={"requests": requests}),
+                "slides", applied=object_exists_error,
+            )
 
         # Share if email provided
         share_email = arguments.get("share_with_email")
         if share_email:
             drive = get_drive_service()
-            drive.permissions().create(
+            execute(drive.permissions().create(
                 fileId=pid,
                 body={"type": "user", "role": "writer", "emailAddress": share_email},
                 sendNotificationEmail=False,
-            ).execute()
+            ), "drive")
 
         url = f"https://docs.google.com/presentation/d/{pid}/edit"
         return [TextContent(type="text", text=json.dumps({"presentation_id": pid, "url": url, "slides_count": len(deck.get("slides", []))}))]
@@ -281,5 +402,5 @@ async def main():
         await server.run(read_stream, write_stream, server.create_initialization_options())
 
 if __name__ == "__main__":
-    import asyncio
+    telemetry.EXTERNAL_PROCESS = True  # Google API 카운터를 봇의 /metrics로 넘긴다
     asyncio.run(main())
@@ -0,0 +1,287 @@
+"""구간별 소요 시간 추적(span)과 Prometheus 형식 메트릭.
+
+작업 1건이 어디서 시간을 쓰는지 (PDF 다운로드, Claude CLI 스테이지, Drive 업로드,
+Make.com 웹훅, Discord 전송, Slides MCP 도구) 보기 위한 계층.
+
+- span(name, job_id=...)으로 감싼 구간은 meeting2deck_span_seconds 히스토그램에 쌓이고
+  작업 디렉토리의 trace.jsonl에 한 줄씩 기록된다 (동기/비동기 with 모두 가능)
+- 대기열 깊이·실행 중 작업 수 같은 값은 gauge로 등록하면 조회 시점에 읽는다
+- serve()는 로컬 HTTP 엔드포인트(GET /metrics)로 메트릭을 내보낸다
+
+Claude CLI가 띄우는 Slides MCP 서버처럼 다른 프로세스의 span은 EXTERNAL_TRACE에 기록되고,
+봇 프로세스가 /metrics 요청 때 새 줄만 읽어 히스토그램에 합친다. 봇은 시작 시점의 파일 끝부터 읽고,
+다 읽은 파일이 EXTERNAL_TRACE_MAX_BYTES를 넘으면 external.jsonl.1로 돌린다.
+그런 프로세스는 EXTERNAL_PROCESS를 켜 두면 카운터도 같은 파일로 보낸다.
+
+    with telemetry.span("drive_upload", job_id=job_id):
+        ...
+    async with telemetry.span("claude_cli", job_id=job_id, stage="analysis"):
+        ...
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR = os.path.join(PROJECT_DIR, "output", "jobs")
+TRACE_FILE = "trace.jsonl"
+EXTERNAL_TRACE = os.path.join(PROJECT_DIR, "output", "traces", "external.jsonl")
+# 봇이 다 읽은 EXTERNAL_TRACE가 이 크기를 넘으면 .1로 돌리고 새 파일에서 이어 읽는다
+EXTERNAL_TRACE_MAX_BYTES = int(os.getenv("MEETING2DECK_EXTERNAL_TRACE_MAX_MB", "10")) * 1024 * 1024
+
+METRICS_HOST = os.getenv("MEETING2DECK_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("MEETING2DECK_METRICS_PORT", "9464"))  # 0이면 엔드포인트 비활성
+
+# 자식 프로세스(Claude CLI → MCP 서버)에 작업 ID를 넘기는 환경변수
+JOB_ID_ENV = "MEETING2DECK_JOB_ID"
+
+# 초 단위 버킷: 웹훅·업로드(수 초)부터 CLI 스테이지(수 분)까지
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()  # Drive 업로드 스레드 등에서도 기록한다
+_histograms = {}  # (span, status) → [버킷별 누적 수..., sum, count]
+_counters = {}  # (이름, labels tuple) → 값
+_gauges = {}  # 이름 → (설명, 값을 돌려주는 함수)
+_external_offset = 0
+
+# 봇 밖의 프로세스(Slides MCP 서버)에서 True — count()를 EXTERNAL_TRACE에 남겨 봇이 합치게 한다
+EXTERNAL_PROCESS = False
+
+
+# ── 기록 ──
+
+def observe(name: str, seconds: float, status: str = "ok") -> None:
+    with _lock:
+        h = _histograms.get((name, status))
+        if h is None:
+            h = _histograms[(name, status)] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """카운터 증가 (예: count("cache_lookups", cache="result", result="hit"))."""
+    if EXTERNAL_PROCESS:
+        _append_external({"ts": round(time.time(), 3), "counter": name, "value": value, "labels": labels})
+        return
+    _add_counter(name, value, labels)
+
+
+def _add_counter(name: str, value: float, labels: dict) -> None:
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def gauge(name: str, fn, help_text: str = "") -> None:
+    """조회 시점에 fn()으로 값을 읽는 gauge 등록 (같은 이름이면 교체)."""
+    _gauges[name] = (help_text, fn)
+
+
+def _append_jsonl(path: str, record: dict) -> None:
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.debug(f"trace 기록 실패 ({path}): {e}")
+
+
+def _append_external(record: dict) -> None:
+    os.makedirs(os.path.dirname(EXTERNAL_TRACE), exist_ok=True)
+    _append_jsonl(EXTERNAL_TRACE, record)
+
+
+def record_span(name: str, start: float, duration: float, status: str = "ok",
+                job_id: str = None, error: str = None, external: bool = False, **attrs) -> None:
+    """완료된 구간 1개를 메트릭과 trace.jsonl에 기록한다.
+
+    external: 봇 밖의 프로세스 — 히스토그램 대신 EXTERNAL_TRACE에 남겨 봇이 합치게 한다
+    """
+    record = {"ts": round(start, 3), "span": name, "duration_s": round(duration, 4), "status": status}
+    if job_id:
+        record["job_id"] = job_id
+    if error:
+        record["error"] = error[:500]
+    record.update(attrs)
+
+    if external:
+        _append_external(record)
+    else:
+        observe(name, duration, status)
+    if job_id:
+        job_dir = os.path.join(JOBS_DIR, os.path.basename(job_id))
+        if os.path.isdir(job_dir):
+            _append_jsonl(os.path.join(job_dir, TRACE_FILE), record)
+
+
+class span:
+    """구간 측정 컨텍스트 매니저. 예외가 나면 status="error"로 기록하고 예외는 그대로 전파."""
+
+    def __init__(self, name: str, job_id: str = None, external: bool = False, **attrs):
+        self.name = name
+        self.job_id = job_id
+        self.external = external
+        self.attrs = attrs
+        self.status = "ok"  # 예외 없이 실패한 경우 호출 측에서 "error"로 바꿀 수 있음
+
+    def __enter__(self):
+        self._wall = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        error = None
+        if exc_type is not None:
+            # 취소 또는 소비자가 async generator를 닫은 경우
+            cancelled = issubclass(exc_type, (asyncio.CancelledError, GeneratorExit))
+            self.status = "cancelled" if cancelled else "error"
+            error = f"{exc_type.__name__}: {exc}"
+        record_span(self.name, self._wall, time.perf_counter() - self._t0, self.status,
+                    self.job_id, error, self.external, **self.attrs)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+# ── 다른 프로세스의 span·카운터 합치기 ──
+
+def ingest_external(path: str = EXTERNAL_TRACE) -> int:
+    """EXTERNAL_TRACE에 새로 추가된 span·카운터를 메트릭에 반영하고 건수를 반환."""
+    global _external_offset
+    if not os.path.exists(path):
+        return 0
+    size = os.path.getsize(path)
+    if size < _external_offset:
+        _external_offset = 0  # 파일이 새로 만들어짐
+    if size < EXTERNAL_TRACE_MAX_BYTES:
+        return _ingest_from(path)
+    # 돌린 뒤에도 기존 파일에 덧붙이던 줄까지 읽고, 새 파일은 처음부터 읽는다
+    rotated = f"{path}.1"
+    os.replace(path, rotated)
+    n = _ingest_from(rotated)
+    _external_offset = 0
+    return n
+
+
+def _ingest_from(path: str) -> int:
+    global _external_offset
+    n = 0
+    with open(path, "rb") as f:
+        f.seek(_external_offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # 쓰는 중인 줄은 다음에
+            _external_offset += len(line)
+            try:
+                rec = json.loads(line)
+                if "counter" in rec:
+                    _add_counter(rec["counter"], float(rec["value"]), rec.get("labels", {}))
+                else:
+                    observe(rec["span"], float(rec["duration_s"]), rec.get("status", "ok"))
+                n += 1
+            except (ValueError, KeyError):
+                continue
+    return n
+
+
+def skip_external(path: str = EXTERNAL_TRACE) -> None:
+    """지금까지 쌓인 EXTERNAL_TRACE는 건너뛴다 (이전 실행의 span을 새 프로세스 메트릭에 다시 합치지 않도록)."""
+    global _external_offset
+    _external_offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# ── Prometheus 텍스트 형식 ──
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def render_metrics() -> str:
+    ingest_external()
+    out = [
+        "# HELP meeting2deck_span_seconds 구간별 소요 시간",
+        "# TYPE meeting2deck_span_seconds histogram",
+    ]
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+    for (name, status), h in sorted(histograms.items()):
+        base = [("span", name), ("status", status)]
+        for bound, n in zip(BUCKETS, h):
+            out.append(f"meeting2deck_span_seconds_bucket{_fmt_labels(base + [('le', bound)])} {n}")
+        out.append(f"meeting2deck_span_seconds_bucket{_fmt_labels(base + [('le', '+Inf')])} {h[-1]}")
+        out.append(f"meeting2deck_span_seconds_sum{_fmt_labels(base)} {h[-2]:.6f}")
+        out.append(f"meeting2deck_span_seconds_count{_fmt_labels(base)} {h[-1]}")
+
+    typed = set()
+    for (name, labels), value in sorted(counters.items()):
+        metric = f"meeting2deck_{name}_total"
+        if metric not in typed:
+            out.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        out.append(f"{metric}{_fmt_labels(labels)} {value}")
+
+    for name, (help_text, fn) in sorted(_gauges.items()):
+        try:
+            value = fn()
+        except Exception as e:
+            logger.debug(f"gauge {name} 조회 실패: {e}")
+            continue
+        metric = f"meeting2deck_{name}"
+        if help_text:
+            out.append(f"# HELP {metric} {help_text}")
+        out.append(f"# TYPE {metric} gauge")
+        out.append(f"{metric} {value}")
+    return "\n".join(out) + "\n"
+
+
+# ── HTTP 엔드포인트 ──
+
+async def _handle(reader, writer):
+    try:
+        request = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # 헤더는 무시
+        parts = request.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            body = render_metrics().encode("utf-8")
+            head = "HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+        else:
+            body = b"not found\n"
+            head = "HTTP/1.1 404 Not Found\r\nContent-Type: text/plain\r\n"
+        writer.write(f"{head}Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = METRICS_HOST, port: int = METRICS_PORT):
+    """GET /metrics 엔드포인트를 연다. port가 0이면 None."""
+    if not port:
+        return None
+    skip_external()
+    server = await asyncio.start_server(_handle, host, port)
+    logger.info(f"메트릭 엔드포인트: http://{host}:{port}/metrics")
+    return server
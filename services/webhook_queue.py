@@ -0,0 +1,190 @@
+"""Make.com 웹훅 전송 대기열 (디스크 보관 + 재시도 + dead-letter).
+
+웹훅 요청은 먼저 QUEUE_DIR/pending/<id>.json에 기록한 뒤 바로 한 번 보내 본다.
+성공하면 파일을 지우고, 429/5xx/네트워크 오류면 지수 백오프로 다음 시도 시각을 적어 둔 채
+백그라운드 워커가 재시도한다. 봇이 재시작돼도 pending 파일이 남아 있으므로 메일이 사라지지 않는다.
+
+재시도할 수 없는 응답(그 밖의 4xx)이거나 MAX_ATTEMPTS번 실패하면 QUEUE_DIR/dead/로 옮긴다.
+dead 항목은 pending/으로 다시 옮기면 다음 워커 주기에 재전송된다.
+
+HTTP 세션은 호출 측(봇 cog)이 소유한 aiohttp.ClientSession을 받아 연결을 재사용한다.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+import logging
+
+import aiohttp
+
+from services import telemetry
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUEUE_DIR = os.path.join(PROJECT_DIR, "output", "webhook_queue")
+
+MAX_ATTEMPTS = int(os.getenv("MEETING2DECK_WEBHOOK_MAX_ATTEMPTS", "8"))
+REQUEST_TIMEOUT = float(os.getenv("MEETING2DECK_WEBHOOK_TIMEOUT", "30"))
+BACKOFF_BASE = 15.0  # 초 — 상한 15s, 30s, 1m, 2m, ... (지터 포함)
+BACKOFF_MAX = 3600.0
+IDLE_POLL = 60.0  # 대기 항목이 없을 때 pending/ 디렉토리를 다시 훑는 주기 (수동 재투입 대비)
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def backoff_delay(attempt: int) -> float:
+    return random.uniform(BACKOFF_BASE / 2, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class WebhookQueue:
+    """디스크에 보관되는 웹훅 전송 대기열.
+
+    사용:
+        queue = WebhookQueue(url, session)
+        queue.start()
+        status = await queue.deliver(payload, job_id)  # "sent" | "queued" | "dead"
+        await queue.stop()
+    """
+
+    def __init__(self, url: str, session: aiohttp.ClientSession, queue_dir: str = QUEUE_DIR):
+        self.url = url
+        self.session = session
+        self.pending_dir = os.path.join(queue_dir, "pending")
+        self.dead_dir = os.path.join(queue_dir, "dead")
+        os.makedirs(self.pending_dir, exist_ok=True)
+        os.makedirs(self.dead_dir, exist_ok=True)
+        self._inflight = set()  # 전송 중인 항목 id (deliver와 워커가 같은 항목을 동시에 보내지 않게)
+        self._wakeup = asyncio.Event()
+        self._worker = None
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for name in os.listdir(self.pending_dir) if name.endswith(".json"))
+
+    def start(self):
+        """재시도 워커 시작. 이전 실행에서 남은 pending 항목도 이어서 보낸다."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name="webhook-retry")
+            left = self.pending
+            if left:
+                logger.info(f"웹훅 대기열: 이전 실행에서 남은 {left}건 재전송 예정")
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def deliver(self, payload: dict, job_id: str = "") -> str:
+        """payload를 대기열에 기록하고 즉시 한 번 전송한다.
+
+        Returns:
+            "sent": 전송 성공 / "queued": 실패했지만 백그라운드에서 재시도 / "dead": 재시도 불가
+        """
+        item = {
+            "id": f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}",
+            "job_id": job_id,
+            "payload": payload,
+            "attempts": 0,
+            "created_at": time.time(),
+            "next_attempt_at": 0,
+            "last_error": None,
+        }
+        _write_json(self._path(item["id"]), item)
+        return await self._attempt(item)
+
+    def _path(self, item_id: str) -> str:
+        return os.path.join(self.pending_dir, f"{item_id}.json")
+
+    async def _post(self, payload: dict):
+        """(성공 여부, 재시도 가능 여부, 오류 메시지)."""
+        try:
+            async with self.session.post(
+                self.url, json=payload, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as resp:
+                if 200 <= resp.status < 300:
+                    return True, False, None
+                text = (await resp.text())[:200]
+                return False, resp.status in RETRYABLE_STATUS, f"HTTP {resp.status}: {text}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return False, True, f"{type(e).__name__}: {e}"
+
+    async def _attempt(self, item: dict) -> str:
+        item_id, job_id = item["id"], item.get("job_id", "")
+        self._inflight.add(item_id)
+        try:
+            ok, retryable, error = await self._post(item["payload"])
+            item["attempts"] += 1
+            if ok:
+                os.remove(self._path(item_id))
+                if item["attempts"] > 1:
+                    logger.info(f"[{job_id}] Make.com 웹훅 재전송 성공 ({item['attempts']}번째 시도)")
+                else:
+                    logger.info(f"[{job_id}] Make.com 웹훅 호출 성공")
+                telemetry.count("webhook_deliveries", result="sent")
+                return "sent"
+
+            item["last_error"] = error
+            if not retryable or item["attempts"] >= MAX_ATTEMPTS:
+                _write_json(os.path.join(self.dead_dir, f"{item_id}.json"), item)
+                os.remove(self._path(item_id))
+                logger.error(f"[{job_id}] Make.com 웹훅 전송 포기 ({item['attempts']}회): {error} "
+                             f"→ {self.dead_dir}")
+                telemetry.count("webhook_deliveries", result="dead")
+                return "dead"
+
+            delay = backoff_delay(item["attempts"] - 1)
+            item["next_attempt_at"] = time.time() + delay
+            _write_json(self._path(item_id), item)
+            logger.warning(f"[{job_id}] Make.com 웹훅 실패: {error} — {delay:.0f}초 후 재시도 "
+                           f"({item['attempts']}/{MAX_ATTEMPTS})")
+            telemetry.count("webhook_deliveries", result="retry")
+            self._wakeup.set()
+            return "queued"
+        finally:
+            self._inflight.discard(item_id)
+
+    def _load_pending(self) -> list:
+        items = []
+        for name in sorted(os.listdir(self.pending_dir)):
+            if not name.endswith(".json") or name[:-5] in self._inflight:
+                continue
+            try:
+                with open(os.path.join(self.pending_dir, name), "r", encoding="utf-8") as f:
+                    items.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"웹훅 대기열 항목을 읽을 수 없음 ({name}): {e}")
+        return items
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()  # 훑는 도중 새로 실패한 항목이 생기면 바로 다시 훑는다
+            now = time.time()
+            wait = IDLE_POLL
+            for item in self._load_pending():
+                due = item.get("next_attempt_at", 0)
+                if due <= now:
+                    try:
+                        await self._attempt(item)
+                    except OSError as e:
+                        logger.error(f"웹훅 대기열 항목 처리 실패 ({item.get('id')}): {e}")
+                else:
+                    wait = min(wait, due - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(wait, 0.1))
+            except asyncio.TimeoutError:
+                pass
@@ -37,14 +37,37 @@ Claude CLI 에이전트가 이 모듈을 import하여 컨설팅 수준의 PPTX
         submessage="차세대 컨택센터의 새로운 기준을 만들겠습니다."
     )
     deck.save("output/slides.pptx")
+
+JSON 스펙으로 렌더링 (deck_spec.py 형식, Slides MCP build_deck_from_json과 동일):
+    python slide_template.py output/slides.json output/slides.pptx
+
+    deck = DeckBuilder.from_spec(spec_dict)
+    render_spec("output/slides.json", "output/slides.pptx")
+
+    # 수정 요청: 이전 덱에서 바뀐 슬라이드만 다시 렌더링
+    deck, changed = DeckBuilder.from_previous("prev/slides.pptx", prev_spec, new_spec)
 """
 
 from pptx import Presentation
 from pptx.util import Pt, Emu
 from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from copy import deepcopy
+from functools import lru_cache
+from lxml import etree
+from xml.sax.saxutils import escape
+import json
 import os
+import re
+import sys
+
+from deck_spec import FOOTER_TYPES, changed_slides, check_spec, normalize_type
+from graph_layout import layered_layout, parse_nodes
+from text_fit import LINE_SPACING, fit_paragraphs, fit_rows, row_height
 
 
 def _rgb(h):
@@ -53,6 +76,72 @@ def _rgb(h):
     return RGBColor(int(h[:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
 
+# ── 덱 공통 스타일 파트 (테마 글꼴, 표 스타일) ──
+# 입력 blob이 같으면 결과도 같으므로 프로세스 안에서 한 번만 만든다.
+
+@lru_cache(maxsize=8)
+def _themed(blob, font):
+    """테마 본문/제목 글꼴(latin)을 font로 바꾼 theme XML."""
+    root = etree.fromstring(blob)
+    for latin in root.iterfind('.//a:fontScheme/*/a:latin', {'a': root.nsmap['a']}):
+        latin.set('typeface', font)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _tc_fill(c):
+    return f'<a:fill><a:solidFill><a:srgbClr val="{c}"/></a:solidFill></a:fill>'
+
+
+def _tc_text(c, bold=False):
+    b = ' b="on"' if bold else ''
+    return (f'<a:tcTxStyle{b}><a:fontRef idx="minor"><a:prstClr val="black"/></a:fontRef>'
+            f'<a:srgbClr val="{c}"/></a:tcTxStyle>')
+
+
+def _tc_line(edge, c, w=12700):
+    return (f'<a:{edge}><a:ln w="{w}" cmpd="sng"><a:solidFill><a:srgbClr val="{c}"/>'
+            f'</a:solidFill></a:ln></a:{edge}>')
+
+
+_CTRL = re.compile(r"([\x00-\x08\x0B-\x1F])")  # python-pptx와 같은 제어 문자 이스케이프 (_xHHHH_)
+
+
+def _cell_xml(text, rpr, ppr=''):
+    """표 셀 a:tc XML. cell.text와 같이 \n은 문단, \v는 줄바꿈(a:br)으로 나눈다."""
+    paras = []
+    for line in str(text).split('\n'):
+        runs = []
+        for k, part in enumerate(line.split('\v')):
+            if k:
+                runs.append('<a:br/>')
+            if part:
+                part = escape(_CTRL.sub(lambda m: '_x%04X_' % ord(m.group(1)), part))
+                runs.append(f'<a:r>{rpr}<a:t>{part}</a:t></a:r>')
+        paras.append(f'<a:p>{ppr}{"".join(runs)}</a:p>')
+    return f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{"".join(paras)}</a:txBody><a:tcPr/></a:tc>'
+
+
+@lru_cache(maxsize=8)
+def _with_table_style(blob, style_id, accent, card, band, text, header_text):
+    """tableStyles.xml에 덱 표 스타일(헤더 행 + 줄무늬 행)을 추가한다.
+
+    Medium Style 2와 같은 흰 셀 경계선에 덱 팔레트 색을 입힌 스타일.
+    """
+    root = etree.fromstring(blob)
+    if root.find(f'a:tblStyle[@styleId="{style_id}"]', {'a': root.nsmap['a']}) is None:
+        edges = ''.join(_tc_line(e, card) for e in
+                        ('left', 'right', 'top', 'bottom', 'insideH', 'insideV'))
+        root.append(parse_xml(
+            f'<a:tblStyle {nsdecls("a")} styleId="{style_id}" styleName="Meeting2Deck">'
+            f'<a:wholeTbl>{_tc_text(text)}<a:tcStyle><a:tcBdr>{edges}</a:tcBdr>{_tc_fill(card)}</a:tcStyle></a:wholeTbl>'
+            f'<a:band1H><a:tcStyle><a:tcBdr/>{_tc_fill(card)}</a:tcStyle></a:band1H>'
+            f'<a:band2H><a:tcStyle><a:tcBdr/>{_tc_fill(band)}</a:tcStyle></a:band2H>'
+            f'<a:firstRow>{_tc_text(header_text, bold=True)}<a:tcStyle><a:tcBdr>'
+            f'{_tc_line("bottom", card, 38100)}</a:tcBdr>{_tc_fill(accent)}</a:tcStyle></a:firstRow>'
+            f'</a:tblStyle>'))
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
 class DeckBuilder:
     """컨설팅 수준의 프레젠테이션 빌더.
 
@@ -91,10 +180,27 @@ class DeckBuilder:
         '#0070C0', '#00B4D8', '#38A169', '#DD6B20', '#805AD5', '#E53E3E',
     ]]
 
-    FONT = 'Apple SD Gothic Neo'
+    FONT = 'Apple SD Gothic Neo'  # 테마 글꼴로 지정 (run마다 쓰지 않음, _install_styles)
+
+    # 표 스타일 ID — tableStyles.xml에 한 번 정의하고 표마다 ID로 참조한다
+    TABLE_STYLE = '{6A2DE050-1375-41F0-96EA-54F9E37B88DE}'
+
+    # ── 글자 크기 (pt) — 넘치면 MIN_*까지 줄이고, 그래도 넘치면 슬라이드를 나눔 ──
+    BULLET_PT = 12
+    TWO_COL_PT = 11
+    TABLE_PT = 10
+    MIN_BULLET_PT = 9
+    MIN_TABLE_PT = 8
+    CONT = '(계속)'  # 이어지는 슬라이드 제목 접미사
+    EMU_PT = 12700
+
+    # 콘텐츠 슬라이드 공통 요소(배경·상단 바·섹션·제목·푸터)를 첫 슬라이드에서
+    # XML 템플릿으로 떠 두고 이후에는 복제 + 텍스트 교체로 만든다.
+    # False면 매번 python-pptx 객체 모델로 생성 (벤치마크 비교용)
+    FAST_CHROME = True
 
     # ─────────────────────────────────────────────
-    def __init__(self, title, date='', org=''):
+    def __init__(self, title, date='', org='', templates=None):
         self.prs = Presentation()
         self.prs.slide_width = Emu(self.SW)
         self.prs.slide_height = Emu(self.SH)
@@ -102,6 +208,51 @@ class DeckBuilder:
         self.date = date
         self.org = org
         self._pg = 0
+        # 공통 요소 XML 템플릿 (key → (배경, [요소])). 텍스트는 복제 시 교체되므로
+        # templates로 같은 dict를 넘기면 여러 덱이 공유할 수 있다 (상주 렌더 워커)
+        self._tpl = {} if templates is None else templates
+        self._install_styles()
+
+    # ── 공통 스타일 ──
+
+    def _install_styles(self):
+        """덱 공통 글자 스타일을 프레젠테이션 수준에 한 번만 정의한다.
+
+        - 테마 글꼴 = FONT: 텍스트 기본값이 테마 글꼴을 따르므로 run마다 a:latin을 쓰지 않음
+        - 표 스타일(TABLE_STYLE): 셀마다 채우기·글자색·굵기를 쓰지 않음
+        이전 버전으로 만든 PPTX를 이어 쓸 때(from_previous)도 다시 호출해 맞춘다.
+        """
+        C = self.C
+        for rel in self.prs.part.rels.values():
+            part = rel.target_part
+            if rel.reltype == RT.THEME:
+                part._blob = _themed(part.blob, self.FONT)
+            elif rel.reltype == RT.TABLE_STYLES:
+                part._blob = _with_table_style(
+                    part.blob, self.TABLE_STYLE, str(C['accent']), str(C['card']),
+                    str(C['bg_light']), str(C['text2']), str(C['white']))
+
+    _PPR = {}  # (크기, 색, 굵게, 문단 뒤 간격) → 공유 a:lvl1pPr (복제해서 붙임)
+
+    def _list_style(self, tf, sz, c, b=False, space_after=0):
+        """텍스트 프레임의 1수준 문단 기본값(a:lstStyle)에 글자 스타일을 한 번 지정.
+
+        같은 스타일의 문단이 여러 개인 프레임(불릿 카드)은 이걸 쓰고 run에는 rPr를 두지 않는다.
+        """
+        key = (sz, str(c), b, space_after)
+        ppr = self._PPR.get(key)
+        if ppr is None:
+            spc = f'<a:spcAft><a:spcPts val="{int(space_after * 100)}"/></a:spcAft>' if space_after else ''
+            bold = ' b="1"' if b else ''
+            ppr = self._PPR[key] = parse_xml(
+                f'<a:lvl1pPr {nsdecls("a")}>{spc}<a:defRPr sz="{int(sz * 100)}"{bold}>'
+                f'<a:solidFill><a:srgbClr val="{c}"/></a:solidFill></a:defRPr></a:lvl1pPr>')
+        txBody = tf._txBody
+        lst = txBody.find(qn('a:lstStyle'))
+        if lst is None:
+            lst = txBody.makeelement(qn('a:lstStyle'), {})
+            txBody.bodyPr.addnext(lst)
+        lst.append(deepcopy(ppr))
 
     # ── 저수준 헬퍼 ──
 
@@ -148,8 +299,8 @@ class DeckBuilder:
         run = p.add_run()
         run.text = text
         run.font.size = Pt(sz)
-        run.font.bold = b
-        run.font.name = self.FONT
+        if b:
+            run.font.bold = True
         if c:
             run.font.color.rgb = c
         return sh
@@ -163,12 +314,15 @@ class DeckBuilder:
     def _footer(self, s):
         """하단 푸터 바 + 페이지 번호."""
         self._pg += 1
-        self._rect(s, 0, self.Y_FT, self.SW, self.H_FT, self.C['footer'])
-        self._txt(s, self.MX, self.Y_FT, Emu(4572000), self.H_FT,
-                  self.title, sz=8, c=self.C['text3'])
-        self._txt(s, Emu(self.SW - self.MX - 640080), self.Y_FT,
-                  Emu(640080), self.H_FT,
-                  str(self._pg), sz=8, c=self.C['text3'], align=PP_ALIGN.RIGHT)
+
+        def build(s):
+            self._rect(s, 0, self.Y_FT, self.SW, self.H_FT, self.C['footer'])
+            self._txt(s, self.MX, self.Y_FT, Emu(4572000), self.H_FT,
+                      self.title, sz=8, c=self.C['text3'])
+            self._txt(s, Emu(self.SW - self.MX - 640080), self.Y_FT,
+                      Emu(640080), self.H_FT,
+                      str(self._pg), sz=8, c=self.C['text3'], align=PP_ALIGN.RIGHT)
+        self._clone(s, 'footer', build, [self.title, str(self._pg)])
 
     def _sec(self, s, num, name):
         """섹션 인디케이터 (컬러 바 + 번호/이름)."""
@@ -191,6 +345,136 @@ class DeckBuilder:
         s.background.fill.solid()
         s.background.fill.fore_color.rgb = c
 
+    def _clone(self, s, key, build, texts):
+        """공통 요소를 템플릿 복제로 추가.
+
+        key 템플릿이 없으면 build(s)로 만든 뒤 새로 생긴 배경/도형을 템플릿으로
+        저장하고, 있으면 복제해 붙인 다음 a:t 노드를 순서대로 texts로 교체한다.
+        """
+        tree = s.shapes._spTree
+        tpl = self._tpl.get(key) if self.FAST_CHROME else None
+        if tpl is None:
+            n = len(tree)
+            had_bg = s._element.cSld.bg is not None
+            build(s)
+            if self.FAST_CHROME:
+                bg = None if had_bg else s._element.cSld.bg
+                self._tpl[key] = (deepcopy(bg) if bg is not None else None,
+                                  [deepcopy(el) for el in tree[n:]])
+            return
+
+        bg, elements = tpl
+        if bg is not None:
+            s._element.cSld.insert(0, deepcopy(bg))  # p:bg는 p:cSld의 첫 자식
+        next_id = s.shapes._next_shape_id
+        nodes = []
+        for el in elements:
+            el = deepcopy(el)
+            nv = el.find('.//' + qn('p:cNvPr'))
+            nv.set('id', str(next_id))
+            nv.set('name', f"{nv.get('name').rsplit(' ', 1)[0]} {next_id - 1}")  # python-pptx 명명 규칙
+            next_id += 1
+            tree.insert_element_before(el, 'p:extLst')
+            nodes.extend(el.iter(qn('a:t')))
+        for node, text in zip(nodes, texts):
+            node.text = _CTRL.sub(lambda m: '_x%04X_' % ord(m.group(1)), text)  # run.text와 같은 이스케이프
+
+    def _head(self, s, num, section, title):
+        """콘텐츠 슬라이드 상단 공통 요소 (배경, 악센트 바, 섹션, 제목)."""
+        def build(s):
+            self._bg(s, self.C['bg_light'])
+            self._bar(s)
+            self._sec(s, num, section)
+            self._ttl(s, title)
+        self._clone(s, 'head', build, [f"{num}  {section}", title])
+
+    # ── 텍스트 맞춤 (text_fit) ──
+
+    @classmethod
+    def _body_top(cls, description):
+        """본문 카드 시작 y (설명 문구가 있으면 그 아래)."""
+        return cls.Y_DESC + Emu(457200) if description else cls.Y_TTL + Emu(594360)
+
+    @classmethod
+    def _body_height_pt(cls, description, padding):
+        """본문 카드 안쪽 높이 (pt). padding: 카드 위아래 여백 합 (EMU)."""
+        cy = cls._body_top(description)
+        return (cls.Y_FT - cy - Emu(137160) - padding) / cls.EMU_PT
+
+    @classmethod
+    def _fit_bullets(cls, bullets, description=''):
+        """add_content_slide 카드에 맞춘 (글자 크기, [페이지별 불릿])."""
+        width = (cls.CW - 2 * 274320) / cls.EMU_PT
+        texts = [f"•  {b}" for b in bullets]
+        size, pages = fit_paragraphs(
+            texts, width, cls._body_height_pt(description, 228600 + 45720),
+            cls.BULLET_PT, cls.MIN_BULLET_PT, space_after=10, font=cls.FONT,
+            next_height=cls._body_height_pt('', 228600 + 45720),
+        )
+        n = 0
+        out = []
+        for page in pages:  # 불릿 기호를 뗀 원문으로 되돌림
+            out.append(list(bullets[n:n + len(page)]))
+            n += len(page)
+        return size, out
+
+    @classmethod
+    def _fit_columns(cls, left, right, left_title='', right_title='', description=''):
+        """add_two_column_slide 두 카드에 맞춘 (글자 크기, [페이지별 (왼쪽, 오른쪽)])."""
+        width = ((cls.CW - 228600) // 2 - 2 * 182880) / cls.EMU_PT
+        fits = []
+        for col_title, bullets in ((left_title, left), (right_title, right)):
+            head = 14 * LINE_SPACING + 12 if col_title else 0
+            height = cls._body_height_pt(description, 137160 + 45720) - head
+            next_height = cls._body_height_pt('', 137160 + 45720) - head
+            texts = [f"•  {b}" for b in bullets]
+            fits.append((texts, width, height, next_height))
+
+        size = cls.TWO_COL_PT
+        for texts, width, height, next_height in fits:
+            s, pages = fit_paragraphs(texts, width, height, cls.TWO_COL_PT, cls.MIN_BULLET_PT,
+                                      space_after=8, font=cls.FONT, next_height=next_height)
+            if len(pages) > 1:
+                break
+            size = min(size, s)
+        else:
+            return size, [(list(left), list(right))]
+
+        # 어느 한 열이라도 넘치면 두 열 모두 기본 크기로 나눔
+        split = []
+        for (texts, width, height, next_height), bullets in zip(fits, (left, right)):
+            _, pages = fit_paragraphs(texts, width, height, cls.TWO_COL_PT, cls.TWO_COL_PT,
+                                      space_after=8, font=cls.FONT, next_height=next_height)
+            n, cols = 0, []
+            for page in pages:
+                cols.append(list(bullets[n:n + len(page)]))
+                n += len(page)
+            split.append(cols)
+        n_pages = max(len(split[0]), len(split[1]))
+        pad = [[] for _ in range(n_pages)]
+        return cls.TWO_COL_PT, list(zip((split[0] + pad)[:n_pages], (split[1] + pad)[:n_pages]))
+
+    @classmethod
+    def _fit_table(cls, headers, rows):
+        """add_table_slide 영역에 맞춘 (글자 크기, [페이지별 행])."""
+        th = (cls.Y_FT - cls.Y_TTL - 594360 - 137160) / cls.EMU_PT
+        cw = cls.CW / cls.EMU_PT / max(len(headers), 1)
+        return fit_rows(headers, rows, cw, th, cls.TABLE_PT, cls.MIN_TABLE_PT, font=cls.FONT)
+
+    @classmethod
+    def page_count(cls, sl):
+        """JSON 스펙 슬라이드 1장이 렌더링되는 PPTX 슬라이드 수 (넘침 분할 포함)."""
+        t = normalize_type(sl.get('type'))
+        if t == 'bullet':
+            return len(cls._fit_bullets(sl['bullets'], sl.get('description', ''))[1])
+        if t == 'two_column':
+            return len(cls._fit_columns(sl['left_bullets'], sl['right_bullets'],
+                                        sl.get('left_title', ''), sl.get('right_title', ''),
+                                        sl.get('description', ''))[1])
+        if t == 'table':
+            return len(cls._fit_table(sl['headers'], sl['rows'])[1])
+        return 1
+
     # ════════════════════════════════════════════════
     #  슬라이드 타입
     # ════════════════════════════════════════════════
@@ -230,6 +514,9 @@ class DeckBuilder:
     def add_content_slide(self, num, section, title, bullets, description=''):
         """불릿 포인트 슬라이드 — 흰 카드 위에 불릿 리스트.
 
+        카드에 다 들어가지 않으면 글자 크기를 MIN_BULLET_PT까지 줄이고, 그래도
+        넘치면 "(계속)" 슬라이드로 나눈다 (_fit_bullets).
+
         Args:
             num: 섹션 번호 (예: "01")
             section: 섹션 이름 (예: "Executive Summary")
@@ -237,16 +524,21 @@ class DeckBuilder:
             bullets: 불릿 텍스트 리스트
             description: (선택) 제목 아래 설명 문구
         """
+        size, pages = self._fit_bullets(bullets, description)
+        for k, page in enumerate(pages):
+            if k == 0:
+                self._content_page(num, section, title, page, description, size)
+            else:
+                self._content_page(num, section, f"{title} {self.CONT}", page, '', size)
+
+    def _content_page(self, num, section, title, bullets, description, size):
         s = self._slide()
-        self._bg(s, self.C['bg_light'])
-        self._bar(s)
-        self._sec(s, num, section)
-        self._ttl(s, title)
+        self._head(s, num, section, title)
         if description:
             self._desc(s, description)
 
         # 카드 영역 계산
-        cy = self.Y_DESC + Emu(457200) if description else self.Y_TTL + Emu(594360)
+        cy = self._body_top(description)
         ch = self.Y_FT - cy - Emu(137160)
         card = self._rrect(s, self.MX, cy, Emu(self.CW), ch, self.C['card'])
 
@@ -256,16 +548,12 @@ class DeckBuilder:
         tf.margin_left = Emu(274320)
         tf.margin_right = Emu(274320)
         tf.margin_top = Emu(228600)
+        self._list_style(tf, size, self.C['text2'], space_after=10)
+        tf.paragraphs[0].alignment = PP_ALIGN.LEFT  # 도형 기본 문단은 가운데 정렬
 
         for i, bullet in enumerate(bullets):
             p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-            p.space_after = Pt(10)
-            p.alignment = PP_ALIGN.LEFT
-            run = p.add_run()
-            run.text = f"•  {bullet}"
-            run.font.size = Pt(12)
-            run.font.name = self.FONT
-            run.font.color.rgb = self.C['text2']
+            p.add_run().text = f"•  {bullet}"
 
         self._footer(s)
 
@@ -277,10 +565,7 @@ class DeckBuilder:
                 icon은 카드 원 안에 표시할 텍스트 (숫자, 이모지, 약어 등)
         """
         s = self._slide()
-        self._bg(s, self.C['bg_light'])
-        self._bar(s)
-        self._sec(s, num, section)
-        self._ttl(s, title)
+        self._head(s, num, section, title)
         if description:
             self._desc(s, description)
 
@@ -317,7 +602,6 @@ class DeckBuilder:
             cr.font.size = Pt(16)
             cr.font.color.rgb = self.C['white']
             cr.font.bold = True
-            cr.font.name = self.FONT
 
             # 카드 제목
             self._txt(s, ox, oy + d + Emu(137160), cw - Emu(365760), Emu(320040),
@@ -335,22 +619,32 @@ class DeckBuilder:
                              left_title='', right_title='', description=''):
         """2열 슬라이드 — 좌우 카드에 각각 불릿 리스트.
 
+        넘치면 두 열에 같은 글자 크기를 적용해 줄이고, 그래도 넘치면 "(계속)" 슬라이드로 나눈다.
+
         Args:
             left_bullets: 왼쪽 카드 불릿 리스트
             right_bullets: 오른쪽 카드 불릿 리스트
             left_title: 왼쪽 카드 소제목
             right_title: 오른쪽 카드 소제목
         """
+        size, pages = self._fit_columns(left_bullets, right_bullets, left_title, right_title, description)
+        for k, (left, right) in enumerate(pages):
+            if k == 0:
+                self._two_column_page(num, section, title, left, right,
+                                      left_title, right_title, description, size)
+            else:
+                self._two_column_page(num, section, f"{title} {self.CONT}", left, right,
+                                      left_title, right_title, '', size)
+
+    def _two_column_page(self, num, section, title, left_bullets, right_bullets,
+                         left_title, right_title, description, size):
         s = self._slide()
-        self._bg(s, self.C['bg_light'])
-        self._bar(s)
-        self._sec(s, num, section)
-        self._ttl(s, title)
+        self._head(s, num, section, title)
         if description:
             self._desc(s, description)
 
         gap = 228600
-        cy = self.Y_DESC + Emu(457200) if description else self.Y_TTL + Emu(594360)
+        cy = self._body_top(description)
         ch = self.Y_FT - cy - Emu(137160)
         cw = (self.CW - gap) // 2
 
@@ -365,6 +659,7 @@ class DeckBuilder:
             tf.margin_left = Emu(182880)
             tf.margin_right = Emu(182880)
             tf.margin_top = Emu(137160)
+            self._list_style(tf, size, self.C['text2'], space_after=8)
 
             # 카드 소제목
             if col_title:
@@ -374,7 +669,6 @@ class DeckBuilder:
                 r.text = col_title
                 r.font.size = Pt(14)
                 r.font.bold = True
-                r.font.name = self.FONT
                 r.font.color.rgb = self.C['text']
 
             for i, bullet in enumerate(bullets):
@@ -382,82 +676,95 @@ class DeckBuilder:
                     p = tf.paragraphs[0]
                 else:
                     p = tf.add_paragraph()
-                p.space_after = Pt(8)
-                r = p.add_run()
-                r.text = f"•  {bullet}"
-                r.font.size = Pt(11)
-                r.font.name = self.FONT
-                r.font.color.rgb = self.C['text2']
+                p.add_run().text = f"•  {bullet}"
 
         self._footer(s)
 
     def add_table_slide(self, num, section, title, headers, rows):
         """표 슬라이드 — 헤더 행(파랑) + 데이터 행(흰색).
 
+        행이 많거나 셀 내용이 길어 넘치면 글자 크기를 MIN_TABLE_PT까지 줄이고,
+        그래도 넘치면 헤더를 반복한 "(계속)" 슬라이드로 행을 나눈다.
+
         Args:
             headers: 열 헤더 리스트
             rows: 행 데이터 리스트 (각 행은 리스트)
         """
+        size, pages = self._fit_table(headers, rows)
+        for k, page in enumerate(pages):
+            self._table_page(num, section, title if k == 0 else f"{title} {self.CONT}",
+                             headers, page, size)
+
+    def _table_page(self, num, section, title, headers, rows, size):
         s = self._slide()
-        self._bg(s, self.C['bg_light'])
-        self._bar(s)
-        self._sec(s, num, section)
-        self._ttl(s, title)
+        self._head(s, num, section, title)
 
         ty = self.Y_TTL + Emu(594360)
         th = self.Y_FT - ty - Emu(137160)
         nr, nc = len(rows) + 1, len(headers)
 
-        tbl_sh = s.shapes.add_table(nr, nc, self.MX, ty, Emu(self.CW), th)
-        tbl = tbl_sh.table
-
-        # 헤더 행
-        for j, h in enumerate(headers):
-            cell = tbl.cell(0, j)
-            cell.text = h
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = self.C['accent']
-            for p in cell.text_frame.paragraphs:
-                p.alignment = PP_ALIGN.CENTER
-                for r in p.runs:
-                    r.font.size = Pt(10)
-                    r.font.bold = True
-                    r.font.color.rgb = self.C['white']
-                    r.font.name = self.FONT
-
-        # 데이터 행 (줄무늬)
-        for i, row in enumerate(rows):
-            bg = self.C['card'] if i % 2 == 0 else self.C['bg_light']
-            for j, v in enumerate(row):
-                cell = tbl.cell(i + 1, j)
-                cell.text = str(v)
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = bg
-                for p in cell.text_frame.paragraphs:
-                    for r in p.runs:
-                        r.font.size = Pt(10)
-                        r.font.name = self.FONT
-                        r.font.color.rgb = self.C['text2']
+        # 행마다 필요한 높이가 균등 분배 높이를 넘으면 내용에 맞춰 나누고 남는 높이를 고르게 더함
+        cw_pt = self.CW / self.EMU_PT / max(nc, 1)
+        heights = [row_height(r, cw_pt, size, self.FONT) for r in [headers] + list(rows)]
+        if max(heights) * nr > th / self.EMU_PT:
+            extra = max(th / self.EMU_PT - sum(heights), 0) / nr
+            row_h = [int((h + extra) * self.EMU_PT) for h in heights]
+        else:
+            row_h = [th // nr] * (nr - 1) + [th - (nr - 1) * (th // nr)]
+
+        tbl_sh = s.shapes.add_table(1, nc, self.MX, ty, Emu(self.CW), th)
+        old = tbl_sh._element.graphic.graphicData.tbl
+        old.getparent().replace(old, self._table_xml(headers, rows, row_h, size))
 
         self._footer(s)
 
-    def add_diagram_slide(self, num, section, title, nodes):
-        """아키텍처/플로우 다이어그램 슬라이드 — 노드를 수평 배치하고 화살표 연결.
+    def _table_xml(self, headers, rows, row_heights, size):
+        """a:tbl 요소를 행 데이터에서 한 번에 만든다.
+
+        셀마다 python-pptx 프록시(tbl.cell, cell.text, run.font)를 거치지 않고 XML 문자열을
+        이어 붙인 뒤 한 번 파싱한다. 헤더 행·줄무늬·글자색은 표 스타일(TABLE_STYLE)의
+        firstRow/bandRow가 정하므로 셀에는 글자 크기만 쓴다.
+        """
+        nc = len(headers)
+        col_w = self.CW // nc
+        grid = [col_w] * (nc - 1) + [self.CW - (nc - 1) * col_w]
+        rpr = f'<a:rPr sz="{int(size * 100)}"/>'
+        out = [f'<a:tbl {nsdecls("a")}><a:tblPr firstRow="1" bandRow="1">'
+               f'<a:tableStyleId>{self.TABLE_STYLE}</a:tableStyleId></a:tblPr><a:tblGrid>']
+        out.extend(f'<a:gridCol w="{w}"/>' for w in grid)
+        out.append('</a:tblGrid>')
+        for r, (cells, h) in enumerate(zip([headers] + list(rows), row_heights)):
+            ppr = '<a:pPr algn="ctr"/>' if r == 0 else ''
+            cells = list(cells[:nc]) + [''] * (nc - len(cells))
+            out.append(f'<a:tr h="{h}">')
+            out.extend(_cell_xml(c, rpr, ppr) for c in cells)
+            out.append('</a:tr>')
+        out.append('</a:tbl>')
+        return parse_xml(''.join(out))
+
+    def add_diagram_slide(self, num, section, title, nodes, edges=None, layout_hint=''):
+        """아키텍처/플로우 다이어그램 슬라이드.
+
+        edges가 없으면 노드를 한 줄로 놓고 화살표로 잇는다. edges가 있으면
+        graph_layout으로 계층 배치해 격자에 놓고 꺾인 연결선으로 잇는다 (분기·합류 가능).
 
         Args:
             nodes: [{"name": "PBX", "desc": "전화 교환기"}, ...]
                 선택적 키: "icon" (원 안 텍스트, 기본값은 name 첫 2글자)
+            edges: ["PBX->IVR", ["IVR", "CTI"], {"from": "CTI", "to": "Cloud", "label": "API"}, ...]
+            layout_hint: "top-down"/"vertical" 등이면 위→아래, 기본은 왼쪽→오른쪽
         """
         s = self._slide()
-        self._bg(s, self.C['bg_light'])
-        self._bar(s)
-        self._sec(s, num, section)
-        self._ttl(s, title)
+        self._head(s, num, section, title)
 
         n = len(nodes)
         if n == 0:
             self._footer(s)
             return
+        if edges:
+            self._graph(s, layered_layout(nodes, edges, layout_hint))
+            self._footer(s)
+            return
 
         ay = self.Y_TTL + Emu(594360)
         ah = self.Y_FT - ay - Emu(137160)
@@ -501,7 +808,6 @@ class DeckBuilder:
             cr.font.size = Pt(13)
             cr.font.color.rgb = self.C['white']
             cr.font.bold = True
-            cr.font.name = self.FONT
 
             # 이름
             self._txt(s, x + Emu(45720), by + Emu(685800),
@@ -523,6 +829,75 @@ class DeckBuilder:
 
         self._footer(s)
 
+    def _graph(self, s, layout):
+        """계층 배치 결과를 본문 영역 격자에 그린다."""
+        ay = self.Y_TTL + Emu(594360)
+        ah = self.Y_FT - ay - Emu(137160)
+        pos, bw, bh = layout.place(self.MX, ay, self.CW, ah)
+        boxes = [self._graph_node(s, Emu(x), Emu(y), Emu(bw), Emu(bh), nd,
+                                  self.ICON_C[layout.rank[i] % len(self.ICON_C)])
+                 for i, ((x, y), nd) in enumerate(zip(pos, layout.nodes))]
+
+        connectors = []
+        for u, v, label in layout.edges:
+            a, b = layout.sites(u, v)
+            c = s.shapes.add_connector(MSO_CONNECTOR.ELBOW, 0, 0, 0, 0)
+            c.begin_connect(boxes[u], a)
+            c.end_connect(boxes[v], b)
+            c.line.color.rgb = self.C['accent']
+            c.line.width = Pt(1.25)
+            ln = c.line._get_or_add_ln()
+            ln.append(ln.makeelement(qn('a:tailEnd'), {'type': 'triangle'}))
+            connectors.append(c._element)
+            if label:
+                mx = (c.begin_x + c.end_x) // 2
+                my = (c.begin_y + c.end_y) // 2
+                connectors.append(self._txt(s, Emu(mx - 457200), Emu(my - 228600), Emu(914400),
+                                            Emu(201168), label, sz=8, c=self.C['text2'],
+                                            align=PP_ALIGN.CENTER)._element)
+        # 연결선을 노드 카드 아래로
+        tree = s.shapes._spTree
+        first = tree.index(boxes[0]._element)
+        for k, el in enumerate(connectors):
+            tree.insert(first + k, el)
+
+    def _graph_node(self, s, x, y, bw, bh, nd, ic):
+        """계층 배치 노드 카드. 크기에 따라 아이콘/설명을 생략한다."""
+        card = self._rrect(s, x, y, bw, bh, self.C['card'])
+        self._rect(s, x + Emu(4572), y, bw - Emu(9144), Pt(4), ic)
+        name, desc = nd.get('name', ''), nd.get('desc', '')
+        name_sz = 13 if bw >= 1143000 else 11 if bw >= 685800 else 9
+        pad = Emu(45720)
+
+        if bh >= 1005840 and bw >= 914400:
+            d = Emu(365760)
+            circle = self._oval(s, x + (bw - d) // 2, y + Emu(137160), d, ic)
+            ctf = circle.text_frame
+            ctf.word_wrap = False
+            ctf.vertical_anchor = MSO_ANCHOR.MIDDLE
+            cp = ctf.paragraphs[0]
+            cp.alignment = PP_ALIGN.CENTER
+            cr = cp.add_run()
+            cr.text = nd.get('icon', name[:2])
+            cr.font.size = Pt(13)
+            cr.font.color.rgb = self.C['white']
+            cr.font.bold = True
+            top = y + Emu(548640)
+        elif bh >= 548640:
+            top = y + Emu(91440)
+        else:
+            self._txt(s, x + pad, y, bw - 2 * pad, bh, name, sz=name_sz, c=self.C['text'], b=True,
+                      align=PP_ALIGN.CENTER, va=MSO_ANCHOR.MIDDLE)
+            return card
+
+        self._txt(s, x + pad, top, bw - 2 * pad, Emu(274320),
+                  name, sz=name_sz, c=self.C['text'], b=True, align=PP_ALIGN.CENTER)
+        desc_h = y + bh - (top + Emu(274320)) - pad
+        if desc and desc_h > Emu(137160):
+            self._txt(s, x + pad, top + Emu(274320), bw - 2 * pad, desc_h,
+                      desc, sz=9 if bw >= 914400 else 8, c=self.C['text2'], align=PP_ALIGN.CENTER)
+        return card
+
     def add_closing_slide(self, message='Thank You', submessage=''):
         """마무리 슬라이드 — 어두운 배경, 감사 메시지."""
         s = self._slide()
@@ -556,3 +931,128 @@ class DeckBuilder:
         """PPTX 파일 저장."""
         os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
         self.prs.save(path)
+
+    # ── JSON 스펙 ──
+
+    @classmethod
+    def from_spec(cls, spec, templates=None):
+        """덱 JSON 스펙(dict)을 검증하고 슬라이드를 모두 추가한 DeckBuilder를 반환.
+
+        templates: 공통 요소 템플릿 공유용 dict (__init__ 참고)
+
+        Raises:
+            deck_spec.DeckSpecError: 스키마에 맞지 않는 스펙
+        """
+        check_spec(spec)
+        deck = cls(spec.get('deck_title', 'Meeting2Deck'),
+                   date=spec.get('date', ''), org=spec.get('org', ''), templates=templates)
+        for i, sl in enumerate(spec['slides']):
+            deck._add_spec_slide(cls._resolve(spec, sl), i)
+        return deck
+
+    @classmethod
+    def from_previous(cls, pptx_path, prev_spec, spec, templates=None):
+        """이전 덱(PPTX + 스펙)에서 바뀐 슬라이드만 다시 그린 DeckBuilder를 반환.
+
+        deck_spec.slide_hashes로 슬라이드를 비교해 달라진 슬라이드만 새로 렌더링하고
+        기존 PPTX의 해당 슬라이드(넘침 분할로 여러 장일 수 있음)와 교체한다.
+        남는 슬라이드는 삭제, 늘어난 슬라이드는 추가. PPTX 슬라이드 수가 이전 스펙과
+        맞지 않으면 전체를 다시 렌더링한다.
+
+        Returns:
+            (DeckBuilder, 다시 그린 스펙 슬라이드 인덱스 목록)
+        """
+        check_spec(spec)
+        prev_counts = [cls.page_count(cls._resolve(prev_spec, sl)) for sl in prev_spec.get('slides', [])]
+        counts = [cls.page_count(cls._resolve(spec, sl)) for sl in spec['slides']]
+        changed = changed_slides(prev_spec, spec, prev_counts, counts)
+        prs = Presentation(pptx_path)
+        if len(prs.slides) != sum(prev_counts):
+            return cls.from_spec(spec, templates=templates), list(range(len(spec['slides'])))
+
+        deck = cls(spec.get('deck_title', 'Meeting2Deck'),
+                   date=spec.get('date', ''), org=spec.get('org', ''), templates=templates)
+        deck.prs = prs
+        deck._install_styles()
+        ids = prs.slides._sldIdLst
+        todo = set(changed)
+        pos = 0  # 스펙 슬라이드 i가 시작하는 PPTX 슬라이드 위치 (앞쪽은 이미 새 스펙 기준)
+        pg = 0  # 슬라이드 직전까지의 푸터 수 (페이지 번호 기준)
+        for i, sl in enumerate(spec['slides']):
+            if i in todo:
+                deck._pg = pg
+                n = len(ids)
+                deck._add_spec_slide(cls._resolve(spec, sl), i)
+                new = list(ids)[n:]  # 새 슬라이드는 맨 뒤에 추가됨 → pos 위치로 이동
+                for el in new:
+                    ids.remove(el)
+                if i < len(prev_counts):
+                    for old in list(ids)[pos:pos + prev_counts[i]]:
+                        prs.part.drop_rel(old.rId)
+                        ids.remove(old)
+                for k, el in enumerate(new):
+                    ids.insert(pos + k, el)
+                # 다음 add_slide의 파트 이름(slideN.xml)이 겹치지 않도록 번호를 다시 매김
+                prs.part.rename_slide_parts([s.rId for s in ids])
+            pos += counts[i]
+            if normalize_type(sl.get('type')) in FOOTER_TYPES:
+                pg += counts[i]
+        for old in list(ids)[pos:]:
+            prs.part.drop_rel(old.rId)
+            ids.remove(old)
+        prs.part.rename_slide_parts([s.rId for s in ids])
+        return deck, changed
+
+    @staticmethod
+    def _resolve(spec, sl):
+        """덱 수준 기본값을 슬라이드에 채운다 (표지 부제 ← deck_subtitle)."""
+        if normalize_type(sl.get('type')) == 'title' and not sl.get('subtitle'):
+            sl = dict(sl, subtitle=spec.get('deck_subtitle', ''))
+        return sl
+
+    def _add_spec_slide(self, sl, i):
+        t = normalize_type(sl.get('type'))
+        num = f"{sl.get('slide_number', i + 1) - 1:02d}"
+        title = sl.get('title', '')
+        section = sl.get('section', title)
+        desc = sl.get('description', '')
+
+        if t == 'title':
+            self.add_title_slide(subtitle=sl.get('subtitle', ''), description=desc)
+        elif t == 'bullet':
+            self.add_content_slide(num, section, title, sl['bullets'], description=desc)
+        elif t == 'cards':
+            self.add_cards_slide(num, section, title, sl['cards'], description=desc)
+        elif t == 'two_column':
+            self.add_two_column_slide(num, section, title, sl['left_bullets'], sl['right_bullets'],
+                                      left_title=sl.get('left_title', ''),
+                                      right_title=sl.get('right_title', ''), description=desc)
+        elif t == 'table':
+            self.add_table_slide(num, section, title, sl['headers'], sl['rows'])
+        elif t == 'diagram':
+            # 노드는 문자열 또는 {"name", "desc", "icon"} 객체
+            ds = sl['diagram_spec']
+            self.add_diagram_slide(num, section, title, parse_nodes(ds.get('nodes', [])),
+                                   edges=ds.get('edges'), layout_hint=ds.get('layout_hint', ''))
+        elif t == 'closing':
+            self.add_closing_slide(message=sl.get('message', 'Thank You'),
+                                   submessage=sl.get('submessage', ''))
+
+
+def render_spec(spec_path, out_path=None):
+    """JSON 스펙 파일을 렌더링해 PPTX로 저장하고 저장 경로를 반환.
+
+    out_path 생략 시 스펙 파일과 같은 디렉토리의 slides.pptx.
+    """
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    out_path = out_path or os.path.join(os.path.dirname(os.path.abspath(spec_path)), 'slides.pptx')
+    DeckBuilder.from_spec(spec).save(out_path)
+    return out_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("사용법: python slide_template.py <slides.json> [slides.pptx]")
+        sys.exit(1)
+    print(render_spec(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None))
@@ -0,0 +1,217 @@
+"""슬라이드 텍스트 크기 측정 · 자동 맞춤.
+
+글꼴 파일 없이 글자 종류별 폭(em) 근사표로 줄바꿈과 높이를 계산한다.
+한글/한자/가나 등 CJK 전각 문자는 1em, 라틴 문자는 종류별 폭을 쓴다.
+넘침을 놓치지 않도록 폭은 실제 글꼴보다 약간 넉넉하게 잡았다.
+
+DeckBuilder가 불릿 카드·표가 영역을 넘는지 판단해 글자 크기를 줄이거나
+(fit_paragraphs / fit_rows) 이어지는 슬라이드로 나눌 때 사용한다.
+"""
+
+from functools import lru_cache
+
+# 줄 높이 = 글자 크기 × LINE_SPACING (PowerPoint 단일 줄 간격)
+LINE_SPACING = 1.2
+
+# 표 셀 기본 여백 (python-pptx/PowerPoint 기본값, pt)
+CELL_MARGIN_H = 7.2
+CELL_MARGIN_V = 3.6
+
+# 글꼴별 글자 폭 (em)
+FONT_METRICS = {
+    "Apple SD Gothic Neo": {
+        "cjk": 1.0, "upper": 0.68, "lower": 0.56, "digit": 0.6, "space": 0.28,
+        "narrow": 0.3, "wide": 0.92, "punct": 0.42, "other": 0.62,
+    },
+}
+DEFAULT_FONT = "Apple SD Gothic Neo"
+
+_NARROW = set("iIjlft.,:;'!|`()[]{}/\\-\"")
+_WIDE = set("mwMW@%&")
+
+
+def _is_cjk(cp):
+    return (0x1100 <= cp <= 0x11FF        # 한글 자모
+            or 0x2E80 <= cp <= 0x9FFF     # CJK 부수·기호·가나·한자
+            or 0xAC00 <= cp <= 0xD7AF     # 한글 음절
+            or 0xF900 <= cp <= 0xFAFF     # CJK 호환 한자
+            or 0xFF00 <= cp <= 0xFF60     # 전각 기호
+            or 0xFFE0 <= cp <= 0xFFE6)
+
+
+def _is_hangul(cp):
+    return 0xAC00 <= cp <= 0xD7AF or 0x1100 <= cp <= 0x11FF or 0x3130 <= cp <= 0x318F
+
+
+def _char_em(ch, m):
+    cp = ord(ch)
+    if _is_cjk(cp):
+        return m["cjk"]
+    if ch == " ":
+        return m["space"]
+    if ch in _NARROW:
+        return m["narrow"]
+    if ch in _WIDE:
+        return m["wide"]
+    if ch.isdigit():
+        return m["digit"]
+    if ch.isupper():
+        return m["upper"]
+    if ch.islower():
+        return m["lower"]
+    if cp < 0x80:
+        return m["punct"]
+    return m["other"]
+
+
+@lru_cache(maxsize=None)
+def _glyph_table(font):
+    """글꼴별 글자 → em 폭 캐시 (처음 나온 글자만 분류)."""
+    return {}
+
+
+def _em(ch, font):
+    table = _glyph_table(font)
+    w = table.get(ch)
+    if w is None:
+        w = table[ch] = _char_em(ch, FONT_METRICS.get(font, FONT_METRICS[DEFAULT_FONT]))
+    return w
+
+
+@lru_cache(maxsize=65536)
+def text_width(text, size, font=DEFAULT_FONT):
+    """한 줄로 놓았을 때 폭 (pt)."""
+    return sum(_em(ch, font) for ch in text) * size
+
+
+def _tokens(text):
+    """줄바꿈 단위로 나눈다: 공백, 단어(라틴·한글 어절), 한자/가나는 글자 단위."""
+    tokens = []
+    word = []
+    for ch in text:
+        cp = ord(ch)
+        if ch == " ":
+            if word:
+                tokens.append("".join(word))
+                word = []
+            tokens.append(" ")
+        elif _is_cjk(cp) and not _is_hangul(cp):
+            if word:
+                tokens.append("".join(word))
+                word = []
+            tokens.append(ch)
+        else:
+            word.append(ch)
+    if word:
+        tokens.append("".join(word))
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def wrap(text, width, size, font=DEFAULT_FONT):
+    """폭 width(pt)에 맞춰 줄바꿈한 줄 목록. 한 단어가 폭보다 길면 글자 단위로 자른다."""
+    lines = []
+    for para in text.split("\n"):
+        line, line_w, pending = "", 0.0, ""
+        for tok in _tokens(para):
+            if tok == " ":
+                if line:
+                    pending += " "
+                continue
+            tw = text_width(tok, size, font)
+            sw = text_width(pending, size, font) if pending else 0.0
+            if line_w + sw + tw <= width:
+                line += pending + tok
+                line_w += sw + tw
+            elif tw <= width:
+                lines.append(line)
+                line, line_w = tok, tw
+            else:
+                if line:
+                    line += pending
+                    line_w += sw
+                for ch in tok:  # 폭보다 긴 단어
+                    cw = _em(ch, font) * size
+                    if line and line_w + cw > width:
+                        lines.append(line)
+                        line, line_w = "", 0.0
+                    line += ch
+                    line_w += cw
+            pending = ""
+        lines.append(line)
+    return tuple(lines)
+
+
+def line_count(text, width, size, font=DEFAULT_FONT):
+    return len(wrap(text, width, size, font))
+
+
+def paragraphs_height(texts, width, size, space_after=0.0, font=DEFAULT_FONT):
+    """문단 목록을 쌓았을 때 높이 (pt)."""
+    lh = size * LINE_SPACING
+    return sum(line_count(t, width, size, font) * lh + space_after for t in texts)
+
+
+def fit_paragraphs(texts, width, height, size, min_size, space_after=0.0,
+                   font=DEFAULT_FONT, next_height=None):
+    """문단 목록을 width×height(pt) 영역에 맞춘다.
+
+    size부터 1pt씩 min_size까지 줄여 한 영역에 들어가면 (그 크기, [texts]).
+    min_size로도 넘치면 size 그대로 여러 페이지로 나눠 (size, [페이지별 texts]).
+    next_height: 두 번째 페이지부터의 영역 높이 (설명 문구가 빠지는 등, 기본 height)
+    """
+    texts = list(texts)
+    s = size
+    while s >= min_size:
+        if paragraphs_height(texts, width, s, space_after, font) <= height:
+            return s, [texts]
+        s -= 1
+
+    lh = size * LINE_SPACING
+    pages, cur, used, limit = [], [], 0.0, height
+    for t in texts:
+        h = line_count(t, width, size, font) * lh + space_after
+        if cur and used + h > limit:
+            pages.append(cur)
+            cur, used, limit = [], 0.0, next_height or height
+        cur.append(t)
+        used += h
+    pages.append(cur)
+    return size, pages
+
+
+def row_height(cells, col_width, size, font=DEFAULT_FONT):
+    """표 한 행의 높이 (pt): 가장 많이 줄바꿈되는 셀 기준."""
+    inner = col_width - 2 * CELL_MARGIN_H
+    lines = max((line_count(str(c), inner, size, font) for c in cells), default=1)
+    return lines * size * LINE_SPACING + 2 * CELL_MARGIN_V
+
+
+def fit_rows(headers, rows, col_width, height, size, min_size, font=DEFAULT_FONT):
+    """표를 height(pt) 안에 맞춘다. 반환값은 fit_paragraphs와 같은 (size, [페이지별 rows]).
+
+    나뉜 페이지마다 헤더 행이 반복된다고 보고 계산한다.
+    """
+    rows = list(rows)
+    s = size
+    while s >= min_size:
+        total = row_height(headers, col_width, s, font)
+        for r in rows:  # 넘치는 순간 중단 (긴 표는 몇 행 만에 판정)
+            total += row_height(r, col_width, s, font)
+            if total > height:
+                break
+        else:
+            return s, [rows]
+        s -= 1
+
+    limit = height - row_height(headers, col_width, size, font)
+    pages, cur, used = [], [], 0.0
+    for r in rows:
+        h = row_height(r, col_width, size, font)
+        if cur and used + h > limit:
+            pages.append(cur)
+            cur, used = [], 0.0
+        cur.append(r)
+        used += h
+    pages.append(cur)
+    return size, pages